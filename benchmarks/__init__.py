@@ -0,0 +1 @@
+"""Benchmark harnesses (local Discord stand-in, end-to-end scenarios)."""
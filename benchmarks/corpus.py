@@ -0,0 +1,432 @@
+"""
+Synthetic documentation corpus generator for scale testing.
+
+Builds reproducible docs trees that follow the channel mapping folder
+layout (01-users, 02-developers/*, ..., plus files at the docs root), with
+a configurable file count, log-normal size distribution, code fence
+density and heading counts. The tree can be committed to a git repository
+followed by a history of commits (modifications, additions, deletions and
+renames) whose diffs can be replayed through GitHandler.
+
+Usage:
+    python -m benchmarks.corpus /tmp/corpus --files 2000 --commits 20 --changes 10
+
+The history is written to history.json next to the repository's docs/
+(excluded from git), with the parent and SHA of every commit and its
+changes.
+"""
+
+import argparse
+import json
+import math
+import random
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from config import CHANNEL_MAPPING
+from utils.loop_lag import percentile
+from webhook.git_backend import (
+    CHANGE_ADDED,
+    CHANGE_DELETED,
+    CHANGE_MODIFIED,
+    CHANGE_RENAMED,
+    FileChange,
+)
+
+GIT_IDENTITY = ("-c", "user.name=Benchmark", "-c", "user.email=bench@localhost")
+
+WORDS = (
+    "agent backend dashboard database installer metrics quota certificate "
+    "collection interval deployment service endpoint token rotation schema "
+    "latency throughput replica cluster webhook channel summary release"
+).split()
+
+LANGUAGES = ("python", "bash", "json", "yaml", "sql", "")
+
+# Share of each change type in generated commits
+CHANGE_WEIGHTS = {
+    CHANGE_MODIFIED: 0.7,
+    CHANGE_ADDED: 0.1,
+    CHANGE_DELETED: 0.1,
+    CHANGE_RENAMED: 0.1,
+}
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """Build a capitalized sentence of random words."""
+    return " ".join(rng.choices(WORDS, k=words)).capitalize() + "."
+
+
+@dataclass
+class CorpusSpec:
+    """Shape of a generated docs tree."""
+
+    files: int = 320  # ~20x the bundled docs/ folder
+    median_kb: float = 15.0  # Median document size
+    size_sigma: float = 0.9  # Log-normal spread of the sizes
+    min_kb: float = 1.0
+    max_kb: float = 512.0
+    fences_per_section: float = 1.0  # Mean number of code blocks per h2 section
+    table_rate: float = 0.3  # Probability of a table in a section
+    headings: Tuple[int, int] = (4, 20)  # Range of h2 sections per document
+    nested_rate: float = 0.2  # Share of files in a subfolder of their mapped folder
+    readmes: bool = True  # Add a README.md per folder (skipped by the bot)
+    seed: int = 0
+
+
+@dataclass
+class HistoryCommit:
+    """A generated commit and the docs changes it contains."""
+
+    sha: str
+    parent: str
+    message: str
+    changes: List[FileChange] = field(default_factory=list)
+
+
+class CorpusGenerator:
+    """
+    Generates documents and trees from a CorpusSpec.
+
+    All randomness comes from one seeded generator, so the same spec and
+    mapping always produce the same tree and history.
+    """
+
+    def __init__(self, spec: CorpusSpec, mapping: Optional[Dict[str, str]] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            spec: Shape of the tree
+            mapping: Folder to channel name mapping (default: the bot's)
+        """
+        self.spec = spec
+        self.mapping = mapping if mapping is not None else CHANNEL_MAPPING
+        self.rng = random.Random(spec.seed)
+        self._next_id = 0
+
+    def folders(self) -> List[str]:
+        """Mapped folders, "" standing for the docs root."""
+        return [folder if folder != "root" else "" for folder in self.mapping]
+
+    def document_size(self) -> int:
+        """Draw a document size in bytes from the log-normal distribution."""
+        spec = self.spec
+        size_kb = self.rng.lognormvariate(math.log(spec.median_kb), spec.size_sigma)
+        return int(min(max(size_kb, spec.min_kb), spec.max_kb) * 1024)
+
+    def document(self, title: str, size: int) -> str:
+        """
+        Generate a document.
+
+        Args:
+            title: Document title (h1)
+            size: Target size in characters (approximate)
+
+        Returns:
+            Markdown content
+        """
+        rng = self.rng
+        sections = rng.randint(*self.spec.headings)
+        section_size = max(200, size // max(sections, 1))
+
+        parts = [f"# {title}", "", sentence(rng, rng.randint(15, 40)), ""]
+        for index in range(1, sections + 1):
+            parts += [f"## {sentence(rng, 3)[:-1]} {index}", ""]
+            parts += self._section_body(section_size)
+        return "\n".join(parts)
+
+    def _section_body(self, size: int) -> List[str]:
+        """Generate the lines of a section of about `size` characters."""
+        rng = self.rng
+        spec = self.spec
+
+        # Whole part of the mean, plus one with the fractional part as probability
+        fences = int(spec.fences_per_section)
+        if rng.random() < spec.fences_per_section - fences:
+            fences += 1
+
+        blocks = []
+        for _ in range(fences):
+            language = rng.choice(LANGUAGES)
+            code = [f"{rng.choice(WORDS)}_{i} = {rng.randint(0, 999)}" for i in range(rng.randint(3, 20))]
+            blocks.append([f"```{language}", *code, "```", ""])
+
+        if rng.random() < spec.table_rate:
+            columns = rng.randint(2, 5)
+            rows = [
+                "| " + " | ".join(rng.choices(WORDS, k=columns)) + " |"
+                for _ in range(rng.randint(3, 15))
+            ]
+            header = "| " + " | ".join(rng.sample(WORDS, columns)) + " |"
+            blocks.append([header, "|" + "---|" * columns, *rows, ""])
+
+        # Fill the rest of the section with paragraphs and lists
+        length = sum(len(line) + 1 for block in blocks for line in block)
+        while length < size:
+            if rng.random() < 0.25:
+                block = [f"- {sentence(rng, rng.randint(4, 12))}" for _ in range(rng.randint(2, 6))]
+            else:
+                block = [" ".join(sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 6)))]
+            blocks.append(block + [""])
+            length += sum(len(line) + 1 for line in block) + 1
+
+        rng.shuffle(blocks)
+        return [line for block in blocks for line in block]
+
+    def file_path(self) -> str:
+        """Draw a new file path (relative to the docs root)."""
+        rng = self.rng
+        folder = rng.choice(self.folders())
+        if folder and rng.random() < self.spec.nested_rate:
+            folder = f"{folder}/topic-{rng.randint(1, 5)}"
+
+        self._next_id += 1
+        name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{self._next_id:05d}.md"
+        return f"{folder}/{name}" if folder else name
+
+    def write_document(self, docs_path: Path, relative_path: str):
+        """Generate a document of random size at a path under docs_path."""
+        path = docs_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        title = path.stem.replace("-", " ").title()
+        path.write_text(self.document(title, self.document_size()), encoding="utf-8")
+
+    def write_tree(self, docs_path: Path) -> List[str]:
+        """
+        Write a full docs tree.
+
+        Args:
+            docs_path: Docs root (created if missing)
+
+        Returns:
+            Paths of the generated documents (READMEs excluded), relative
+            to docs_path
+        """
+        paths = [self.file_path() for _ in range(self.spec.files)]
+        for relative_path in paths:
+            self.write_document(docs_path, relative_path)
+
+        if self.spec.readmes:
+            for folder in self.folders():
+                readme = docs_path / folder / "README.md"
+                readme.parent.mkdir(parents=True, exist_ok=True)
+                readme.write_text(f"# {folder or 'Documentation'}\n\nIndex.\n", encoding="utf-8")
+        return paths
+
+    def apply_changes(self, docs_path: Path, paths: List[str], count: int) -> List[FileChange]:
+        """
+        Change `count` documents of a tree (in the working tree only).
+
+        Modified documents get a new section; renamed ones move to another
+        mapped folder, possibly changing channel.
+
+        Args:
+            docs_path: Docs root
+            paths: Current document paths relative to docs_path (updated)
+            count: Number of changes
+
+        Returns:
+            Changes with paths relative to the repo root (docs/...)
+        """
+        rng = self.rng
+        prefix = docs_path.name
+        changes = []
+        touched = set()
+
+        for _ in range(count):
+            change_type = rng.choices(list(CHANGE_WEIGHTS), weights=list(CHANGE_WEIGHTS.values()))[0]
+            candidates = [p for p in paths if p not in touched]
+            if change_type != CHANGE_ADDED and not candidates:
+                change_type = CHANGE_ADDED
+
+            if change_type == CHANGE_ADDED:
+                path = self.file_path()
+                self.write_document(docs_path, path)
+                paths.append(path)
+                changes.append(FileChange(CHANGE_ADDED, f"{prefix}/{path}"))
+
+            elif change_type == CHANGE_MODIFIED:
+                path = rng.choice(candidates)
+                with open(docs_path / path, "a", encoding="utf-8") as f:
+                    f.write(f"\n## Update {rng.randint(1, 10**6)}\n\n{sentence(rng, 20)}\n")
+                changes.append(FileChange(CHANGE_MODIFIED, f"{prefix}/{path}"))
+
+            elif change_type == CHANGE_DELETED:
+                path = rng.choice(candidates)
+                (docs_path / path).unlink()
+                paths.remove(path)
+                changes.append(FileChange(CHANGE_DELETED, f"{prefix}/{path}"))
+
+            else:
+                old_path = rng.choice(candidates)
+                path = self.file_path()
+                (docs_path / path).parent.mkdir(parents=True, exist_ok=True)
+                (docs_path / old_path).rename(docs_path / path)
+                paths[paths.index(old_path)] = path
+                changes.append(
+                    FileChange(CHANGE_RENAMED, f"{prefix}/{path}", f"{prefix}/{old_path}")
+                )
+
+            touched.add(path)
+        return changes
+
+
+# Git repositories
+
+
+def git(cwd: Path, *args: str) -> str:
+    """Run a git command and return its stdout."""
+    result = subprocess.run(
+        ["git", *GIT_IDENTITY, *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def build_repository(
+    repo_path: Path,
+    spec: CorpusSpec,
+    commits: int = 0,
+    changes: int = 10,
+    mapping: Optional[Dict[str, str]] = None,
+) -> List[HistoryCommit]:
+    """
+    Create a git repository with a generated docs/ tree and history.
+
+    The first commit adds the whole tree; each following commit contains
+    `changes` random changes.
+
+    Args:
+        repo_path: Repository directory (created, must not be a repository)
+        spec: Shape of the tree
+        commits: Number of commits after the initial one
+        changes: Changes per commit
+        mapping: Folder to channel name mapping (default: the bot's)
+
+    Returns:
+        All commits, oldest first (the initial one has no parent and no
+        changes listed)
+    """
+    generator = CorpusGenerator(spec, mapping)
+    docs_path = repo_path / "docs"
+
+    repo_path.mkdir(parents=True, exist_ok=True)
+    git(repo_path, "init", "-q", "-b", "main")
+    paths = generator.write_tree(docs_path)
+    message = f"Add {len(paths)} generated docs"
+    git(repo_path, "add", "-A")
+    git(repo_path, "commit", "-q", "-m", message)
+    history = [HistoryCommit(git(repo_path, "rev-parse", "HEAD"), "", message)]
+
+    for index in range(1, commits + 1):
+        commit_changes = generator.apply_changes(docs_path, paths, changes)
+        message = f"Docs update {index} ({len(commit_changes)} changes)"
+        git(repo_path, "add", "-A")
+        git(repo_path, "commit", "-q", "-m", message)
+        history.append(
+            HistoryCommit(
+                git(repo_path, "rev-parse", "HEAD"), history[-1].sha, message, commit_changes
+            )
+        )
+
+    return history
+
+
+def describe_tree(docs_path: Path) -> dict:
+    """
+    Get size statistics of a docs tree.
+
+    Args:
+        docs_path: Docs root
+
+    Returns:
+        Dict with file count, total size and size percentiles in bytes
+    """
+    sizes = sorted(path.stat().st_size for path in docs_path.rglob("*.md"))
+    return {
+        "files": len(sizes),
+        "total": sum(sizes),
+        "p50": percentile(sizes, 50),
+        "p95": percentile(sizes, 95),
+        "max": sizes[-1] if sizes else 0,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output", type=Path, help="Repository directory to create")
+    parser.add_argument("--files", type=int, default=defaults.files, help="Number of documents")
+    parser.add_argument("--median-kb", type=float, default=defaults.median_kb, help="Median document size")
+    parser.add_argument("--size-sigma", type=float, default=defaults.size_sigma, help="Log-normal size spread")
+    parser.add_argument("--min-kb", type=float, default=defaults.min_kb, help="Minimum document size")
+    parser.add_argument("--max-kb", type=float, default=defaults.max_kb, help="Maximum document size")
+    parser.add_argument(
+        "--fences", type=float, default=defaults.fences_per_section,
+        help="Mean code blocks per section",
+    )
+    parser.add_argument("--tables", type=float, default=defaults.table_rate, help="Table probability per section")
+    parser.add_argument(
+        "--headings", default="{}-{}".format(*defaults.headings),
+        help="Range of h2 sections per document (e.g. 4-20)",
+    )
+    parser.add_argument("--nested", type=float, default=defaults.nested_rate, help="Share of nested files")
+    parser.add_argument("--no-readmes", action="store_true", help="Do not add folder READMEs")
+    parser.add_argument("--commits", type=int, default=0, help="Commits after the initial one")
+    parser.add_argument("--changes", type=int, default=10, help="Changes per commit")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    args = parse_args(argv)
+    if (args.output / ".git").exists():
+        print(f"{args.output} is already a git repository")
+        return 2
+
+    low, _, high = args.headings.partition("-")
+    spec = CorpusSpec(
+        files=args.files,
+        median_kb=args.median_kb,
+        size_sigma=args.size_sigma,
+        min_kb=args.min_kb,
+        max_kb=args.max_kb,
+        fences_per_section=args.fences,
+        table_rate=args.tables,
+        headings=(int(low), int(high or low)),
+        nested_rate=args.nested,
+        readmes=not args.no_readmes,
+        seed=args.seed,
+    )
+
+    history = build_repository(args.output, spec, args.commits, args.changes)
+
+    # Keep the history out of the repository it describes
+    history_path = args.output / "history.json"
+    history_path.write_text(
+        json.dumps({"spec": asdict(spec), "commits": [asdict(c) for c in history]}, indent=2),
+        encoding="utf-8",
+    )
+    with open(args.output / ".git" / "info" / "exclude", "a", encoding="utf-8") as f:
+        f.write("history.json\n")
+
+    stats = describe_tree(args.output / "docs")
+    print(
+        f"{stats['files']} markdown file(s), {stats['total'] / 1024 ** 2:.1f} MB "
+        f"(p50 {stats['p50'] / 1024:.1f} KB, p95 {stats['p95'] / 1024:.1f} KB, "
+        f"max {stats['max'] / 1024:.1f} KB)"
+    )
+    print(f"{len(history)} commit(s), history written to {history_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
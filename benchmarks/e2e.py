@@ -0,0 +1,314 @@
+"""
+End-to-end benchmark of DocsBot against the local fake Discord server.
+
+Generates a docs repository with history (see benchmarks.corpus), clones
+it for the bot, connects a real DocsBot to FakeDiscord and measures three
+scenarios:
+
+- refresh_cold: /refresh flow (RefreshEngine) with no message published yet
+- refresh_warm: the same refresh again, nothing changed
+- webhook_replay: the generated commits are pushed one at a time and
+  GitHandler pulls and processes each one like a webhook delivery would
+
+Usage:
+    python -m benchmarks.e2e --files 100 --commits 5 --changes 10 --latency 0.05 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+import discord
+import yarl
+from benchmarks.corpus import CorpusSpec, HistoryCommit, build_repository, git
+from benchmarks.fake_discord import FakeDiscord
+from utils.loop_lag import percentile
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one benchmark scenario."""
+
+    name: str
+    files: int = 0
+    elapsed: float = 0.0  # Wall time in seconds
+    latencies: List[float] = field(default_factory=list)  # Per publish_summary call
+    requests: int = 0
+    rate_limited: int = 0
+    shared_rate_limited: int = 0
+    loop_lag_p99: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict (latencies in seconds)."""
+        latencies = sorted(self.latencies)
+        return {
+            "name": self.name,
+            "files": self.files,
+            "elapsed": self.elapsed,
+            "files_per_second": self.files / self.elapsed if self.elapsed else 0.0,
+            "publish_p50": percentile(latencies, 50),
+            "publish_p95": percentile(latencies, 95),
+            "publish_p99": percentile(latencies, 99),
+            "publish_max": latencies[-1] if latencies else 0.0,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "shared_rate_limited": self.shared_rate_limited,
+            "loop_lag_p99": self.loop_lag_p99,
+        }
+
+
+# Repositories
+
+
+def setup_repositories(
+    root: Path, spec: CorpusSpec, commits: int, changes: int
+) -> Tuple[Path, Path, List[HistoryCommit]]:
+    """
+    Create an author repository with history, its origin and the bot's clone.
+
+    Only the initial commit is pushed to the origin: the others are pushed
+    one at a time by the webhook scenario.
+
+    Args:
+        root: Empty working directory
+        spec: Shape of the docs tree
+        commits: Commits after the initial one
+        changes: Changes per commit
+
+    Returns:
+        Tuple of (bot clone, author repository, commits oldest first)
+    """
+    origin = root / "origin.git"
+    author = root / "author"
+    repo = root / "repo"
+
+    history = build_repository(author, spec, commits, changes)
+    git(root, "init", "-q", "--bare", "-b", "main", str(origin))
+    git(author, "remote", "add", "origin", str(origin))
+    git(author, "push", "-q", "origin", f"{history[0].sha}:refs/heads/main")
+    git(root, "clone", "-q", str(origin), str(repo))
+    return repo, author, history
+
+
+# Benchmark
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[ScenarioResult]:
+    """
+    Run all scenarios.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        One ScenarioResult per scenario
+    """
+    with tempfile.TemporaryDirectory(prefix="docsbot-bench-") as tmp:
+        root = Path(tmp)
+        fake = FakeDiscord(
+            latency=args.latency,
+            jitter=args.jitter,
+            rate_limit=args.rate_limit,
+            rate_window=args.rate_window,
+            shared_429_rate=args.inject_429,
+            seed=args.seed,
+        )
+
+        os.environ.update({
+            "DISCORD_BOT_TOKEN": "benchmark-token",
+            "GUILD_ID": str(fake.guild_id),
+            "DOCS_CATEGORY_ID": str(fake.category_id),
+            "DOCS_PATH": str(root / "repo" / "docs"),
+            "STATE_DB_PATH": str(root / "bot_state.db"),
+            "AUTO_CREATE_CHANNELS": "false",
+            "REFRESH_CONCURRENCY": str(args.concurrency),
+            "GIT_BACKEND": args.git_backend,
+            "LOG_LEVEL": args.log_level,
+            "LOG_FILE": str(root / "bot.log"),
+        })
+
+        # Imported late: configuration and logging read the environment
+        from config import load_config
+        from utils.logger import setup_logger
+        from bot.client import DocsBot
+        from bot.events import setup_events
+
+        spec = CorpusSpec(
+            files=args.files,
+            median_kb=args.median_kb,
+            fences_per_section=args.fences,
+            seed=args.seed,
+        )
+        repo, author, history = setup_repositories(root, spec, args.commits, args.changes)
+
+        config = load_config()
+        for name in sorted(set(config.get_channel_mapping().values())):
+            fake.add_channel(name)
+        setup_logger(config.log_level, config.log_file)
+
+        await fake.start()
+        base, gateway = discord.http.Route.BASE, discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY
+        discord.http.Route.BASE = fake.base_url
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(fake.gateway_url)
+
+        bot = DocsBot(config)
+        setup_events(bot)
+        bot_task = asyncio.create_task(bot.start(config.discord_token))
+
+        try:
+            await _wait_until_ready(bot, bot_task)
+            return await _run_scenarios(bot, config, fake, author, history)
+        finally:
+            await bot.close()
+            await asyncio.gather(bot_task, return_exceptions=True)
+            await fake.stop()
+            discord.http.Route.BASE = base
+            discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = gateway
+
+
+async def _wait_until_ready(bot, bot_task: asyncio.Task, timeout: float = 30.0):
+    """Wait for the bot to be ready, raising if it fails to connect."""
+    ready = asyncio.create_task(bot.wait_until_ready())
+    done, _ = await asyncio.wait(
+        {ready, bot_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+    )
+    if ready not in done:
+        ready.cancel()
+        if bot_task in done:
+            bot_task.result()  # Raises the connection error
+        raise TimeoutError(f"Bot not ready after {timeout:.0f}s")
+
+
+async def _run_scenarios(
+    bot, config, fake: FakeDiscord, author: Path, history: List[HistoryCommit]
+) -> List[ScenarioResult]:
+    """Run the scenarios against a connected bot."""
+    from bot.refresh import RefreshEngine
+    from processors.summary_builder import SummaryBuilder
+    from utils.channel_manager import ChannelManager
+    from webhook.git_handler import GitHandler
+
+    # Time every publish at the instance level (the scenarios call it)
+    latencies: List[float] = []
+    publish_summary = bot.publish_summary
+
+    async def measured_publish_summary(*a, **kw):
+        start = time.perf_counter()
+        try:
+            return await publish_summary(*a, **kw)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    bot.publish_summary = measured_publish_summary
+
+    async def measure(name: str, scenario) -> ScenarioResult:
+        latencies.clear()
+        fake.reset_stats()
+        start = time.perf_counter()
+        files = await scenario()
+        result = ScenarioResult(name, files, time.perf_counter() - start, list(latencies))
+
+        stats = fake.get_stats()
+        result.requests = stats["requests"]
+        result.rate_limited = stats["rate_limited"]
+        result.shared_rate_limited = stats["shared_rate_limited"]
+        result.loop_lag_p99 = bot.loop_lag.get_stats()["p99"]
+        return result
+
+    docs_path = config.docs_path
+    md_files = sorted(docs_path.glob("**/*.md"))
+    engine = RefreshEngine(
+        bot,
+        SummaryBuilder(github_repo_url=config.github_repo_url, cache=bot.parse_cache),
+        ChannelManager(
+            guild=bot.get_target_guild(),
+            category_id=config.docs_category_id,
+            channel_mapping=config.get_channel_mapping(),
+            auto_create=False,
+        ),
+        concurrency=config.refresh_concurrency,
+    )
+
+    async def refresh() -> int:
+        report = await engine.run(md_files, docs_path)
+        return report.total_files
+
+    git_handler = GitHandler(bot, config)
+
+    async def webhook_replay() -> int:
+        processed = 0
+        for commit in history[1:]:
+            git(author, "push", "-q", "origin", f"{commit.sha}:refs/heads/main")
+            processed += await git_handler.pull_and_process([], commit.parent, commit.sha)
+        return processed
+
+    return [
+        await measure("refresh_cold", refresh),
+        await measure("refresh_warm", refresh),
+        await measure("webhook_replay", webhook_replay),
+    ]
+
+
+def format_report(results: List[ScenarioResult]) -> str:
+    """Render the results as a text table."""
+    header = (
+        f"{'scenario':<15} {'files':>6} {'elapsed':>9} {'files/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'requests':>9} {'429s':>6} "
+        f"{'lag p99':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        row = result.to_dict()
+        lines.append(
+            f"{row['name']:<15} {row['files']:>6} {row['elapsed']:>8.2f}s "
+            f"{row['files_per_second']:>8.1f} {row['publish_p50'] * 1000:>8.1f} "
+            f"{row['publish_p95'] * 1000:>8.1f} {row['publish_p99'] * 1000:>8.1f} "
+            f"{row['requests']:>9} {row['rate_limited'] + row['shared_rate_limited']:>6} "
+            f"{row['loop_lag_p99'] * 1000:>6.1f}ms"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100, help="Documents in the generated tree")
+    parser.add_argument("--median-kb", type=float, default=15.0, help="Median document size")
+    parser.add_argument("--fences", type=float, default=1.0, help="Mean code blocks per section")
+    parser.add_argument("--commits", type=int, default=5, help="Commits replayed as webhook pushes")
+    parser.add_argument("--changes", type=int, default=10, help="Changes per commit")
+    parser.add_argument("--latency", type=float, default=0.05, help="API latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra random latency (seconds)")
+    parser.add_argument("--rate-limit", type=int, default=5, help="Requests per bucket and window")
+    parser.add_argument("--rate-window", type=float, default=5.0, help="Bucket window (seconds)")
+    parser.add_argument("--inject-429", type=float, default=0.0, help="Probability of a shared 429")
+    parser.add_argument("--concurrency", type=int, default=4, help="REFRESH_CONCURRENCY")
+    parser.add_argument("--git-backend", default="subprocess", help="GIT_BACKEND")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--log-level", default="WARNING", help="Bot LOG_LEVEL")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    args = parse_args(argv)
+    results = asyncio.run(run_benchmark(args))
+
+    print(format_report(results))
+    if args.json:
+        payload = {
+            "settings": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+            "scenarios": [result.to_dict() for result in results],
+        }
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,523 @@
+"""Local stand-in for the Discord REST API and gateway, for benchmarks."""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from aiohttp import WSMsgType, web
+from utils.logger import get_logger
+
+logger = get_logger("benchmarks.fake_discord")
+
+API_PREFIX = "/api/v10"
+
+# Gateway opcodes
+OP_DISPATCH = 0
+OP_HEARTBEAT = 1
+OP_IDENTIFY = 2
+OP_RESUME = 6
+OP_HELLO = 10
+OP_HEARTBEAT_ACK = 11
+
+# Discord error codes
+UNKNOWN_CHANNEL = 10003
+UNKNOWN_MESSAGE = 10008
+
+
+def _json_response(data, status: int = 200) -> web.Response:
+    """JSON response with a bare content type (discord.py compares it exactly)."""
+    return web.Response(
+        body=json.dumps(data).encode(),
+        status=status,
+        headers={"Content-Type": "application/json"},
+    )
+
+
+@dataclass
+class _Bucket:
+    """Rate limit state of one route (per major parameter)."""
+
+    bucket_hash: str
+    remaining: int
+    reset_at: float  # time.time() of the next reset
+
+
+@dataclass
+class FakeChannel:
+    """A text channel with its messages (oldest first)."""
+
+    id: int
+    name: str
+    messages: Dict[int, dict] = field(default_factory=dict)
+
+
+class FakeDiscord:
+    """
+    Minimal Discord server for driving DocsBot without a real guild.
+
+    Serves the REST routes the bot uses (gateway discovery, current user,
+    command sync, message create/edit/delete/history) and a JSON gateway
+    that identifies the bot and streams one guild with a docs category and
+    its text channels.
+
+    Every response carries real rate limit headers from per-route buckets
+    (`rate_limit` requests per `rate_window` seconds); requests beyond the
+    budget get a 429 with `retry_after`. `shared_429_rate` additionally
+    injects "shared" 429s that no client can predict, like Discord does
+    under load. Each request waits `latency` seconds plus up to `jitter`.
+    """
+
+    def __init__(
+        self,
+        guild_id: int = 100000000000000001,
+        category_id: int = 100000000000000002,
+        channel_names: Optional[List[str]] = None,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        rate_limit: int = 5,
+        rate_window: float = 5.0,
+        shared_429_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Initialize the fake server.
+
+        Args:
+            guild_id: ID of the single guild
+            category_id: ID of the docs category
+            channel_names: Text channels created in the category
+            latency: Base response latency in seconds
+            jitter: Maximum extra random latency in seconds
+            rate_limit: Requests allowed per route bucket and window
+            rate_window: Bucket reset period in seconds
+            shared_429_rate: Probability of an unpredictable 429 per request
+            seed: Random seed (jitter, injected 429s)
+        """
+        self.guild_id = guild_id
+        self.category_id = category_id
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.shared_429_rate = shared_429_rate
+        self._random = random.Random(seed)
+        self._ids = itertools.count(200000000000000000)
+
+        self.user = self._user(next(self._ids), "DocsBot")
+        self.application_id = int(self.user["id"])
+        self.channels: Dict[int, FakeChannel] = {}
+        for name in channel_names or []:
+            self.add_channel(name)
+
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self.port = 0
+
+        # Statistics
+        self.requests: Counter = Counter()  # (route, status) -> count
+        self.rate_limited = 0
+        self.shared_rate_limited = 0
+        self.gateway_connections = 0
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get(API_PREFIX + "/gateway", self._get_gateway)
+        self.app.router.add_get(API_PREFIX + "/gateway/bot", self._get_gateway)
+        self.app.router.add_get(API_PREFIX + "/users/@me", self._get_me)
+        self.app.router.add_get(
+            API_PREFIX + "/oauth2/applications/@me", self._get_application
+        )
+        self.app.router.add_put(
+            API_PREFIX + "/applications/{app_id}/guilds/{guild_id}/commands",
+            self._sync_commands,
+        )
+        self.app.router.add_put(
+            API_PREFIX + "/applications/{app_id}/commands", self._sync_commands
+        )
+        messages = API_PREFIX + "/channels/{channel_id}/messages"
+        self.app.router.add_post(messages, self._create_message)
+        self.app.router.add_get(messages, self._list_messages)
+        self.app.router.add_get(messages + "/{message_id}", self._get_message)
+        self.app.router.add_patch(messages + "/{message_id}", self._edit_message)
+        self.app.router.add_delete(messages + "/{message_id}", self._delete_message)
+        self.app.router.add_get("/gateway", self._gateway)
+
+    def add_channel(self, name: str) -> FakeChannel:
+        """
+        Add a text channel to the docs category (before the bot connects).
+
+        Args:
+            name: Channel name
+
+        Returns:
+            The new FakeChannel
+        """
+        channel = FakeChannel(next(self._ids), name)
+        self.channels[channel.id] = channel
+        return channel
+
+    # Lifecycle
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Start serving.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 for a free port)
+        """
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.host = host
+        logger.info(f"Fake Discord listening on {self.base_url}")
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def base_url(self) -> str:
+        """REST base URL (what discord.py calls Route.BASE)."""
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    @property
+    def gateway_url(self) -> str:
+        """Gateway WebSocket URL."""
+        return f"ws://{self.host}:{self.port}/gateway"
+
+    def get_stats(self) -> dict:
+        """
+        Get request statistics.
+
+        Returns:
+            Dict with request counts by route and status, 429 counts and
+            the number of stored messages
+        """
+        return {
+            "requests": sum(self.requests.values()),
+            "by_route": {
+                f"{route} {status}": count
+                for (route, status), count in sorted(self.requests.items())
+            },
+            "rate_limited": self.rate_limited,
+            "shared_rate_limited": self.shared_rate_limited,
+            "messages": sum(len(c.messages) for c in self.channels.values()),
+        }
+
+    def reset_stats(self):
+        """Reset request statistics (stored messages are kept)."""
+        self.requests.clear()
+        self.rate_limited = 0
+        self.shared_rate_limited = 0
+
+    # Rate limiting
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Apply latency and rate limits, and count responses."""
+        if request.path == "/gateway":
+            return await handler(request)
+
+        route = self._route_template(request)
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        bucket, key = self._bucket(request, route)
+        now = time.time()
+        if now >= bucket.reset_at:
+            bucket.remaining = self.rate_limit
+            bucket.reset_at = now + self.rate_window
+
+        if bucket.remaining <= 0:
+            self.rate_limited += 1
+            response = self._too_many_requests(bucket, bucket.reset_at - now, "user")
+        elif self.shared_429_rate and self._random.random() < self.shared_429_rate:
+            self.shared_rate_limited += 1
+            response = self._too_many_requests(bucket, 0.25, "shared")
+        else:
+            bucket.remaining -= 1
+            try:
+                response = await handler(request)
+            except web.HTTPException as e:
+                response = e
+            self._add_rate_limit_headers(response, bucket, now)
+
+        self.requests[(route, response.status)] += 1
+        return response
+
+    def _route_template(self, request: web.Request) -> str:
+        """Route with IDs replaced by placeholders, except the channel ID."""
+        resource = request.match_info.route.resource
+        template = resource.canonical if resource else request.path
+        return f"{request.method} {template[len(API_PREFIX):]}"
+
+    def _bucket(self, request: web.Request, route: str) -> Tuple[_Bucket, Tuple[str, str]]:
+        """Get the bucket of a request (route + major parameter)."""
+        major = request.match_info.get("channel_id") or request.match_info.get("guild_id", "")
+        key = (route, major)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(f"{abs(hash(route)):x}", self.rate_limit, 0.0)
+            self._buckets[key] = bucket
+        return bucket, key
+
+    def _add_rate_limit_headers(self, response: web.StreamResponse, bucket: _Bucket, now: float):
+        """Set the X-RateLimit-* headers of a successful response."""
+        response.headers["X-RateLimit-Limit"] = str(self.rate_limit)
+        response.headers["X-RateLimit-Remaining"] = str(bucket.remaining)
+        response.headers["X-RateLimit-Reset"] = f"{bucket.reset_at:.3f}"
+        response.headers["X-RateLimit-Reset-After"] = f"{bucket.reset_at - now:.3f}"
+        response.headers["X-RateLimit-Bucket"] = bucket.bucket_hash
+
+    def _too_many_requests(self, bucket: _Bucket, retry_after: float, scope: str) -> web.Response:
+        """Build a 429 response."""
+        retry_after = max(retry_after, 0.001)
+        response = _json_response(
+            {
+                "message": "You are being rate limited.",
+                "retry_after": round(retry_after, 3),
+                "global": False,
+            },
+            status=429,
+        )
+        # discord.py treats a 429 without Via as a Cloudflare ban
+        response.headers["Via"] = "1.1 google"
+        response.headers["Retry-After"] = f"{retry_after:.3f}"
+        response.headers["X-RateLimit-Scope"] = scope
+        if scope == "user":
+            response.headers["X-RateLimit-Limit"] = str(self.rate_limit)
+            response.headers["X-RateLimit-Remaining"] = "0"
+            response.headers["X-RateLimit-Reset"] = f"{bucket.reset_at:.3f}"
+            response.headers["X-RateLimit-Reset-After"] = f"{retry_after:.3f}"
+            response.headers["X-RateLimit-Bucket"] = bucket.bucket_hash
+        return response
+
+    # REST routes
+
+    async def _get_gateway(self, request: web.Request) -> web.Response:
+        return _json_response({
+            "url": self.gateway_url,
+            "shards": 1,
+            "session_start_limit": {
+                "total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1
+            },
+        })
+
+    async def _get_me(self, request: web.Request) -> web.Response:
+        return _json_response(self.user)
+
+    async def _get_application(self, request: web.Request) -> web.Response:
+        return _json_response({
+            "id": str(self.application_id),
+            "name": self.user["username"],
+            "description": "",
+            "icon": None,
+            "bot_public": False,
+            "bot_require_code_grant": False,
+            "owner": self.user,
+            "verify_key": "",
+            "flags": 0,
+        })
+
+    async def _sync_commands(self, request: web.Request) -> web.Response:
+        return _json_response([])
+
+    async def _create_message(self, request: web.Request) -> web.Response:
+        channel = self._channel(request)
+        payload = await request.json()
+        message = self._message(channel, payload)
+        channel.messages[int(message["id"])] = message
+        return _json_response(message)
+
+    async def _list_messages(self, request: web.Request) -> web.Response:
+        channel = self._channel(request)
+        limit = int(request.query.get("limit", 50))
+        before = int(request.query.get("before", 0)) or None
+
+        newest_first = sorted(channel.messages, reverse=True)
+        if before:
+            newest_first = [m for m in newest_first if m < before]
+        return _json_response([channel.messages[m] for m in newest_first[:limit]])
+
+    async def _get_message(self, request: web.Request) -> web.Response:
+        channel = self._channel(request)
+        return _json_response(self._stored_message(channel, request))
+
+    async def _edit_message(self, request: web.Request) -> web.Response:
+        channel = self._channel(request)
+        message = self._stored_message(channel, request)
+        payload = await request.json()
+        for key in ("content", "embeds"):
+            if key in payload:
+                message[key] = payload[key] or ([] if key == "embeds" else "")
+        message["edited_timestamp"] = self._now()
+        return _json_response(message)
+
+    async def _delete_message(self, request: web.Request) -> web.Response:
+        channel = self._channel(request)
+        message = self._stored_message(channel, request)
+        del channel.messages[int(message["id"])]
+        return web.Response(status=204)
+
+    def _channel(self, request: web.Request) -> FakeChannel:
+        channel = self.channels.get(int(request.match_info["channel_id"]))
+        if channel is None:
+            raise self._not_found(UNKNOWN_CHANNEL, "Unknown Channel")
+        return channel
+
+    def _stored_message(self, channel: FakeChannel, request: web.Request) -> dict:
+        message = channel.messages.get(int(request.match_info["message_id"]))
+        if message is None:
+            raise self._not_found(UNKNOWN_MESSAGE, "Unknown Message")
+        return message
+
+    @staticmethod
+    def _not_found(code: int, message: str) -> web.HTTPNotFound:
+        return web.HTTPNotFound(
+            body=json.dumps({"code": code, "message": message}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+
+    # Gateway
+
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        """JSON gateway: HELLO, then READY and GUILD_CREATE on IDENTIFY."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.gateway_connections += 1
+        sequence = itertools.count(1)
+
+        await ws.send_json({"op": OP_HELLO, "d": {"heartbeat_interval": 41250}, "s": None, "t": None})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+
+            data = json.loads(msg.data)
+            op = data.get("op")
+
+            if op == OP_HEARTBEAT:
+                await ws.send_json({"op": OP_HEARTBEAT_ACK, "d": None, "s": None, "t": None})
+
+            elif op == OP_IDENTIFY:
+                await ws.send_json(self._dispatch("READY", next(sequence), {
+                    "v": 10,
+                    "user": self.user,
+                    "guilds": [{"id": str(self.guild_id), "unavailable": True}],
+                    "session_id": "fake-session",
+                    "resume_gateway_url": self.gateway_url,
+                    "application": {"id": str(self.application_id), "flags": 0},
+                    "shard": [0, 1],
+                }))
+                await ws.send_json(self._dispatch("GUILD_CREATE", next(sequence), self._guild()))
+
+            elif op == OP_RESUME:
+                await ws.send_json(self._dispatch("RESUMED", next(sequence), {}))
+
+        return ws
+
+    @staticmethod
+    def _dispatch(event: str, sequence: int, data: dict) -> dict:
+        return {"op": OP_DISPATCH, "t": event, "s": sequence, "d": data}
+
+    def _guild(self) -> dict:
+        """GUILD_CREATE payload: the bot, a docs category and its channels."""
+        channels = [{
+            "id": str(self.category_id),
+            "type": 4,
+            "name": "DOCS",
+            "position": 0,
+            "permission_overwrites": [],
+        }]
+        for position, channel in enumerate(self.channels.values(), 1):
+            channels.append({
+                "id": str(channel.id),
+                "type": 0,
+                "name": channel.name,
+                "position": position,
+                "parent_id": str(self.category_id),
+                "permission_overwrites": [],
+                "topic": None,
+                "nsfw": False,
+            })
+
+        return {
+            "id": str(self.guild_id),
+            "name": "Benchmark Guild",
+            "owner_id": self.user["id"],
+            "unavailable": False,
+            "member_count": 1,
+            "features": [],
+            "roles": [{
+                "id": str(self.guild_id),
+                "name": "@everyone",
+                "permissions": "8",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }],
+            "channels": channels,
+            "members": [{
+                "user": self.user,
+                "roles": [],
+                "joined_at": self._now(),
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+            }],
+            "threads": [],
+            "emojis": [],
+            "stickers": [],
+            "voice_states": [],
+            "presences": [],
+            "stage_instances": [],
+            "guild_scheduled_events": [],
+        }
+
+    # Payloads
+
+    @staticmethod
+    def _user(user_id: int, name: str) -> dict:
+        return {
+            "id": str(user_id),
+            "username": name,
+            "discriminator": "0000",
+            "global_name": None,
+            "avatar": None,
+            "bot": True,
+        }
+
+    def _message(self, channel: FakeChannel, payload: dict) -> dict:
+        return {
+            "id": str(next(self._ids)),
+            "channel_id": str(channel.id),
+            "guild_id": str(self.guild_id),
+            "author": self.user,
+            "content": payload.get("content") or "",
+            "embeds": payload.get("embeds") or [],
+            "timestamp": self._now(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+            "components": [],
+        }
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
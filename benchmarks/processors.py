@@ -0,0 +1,448 @@
+"""
+Micro-benchmarks of the processors package.
+
+Runs the tokenizer, MarkdownParser, MessageSplitter, SummaryBuilder and
+EmbedBuilder over the bundled docs/ corpus and over generated documents
+of 1 KB to 10 MB in three shapes:
+
+- fences: short paragraphs between many code blocks
+- tables: headings over large markdown tables
+- longlines: paragraphs written as single lines of tens of KB
+
+For each case and operation it reports throughput (documents/s and MB/s),
+the peak memory traced while processing and the memory (bytes and
+allocated blocks) still held by the results. Results can be saved as a
+baseline and compared against a later run.
+
+Usage:
+    python -m benchmarks.processors --save baseline.json
+    python -m benchmarks.processors --compare baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from benchmarks.corpus import WORDS, sentence
+from processors.embed_builder import EmbedBuilder
+from processors.markdown_parser import MarkdownParser
+from processors.markdown_tokenizer import tokenize
+from processors.message_splitter import MessageSplitter
+from processors.summary_builder import SummaryBuilder
+
+DOCS_ROOT = Path(__file__).resolve().parent.parent / "docs"
+
+SHAPES = ("fences", "tables", "longlines")
+SIZES = {"1K": 1024, "10K": 10 * 1024, "100K": 100 * 1024, "1M": 1024 ** 2, "10M": 10 * 1024 ** 2}
+OPERATIONS = ("tokenize", "parse", "split", "summarize", "embed")
+
+MAX_MESSAGE_LENGTH = 2000  # Config default
+
+
+@dataclass
+class Case:
+    """A set of documents processed together."""
+
+    name: str
+    root: Path  # Docs root of the documents
+    documents: List[Tuple[Path, str]]  # (path under root, content)
+
+    @property
+    def size(self) -> int:
+        """Total content length in characters."""
+        return sum(len(content) for _, content in self.documents)
+
+
+@dataclass
+class Result:
+    """Measurements of one operation over one case."""
+
+    case: str
+    operation: str
+    documents: int
+    size: int  # Characters per run
+    runs: int
+    elapsed: float  # Seconds over all runs
+    best: float  # Seconds per run in the fastest round
+    peak_bytes: int  # Peak traced memory during one run
+    retained_bytes: int  # Memory held by the results of one run
+    retained_blocks: int  # Allocated blocks held by the results of one run
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}/{self.operation}"
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.best if self.best else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.size / self.best / 1024 ** 2 if self.best else 0.0
+
+
+# Generated documents
+
+
+def _fences_block(rng: random.Random, index: int, budget: int) -> str:
+    code = [f"def step_{index}(event):"]
+    code += [f"    value = event.get('{rng.choice(WORDS)}')" for _ in range(rng.randint(4, 30))]
+    return f"{sentence(rng, 12)}\n\n```python\n" + "\n".join(code) + "\n```\n"
+
+
+def _tables_block(rng: random.Random, index: int, budget: int) -> str:
+    columns = rng.randint(3, 6)
+    header = "| " + " | ".join(rng.sample(WORDS, columns)) + " |"
+    rule = "|" + "---|" * columns
+    rows = [
+        "| " + " | ".join(rng.choices(WORDS, k=columns)) + " |"
+        for _ in range(rng.randint(10, 40))
+    ]
+    return f"### Table {index}\n\n" + "\n".join([header, rule, *rows]) + "\n"
+
+
+def _longlines_block(rng: random.Random, index: int, budget: int) -> str:
+    # One paragraph line of up to ~50 KB (sentences are ~120 characters):
+    # no newline to split on
+    sentences = min(rng.randint(40, 400), max(1, budget // 120))
+    line = " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(sentences))
+    return line + "\n"
+
+
+# Block generators: (rng, block index, characters left) -> markdown
+_BLOCKS: Dict[str, Callable[[random.Random, int, int], str]] = {
+    "fences": _fences_block,
+    "tables": _tables_block,
+    "longlines": _longlines_block,
+}
+
+
+def generate_document(shape: str, size: int, seed: int = 0) -> str:
+    """
+    Generate a markdown document of a given shape.
+
+    Args:
+        shape: One of SHAPES
+        size: Target length in characters (exceeded by at most one block)
+        seed: Random seed
+
+    Returns:
+        Markdown content
+    """
+    rng = random.Random(f"{shape}-{size}-{seed}")
+    block = _BLOCKS[shape]
+
+    parts = [f"# Generated {shape} document\n\n{sentence(rng, 25)}\n"]
+    length = len(parts[0])
+    index = 0
+    while length < size:
+        if index % 5 == 0:
+            parts.append(f"## Section {index // 5 + 1}\n")
+            length += len(parts[-1]) + 1
+        parts.append(block(rng, index, size - length))
+        length += len(parts[-1]) + 1
+        index += 1
+    return "\n".join(parts)
+
+
+def build_cases(
+    shapes: List[str], sizes: List[str], workdir: Path, bundled: bool = True
+) -> List[Case]:
+    """
+    Build the benchmark cases.
+
+    Generated documents are written to `workdir`: summaries read the file
+    modification time.
+
+    Args:
+        shapes: Generated document shapes
+        sizes: Generated document sizes (keys of SIZES)
+        workdir: Directory receiving the generated documents
+        bundled: Include the bundled docs/ corpus as one case
+
+    Returns:
+        List of cases
+    """
+    cases = []
+    if bundled:
+        documents = [
+            (path, path.read_text(encoding="utf-8"))
+            for path in sorted(DOCS_ROOT.glob("**/*.md"))
+        ]
+        if documents:
+            cases.append(Case("docs", DOCS_ROOT, documents))
+
+    for shape in shapes:
+        for size in sizes:
+            name = f"{shape}-{size}"
+            path = workdir / f"{name}.md"
+            content = generate_document(shape, SIZES[size])
+            path.write_text(content, encoding="utf-8")
+            cases.append(Case(name, workdir, [(path, content)]))
+    return cases
+
+
+# Operations
+
+
+def _prepare(case: Case, operation: str) -> Callable[[], object]:
+    """
+    Build the function running one operation over all documents of a case.
+
+    Work that is not part of the operation (e.g., parsing before building
+    embeds) is done here, outside the measurement.
+    """
+    splitter = MessageSplitter(MAX_MESSAGE_LENGTH)
+    documents = case.documents
+
+    if operation == "tokenize":
+        return lambda: [tokenize(content) for _, content in documents]
+
+    if operation == "parse":
+        parser = MarkdownParser()  # No cache: every run parses
+        return lambda: [parser.parse_file(str(path), content) for path, content in documents]
+
+    if operation == "split":
+        return lambda: [splitter.split(content) for _, content in documents]
+
+    if operation == "summarize":
+        builder = SummaryBuilder("https://github.com/example/docs/blob/main/docs")
+        return lambda: [
+            builder.create_summary_embed(builder.build_summary(path, content, case.root))
+            for path, content in documents
+        ]
+
+    if operation == "embed":
+        parser = MarkdownParser()
+        embed_builder = EmbedBuilder()
+        prepared = [
+            (parser.parse_file(str(path), content), splitter.split_with_metadata(content, path.name))
+            for path, content in documents
+        ]
+        return lambda: [
+            embed_builder.pack_embeds(list(embed_builder.iter_embeds(parsed, chunks)))
+            for parsed, chunks in prepared
+        ]
+
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def measure(case: Case, operation: str, min_time: float = 0.5, rounds: int = 5) -> Result:
+    """
+    Benchmark one operation over a case.
+
+    Like timeit, the operation is timed in several rounds and throughput
+    is taken from the fastest one, which is the least disturbed by the
+    rest of the machine. Each round lasts at least min_time / rounds (and
+    one run). Memory is measured on a separate run under tracemalloc,
+    which slows allocations down.
+
+    Args:
+        case: Documents to process
+        operation: One of OPERATIONS
+        min_time: Minimum total timed duration in seconds
+        rounds: Number of timed rounds
+
+    Returns:
+        Result of the operation
+    """
+    func = _prepare(case, operation)
+    func()  # Warm-up
+
+    runs = 0
+    elapsed = 0.0
+    best = float("inf")
+    gc.collect()
+    for _ in range(rounds):
+        round_runs = 0
+        round_elapsed = 0.0
+        while round_runs == 0 or round_elapsed < min_time / rounds:
+            start = time.perf_counter()
+            func()
+            round_elapsed += time.perf_counter() - start
+            round_runs += 1
+
+        best = min(best, round_elapsed / round_runs)
+        runs += round_runs
+        elapsed += round_elapsed
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return Result(
+        case=case.name,
+        operation=operation,
+        documents=len(case.documents),
+        size=case.size,
+        runs=runs,
+        elapsed=elapsed,
+        best=best,
+        peak_bytes=peak,
+        retained_bytes=retained,
+        retained_blocks=blocks,
+    )
+
+
+# Reports and baselines
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_results(results: List[Result]) -> str:
+    """Render results as a text table."""
+    header = (
+        f"{'case':<16} {'operation':<10} {'docs/s':>10} {'MB/s':>8} {'ms/run':>10} "
+        f"{'peak':>9} {'retained':>9} {'blocks':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.case:<16} {r.operation:<10} {r.docs_per_second:>10.1f} "
+            f"{r.mb_per_second:>8.2f} {r.best * 1000:>10.2f} "
+            f"{_format_bytes(r.peak_bytes):>9} {_format_bytes(r.retained_bytes):>9} "
+            f"{r.retained_blocks:>8}"
+        )
+    return "\n".join(lines)
+
+
+def save_baseline(results: List[Result], path: Path):
+    """
+    Save results as a JSON baseline.
+
+    Args:
+        results: Benchmark results
+        path: Output file
+    """
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {r.key: asdict(r) for r in results},
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def compare(results: List[Result], path: Path, tolerance: float = 0.10) -> Tuple[str, int]:
+    """
+    Compare results with a saved baseline.
+
+    A result regresses when its throughput drops, or its peak memory
+    grows, by more than `tolerance`.
+
+    Args:
+        results: Current results
+        path: Baseline file written by save_baseline()
+        tolerance: Relative change tolerated before flagging a regression
+
+    Returns:
+        Tuple of (report text, number of regressions)
+    """
+    baseline = json.loads(path.read_text(encoding="utf-8"))["results"]
+
+    header = f"{'case/operation':<28} {'docs/s':>10} {'change':>8} {'peak':>9} {'change':>8}"
+    lines = [f"Baseline: {path}", header, "-" * len(header)]
+    regressions = 0
+
+    for r in results:
+        old = baseline.get(r.key)
+        if old is None:
+            lines.append(f"{r.key:<28} {r.docs_per_second:>10.1f} {'new':>8}")
+            continue
+
+        old_rate = old["documents"] / old["best"] if old["best"] else 0.0
+        speed = r.docs_per_second / old_rate - 1 if old_rate else 0.0
+        memory = r.peak_bytes / old["peak_bytes"] - 1 if old["peak_bytes"] else 0.0
+
+        regressed = speed < -tolerance or memory > tolerance
+        regressions += regressed
+        lines.append(
+            f"{r.key:<28} {r.docs_per_second:>10.1f} {speed:>+8.1%} "
+            f"{_format_bytes(r.peak_bytes):>9} {memory:>+8.1%}"
+            + ("  REGRESSION" if regressed else "")
+        )
+
+    lines.append(f"{regressions} regression(s) beyond {tolerance:.0%}")
+    return "\n".join(lines), regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="Generated document shapes")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="Generated document sizes")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="Operations to run")
+    parser.add_argument("--no-bundled", action="store_true", help="Skip the bundled docs/ corpus")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Timed seconds per benchmark")
+    parser.add_argument("--save", type=Path, help="Save the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Compare with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Regression tolerance")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Returns:
+        Exit status: 1 if the comparison found regressions, 0 otherwise
+    """
+    args = parse_args(argv)
+    shapes = [s for s in args.shapes.split(",") if s]
+    sizes = [s for s in args.sizes.split(",") if s]
+    operations = [o for o in args.operations.split(",") if o]
+
+    for name, values, known in (
+        ("shape", shapes, SHAPES), ("size", sizes, SIZES), ("operation", operations, OPERATIONS)
+    ):
+        unknown = [v for v in values if v not in known]
+        if unknown:
+            print(f"Unknown {name}(s): {', '.join(unknown)} (expected: {', '.join(known)})")
+            return 2
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="docsbot-bench-") as workdir:
+        for case in build_cases(shapes, sizes, Path(workdir), bundled=not args.no_bundled):
+            for operation in operations:
+                result = measure(case, operation, min_time=args.min_time)
+                results.append(result)
+                print(format_results([result]).splitlines()[-1], flush=True)
+
+    print()
+    print(format_results(results))
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        report, regressions = compare(results, args.compare, args.tolerance)
+        print()
+        print(report)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,40 @@
 
 import discord
 from discord.ext import commands
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Optional
 from utils.logger import get_logger
 from utils.channel_resolver import ChannelResolver
+from processors.embed_builder import EmbedBuilder
+from utils.message_index import MessageIndex, embed_hash
+from utils.parse_cache import ParseCache
+from utils.loop_lag import LoopLagMonitor
+from utils.metrics import PROCESSING_SECONDS, timed
+from processors.offload import ProcessingPool
+from bot.scheduler import (
+    OutboundScheduler,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    route_key,
+)
 
 logger = get_logger("bot.client")
 
 
+class PartialPostError(Exception):
+    """Raised when posting a document failed after some messages were sent."""
+
+    def __init__(self, messages: list[discord.Message]):
+        """
+        Initialize the error.
+
+        Args:
+            messages: Messages sent before the failure, in posting order
+        """
+        super().__init__(f"Posting stopped after {len(messages)} message(s)")
+        self.messages = messages
+
+
 class DocsBot(commands.Bot):
     """Custom Discord bot for documentation posting."""
 
@@ -21,6 +48,10 @@ class DocsBot(commands.Bot):
         """
         self.config = config
 
+        # Every send/edit goes through the scheduler, which learns Discord's
+        # rate limit buckets from response headers
+        self.scheduler = OutboundScheduler(unknown_bucket_delay=config.message_delay)
+
         # Setup intents
         intents = discord.Intents.default()
         intents.guilds = True  # Access to guilds and channels
@@ -31,14 +62,50 @@ class DocsBot(commands.Bot):
             command_prefix="!",  # Not used but required
             intents=intents,
             help_command=None,
+            http_trace=self.scheduler.trace_config(),
         )
 
+        self.embed_builder = EmbedBuilder(embed_color=config.embed_color)
         self.channel_resolver: Optional[ChannelResolver] = None
         self.target_guild: Optional[discord.Guild] = None
 
+        # Persistent file → message index (avoids history lookups on update)
+        self.message_index = MessageIndex(config.state_db_path)
+
+        # Parsed documents and summaries, shared by the watcher, webhook and /refresh
+        self.parse_cache = ParseCache(
+            max_entries=config.parse_cache_entries,
+            max_bytes=config.parse_cache_mb * 1024 * 1024,
+            db_path=config.state_db_path if config.parse_cache_disk else None,
+        )
+
+        # Large documents are parsed in worker processes, off the event loop
+        self.processing_pool = ProcessingPool(
+            workers=config.offload_workers,
+            threshold=config.offload_threshold_kb * 1024,
+        )
+
+        # How late the loop runs callbacks (heartbeats, slash commands...),
+        # with the stack of whatever blocks it
+        self.loop_lag = LoopLagMonitor(
+            interval=config.loop_lag_interval,
+            threshold=config.loop_lag_threshold,
+        )
+
     async def setup_hook(self):
         """Called when the bot is starting up."""
         logger.info("Bot setup hook called")
+        self.scheduler.start()
+        self.loop_lag.start()
+
+    async def close(self):
+        """Close the Discord connection, the scheduler and the state database."""
+        await self.scheduler.stop()
+        await self.loop_lag.stop()
+        await super().close()
+        self.processing_pool.shutdown()
+        self.message_index.close()
+        self.parse_cache.close()
 
     def get_target_guild(self) -> Optional[discord.Guild]:
         """
@@ -91,56 +158,298 @@ class DocsBot(commands.Bot):
         logger.info("Channel resolver initialized successfully")
         return True
 
+    @timed(PROCESSING_SECONDS, "publish")
     async def post_to_channel(
-        self, folder_name: str, embeds: list[discord.Embed]
-    ) -> bool:
+        self, folder_name: str, embeds: Iterable[discord.Embed]
+    ) -> list[discord.Message]:
         """
         Post embeds to the appropriate channel based on folder name.
 
+        Embeds may be a generator: each message is sent as soon as its
+        batch is complete, while later embeds are still being built.
+
         Args:
             folder_name: Name of the folder (e.g., "specs", "root")
-            embeds: List of Discord embeds to post
+            embeds: Discord embeds to post (list or generator)
 
         Returns:
-            True if successful, False otherwise
+            List of sent messages (empty if posting failed before any
+            message was sent)
+
+        Raises:
+            PartialPostError: If posting failed after some messages were
+                sent; the error holds them so the caller can clean them up
         """
         if not self.channel_resolver:
             logger.error("Channel resolver not initialized")
-            return False
+            return []
 
         channel = self.channel_resolver.get_channel(folder_name)
 
         if not channel:
             logger.error(f"Could not find channel for folder: {folder_name}")
-            return False
+            return []
 
+        sent = []
         try:
-            # Post each embed with a delay
-            for i, embed in enumerate(embeds):
-                await channel.send(embed=embed)
+            route = route_key("POST", channel.id)
+
+            # Pack embeds into as few messages as Discord's limits allow and
+            # post each batch in order as soon as it is ready, paced by the
+            # scheduler
+            for i, batch in enumerate(self.embed_builder.iter_batches(embeds)):
+                message = await self.scheduler.submit(
+                    route,
+                    lambda batch=batch: channel.send(embeds=batch),
+                    PRIORITY_HIGH,
+                )
+                sent.append(message)
                 logger.info(
-                    f"Posted message {i + 1}/{len(embeds)} to #{channel.name}"
+                    f"Posted message {i + 1} to #{channel.name} "
+                    f"({len(batch)} embed(s))"
                 )
 
-                # Add delay between messages to avoid rate limiting
-                if i < len(embeds) - 1:
-                    import asyncio
-
-                    await asyncio.sleep(self.config.message_delay)
+            return sent
 
-            return True
-
-        except discord.Forbidden:
+        except discord.Forbidden as e:
             logger.error(
                 f"Missing permissions to post in #{channel.name}. "
                 f"Check bot permissions."
             )
-            return False
+            error = e
 
         except discord.HTTPException as e:
             logger.error(f"Failed to post to #{channel.name}: {e}")
-            return False
+            error = e
 
         except Exception as e:
             logger.error(f"Unexpected error posting to #{channel.name}: {e}")
+            error = e
+
+        if sent:
+            raise PartialPostError(sent) from error
+        return []
+
+    @timed(PROCESSING_SECONDS, "publish")
+    async def publish_summary(
+        self,
+        channel: discord.TextChannel,
+        relative_path: str,
+        embed: discord.Embed,
+        content_hash: str = "",
+        priority: int = PRIORITY_NORMAL,
+    ) -> str:
+        """
+        Create or update the summary message for a documentation file.
+
+        The message ID is looked up in the persistent index and edited
+        directly through a PartialMessage, without fetching channel history.
+        History is only consulted when the file is not indexed yet (to adopt
+        a summary posted before the index existed) or when the indexed
+        message no longer exists. No API call is made when the rendered
+        embed is identical to the last one published.
+
+        Args:
+            channel: Target text channel
+            relative_path: Path relative to docs root (index key)
+            embed: Summary embed to publish
+            content_hash: Hash of the file content being published
+            priority: Scheduler priority of the API calls
+
+        Returns:
+            "unchanged" if the embed was already published, "updated" if an
+            existing message was edited, "created" otherwise
+
+        Raises:
+            discord.HTTPException: If the edit or send fails
+        """
+        entry = self.message_index.get(relative_path)
+        rendered_hash = embed_hash(embed)
+
+        if entry and entry.channel_id != channel.id:
+            # File now maps to another channel: retire the old message
+            await self.retire_messages(relative_path, priority=priority)
+            entry = None
+
+        if entry and entry.channel_id == channel.id and entry.message_ids:
+            if entry.embed_hash == rendered_hash:
+                # Same embed already live: only refresh the content hash
+                self.message_index.set(
+                    relative_path,
+                    channel.id,
+                    entry.message_ids,
+                    content_hash,
+                    embed_hash=rendered_hash,
+                )
+                logger.debug(f"Summary for {relative_path} unchanged, skipping")
+                return "unchanged"
+
+            try:
+                message = channel.get_partial_message(entry.message_ids[0])
+                await self.scheduler.submit(
+                    route_key("PATCH", channel.id, with_message_id=True),
+                    lambda: message.edit(embed=embed),
+                    priority,
+                )
+                self.message_index.set(
+                    relative_path,
+                    channel.id,
+                    entry.message_ids,
+                    content_hash,
+                    embed_hash=rendered_hash,
+                )
+                logger.info(f"Updated summary for {relative_path} in #{channel.name}")
+                return "updated"
+
+            except discord.NotFound:
+                logger.warning(
+                    f"Indexed message {entry.message_ids[0]} for {relative_path} "
+                    f"is gone, falling back to channel history"
+                )
+
+        # Fallback: adopt the last bot message if no other file owns it
+        messages = await self.scheduler.submit(
+            route_key("GET", channel.id),
+            lambda: self._fetch_last_message(channel),
+            priority,
+        )
+        if (
+            messages
+            and messages[0].author == self.user
+            and not self.message_index.is_message_indexed(channel.id, messages[0].id)
+        ):
+            await self.scheduler.submit(
+                route_key("PATCH", channel.id, with_message_id=True),
+                lambda: messages[0].edit(embed=embed),
+                priority,
+            )
+            self.message_index.set(
+                relative_path,
+                channel.id,
+                [messages[0].id],
+                content_hash,
+                embed_hash=rendered_hash,
+            )
+            logger.info(f"Updated summary for {relative_path} in #{channel.name}")
+            return "updated"
+
+        message = await self.scheduler.submit(
+            route_key("POST", channel.id),
+            lambda: channel.send(embed=embed),
+            priority,
+        )
+        self.message_index.set(
+            relative_path,
+            channel.id,
+            [message.id],
+            content_hash,
+            embed_hash=rendered_hash,
+        )
+        logger.info(f"Created summary for {relative_path} in #{channel.name}")
+        return "created"
+
+    async def retire_messages(
+        self,
+        relative_path: str,
+        kind: str = "summary",
+        priority: int = PRIORITY_NORMAL,
+    ) -> bool:
+        """
+        Retire the Discord message(s) of a deleted documentation file.
+
+        Depending on DELETED_DOC_ACTION the messages are deleted, or the
+        first one is replaced by an "archived" notice and the others are
+        deleted. The file is removed from the index in both cases.
+
+        Args:
+            relative_path: Path relative to docs root (index key)
+            kind: Entry kind ("summary" or "document")
+            priority: Scheduler priority of the API calls
+
+        Returns:
+            True if the file was indexed, False otherwise
+        """
+        entry = self.message_index.remove(relative_path, kind)
+
+        if not entry:
+            logger.debug(f"No indexed message for deleted file {relative_path}")
             return False
+
+        channel = self.get_channel(entry.channel_id)
+        if not channel:
+            logger.warning(
+                f"Channel {entry.channel_id} of {relative_path} no longer exists"
+            )
+            return True
+
+        to_delete = list(entry.message_ids)
+
+        if self.config.deleted_doc_action == "archive" and to_delete:
+            message = channel.get_partial_message(to_delete.pop(0))
+            archived = self.embed_builder.create_archived_embed(Path(relative_path).name)
+            try:
+                await self.scheduler.submit(
+                    route_key("PATCH", channel.id, with_message_id=True),
+                    lambda: message.edit(embed=archived),
+                    priority,
+                )
+            except discord.NotFound:
+                pass
+
+        await self.delete_messages(channel, to_delete, priority)
+
+        logger.info(
+            f"Retired {len(entry.message_ids)} message(s) of deleted file "
+            f"{relative_path} in #{channel.name} ({self.config.deleted_doc_action})"
+        )
+        return True
+
+    async def delete_messages(
+        self,
+        channel: discord.TextChannel,
+        message_ids: Iterable[int],
+        priority: int = PRIORITY_NORMAL,
+    ):
+        """
+        Delete messages by ID, ignoring those already gone.
+
+        Args:
+            channel: Channel holding the messages
+            message_ids: IDs of the messages to delete
+            priority: Scheduler priority of the API calls
+        """
+        for message_id in message_ids:
+            message = channel.get_partial_message(message_id)
+            try:
+                await self.scheduler.submit(
+                    route_key("DELETE", channel.id, with_message_id=True),
+                    message.delete,
+                    priority,
+                )
+            except discord.NotFound:
+                pass
+
+    def move_messages(self, old_path: str, new_path: str, kind: str = "summary") -> bool:
+        """
+        Move the index entry of a renamed file so its message is re-edited.
+
+        Args:
+            old_path: Previous path relative to docs root
+            new_path: New path relative to docs root
+            kind: Entry kind ("summary" or "document")
+
+        Returns:
+            True if the old path was indexed, False otherwise
+        """
+        entry = self.message_index.move(old_path, new_path, kind)
+
+        if entry:
+            logger.info(f"Moved {kind} message(s) of {old_path} → {new_path}")
+        return entry is not None
+
+    @staticmethod
+    async def _fetch_last_message(
+        channel: discord.TextChannel,
+    ) -> list[discord.Message]:
+        """Fetch the most recent message of a channel (0 or 1 items)."""
+        return [m async for m in channel.history(limit=1)]
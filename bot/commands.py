@@ -6,6 +6,7 @@ from pathlib import Path
 from utils.logger import get_logger
 from processors.summary_builder import SummaryBuilder
 from utils.channel_manager import ChannelManager
+from bot.refresh import RefreshEngine
 
 logger = get_logger("bot.commands")
 
@@ -31,7 +32,9 @@ def setup_commands(bot):
             docs_path = bot.config.docs_path
 
             # Initialize managers
-            summary_builder = SummaryBuilder(github_repo_url=bot.config.github_repo_url)
+            summary_builder = SummaryBuilder(
+                github_repo_url=bot.config.github_repo_url, cache=bot.parse_cache
+            )
             channel_manager = ChannelManager(
                 guild=interaction.guild,
                 category_id=bot.config.docs_category_id,
@@ -52,64 +55,26 @@ def setup_commands(bot):
                 f"Création/mise à jour des canaux en cours..."
             )
 
-            success_count = 0
-            error_count = 0
-            created_channels = 0
-            updated_channels = 0
-
-            for md_file in md_files:
-                try:
-                    # Skip README files
-                    if md_file.name.upper() == "README.MD":
-                        logger.info(f"Skipping README: {md_file.name}")
-                        continue
-
-                    logger.info(f"Processing: {md_file.name}")
-
-                    # Read file content
-                    content = md_file.read_text(encoding="utf-8")
-                    if not content.strip():
-                        logger.warning(f"Skipping empty file: {md_file.name}")
-                        continue
-
-                    # Build summary
-                    summary = summary_builder.build_summary(md_file, content, docs_path)
-                    embed = summary_builder.create_summary_embed(summary)
-
-                    # Get channel based on file path and mapping
-                    relative_path = md_file.relative_to(docs_path)
-                    channel = channel_manager.get_channel_for_path(str(relative_path))
-                    if not channel:
-                        error_count += 1
-                        logger.error(f"No channel found for {relative_path}")
-                        continue
-
-                    # Edit existing message or create new one
-                    messages = [m async for m in channel.history(limit=1)]
-                    if messages and messages[0].author == bot.user:
-                        # Edit existing message
-                        await messages[0].edit(embed=embed)
-                        updated_channels += 1
-                        logger.info(f"Updated summary in #{channel.name}")
-                    else:
-                        # Create new message
-                        await channel.send(embed=embed)
-                        created_channels += 1
-                        logger.info(f"Created summary in #{channel.name}")
-
-                    success_count += 1
-
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error processing {md_file.name}: {e}", exc_info=True)
+            # Refresh channels in parallel (one ordered worker per channel)
+            engine = RefreshEngine(
+                bot,
+                summary_builder,
+                channel_manager,
+                concurrency=bot.config.refresh_concurrency,
+            )
+            report = await engine.run(md_files, docs_path)
 
             # Send summary
             summary_msg = f"✅ **Refresh terminé !**\n\n"
-            summary_msg += f"📄 {success_count}/{total_files} fichier(s) traité(s)\n"
-            summary_msg += f"✨ {created_channels} nouveau(x) canal/canaux créé(s)\n"
-            summary_msg += f"🔄 {updated_channels} canal/canaux mis à jour\n"
-            if error_count > 0:
-                summary_msg += f"❌ {error_count} erreur(s)\n"
+            summary_msg += f"📄 {report.success_count}/{total_files} fichier(s) traité(s)\n"
+            summary_msg += f"✨ {report.created_count} nouveau(x) canal/canaux créé(s)\n"
+            summary_msg += f"🔄 {report.updated_count} canal/canaux mis à jour\n"
+            summary_msg += f"⏭️ {report.unchanged_count} fichier(s) inchangé(s)\n"
+            if report.retired_count > 0:
+                summary_msg += f"🗑️ {report.retired_count} résumé(s) de fichier(s) supprimé(s) retiré(s)\n"
+            summary_msg += f"⏱️ Durée : {report.elapsed:.1f}s ({report.channel_count} canal/canaux)\n"
+            if report.error_count > 0:
+                summary_msg += f"❌ {report.error_count} erreur(s)\n"
 
             await interaction.channel.send(summary_msg)
 
@@ -174,6 +139,46 @@ def setup_commands(bot):
                 inline=False
             )
 
+        # Outbound scheduler (Discord API queue)
+        stats = bot.scheduler.get_stats()
+        embed.add_field(
+            name="File d'envoi Discord",
+            value=f"📬 {stats['queue_depth']} en attente • {stats['in_flight']} en cours\n"
+                  f"✅ {stats['sent']} envoyé(s) • ❌ {stats['failed']} échec(s) • "
+                  f"⏳ {stats['rate_limited']} rate limit(s)\n"
+                  f"Attente moy. {stats['avg_wait']:.2f}s • max {stats['max_wait']:.2f}s",
+            inline=False
+        )
+
+        # Parse cache
+        cache_stats = bot.parse_cache.get_stats()
+        disk_hits = f" (+{cache_stats['disk_hits']} disque)" if cache_stats["disk"] else ""
+        embed.add_field(
+            name="Cache d'analyse",
+            value=f"🎯 {cache_stats['hits']} succès{disk_hits} • "
+                  f"{cache_stats['misses']} échec(s) • {cache_stats['hit_rate']:.0%}\n"
+                  f"🗂️ {cache_stats['entries']} entrée(s) • "
+                  f"{cache_stats['bytes'] / (1024 * 1024):.1f} Mo • "
+                  f"♻️ {cache_stats['evictions']} éviction(s)",
+            inline=False
+        )
+
+        # Event loop responsiveness and offloaded parsing
+        lag = bot.loop_lag.get_stats()
+        pool = bot.processing_pool.get_stats()
+        last_stall = f" • dernier : `{lag['last_stall']}`" if lag["last_stall"] else ""
+        embed.add_field(
+            name="Boucle d'événements",
+            value=f"⏱️ Latence p50 {lag['p50'] * 1000:.0f} ms • "
+                  f"p95 {lag['p95'] * 1000:.0f} ms • "
+                  f"p99 {lag['p99'] * 1000:.0f} ms • "
+                  f"max {lag['max'] * 1000:.0f} ms\n"
+                  f"🧊 {lag['stalls']} blocage(s){last_stall}\n"
+                  f"⚙️ {pool['offloaded']} analyse(s) en processus • "
+                  f"{pool['inline']} en ligne ({pool['workers']} worker(s))",
+            inline=False
+        )
+
         await interaction.response.send_message(embed=embed)
 
     @refresh.error
@@ -0,0 +1,212 @@
+"""Concurrent refresh engine for republishing documentation summaries."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+import discord
+from bot.scheduler import PRIORITY_LOW
+from processors.summary_builder import SummaryBuilder
+from utils.channel_manager import ChannelManager
+from utils.logger import get_logger
+from utils.message_index import content_hash
+
+logger = get_logger("bot.refresh")
+
+
+@dataclass
+class RefreshReport:
+    """Outcome of a full documentation refresh."""
+
+    total_files: int = 0
+    success_count: int = 0
+    error_count: int = 0
+    created_count: int = 0
+    updated_count: int = 0
+    unchanged_count: int = 0
+    retired_count: int = 0  # Summaries of files no longer in docs_path
+    channel_count: int = 0
+    elapsed: float = 0.0  # Wall time in seconds
+
+
+class RefreshEngine:
+    """
+    Republishes summaries with one worker per target channel.
+
+    Discord rate limits are per channel route, so files are grouped by the
+    channel they map to. Each channel is processed by a single worker (which
+    preserves per-channel ordering) and up to `concurrency` channel workers
+    run at the same time.
+    """
+
+    def __init__(
+        self,
+        bot,
+        summary_builder: SummaryBuilder,
+        channel_manager: ChannelManager,
+        concurrency: int = 4,
+    ):
+        """
+        Initialize the refresh engine.
+
+        Args:
+            bot: DocsBot instance
+            summary_builder: SummaryBuilder used to render summaries
+            channel_manager: ChannelManager used to resolve target channels
+            concurrency: Maximum number of channels updated in parallel
+        """
+        self.bot = bot
+        self.summary_builder = summary_builder
+        self.channel_manager = channel_manager
+        self.concurrency = max(1, concurrency)
+
+    async def run(self, md_files: List[Path], docs_path: Path) -> RefreshReport:
+        """
+        Refresh the summaries of the given files.
+
+        Args:
+            md_files: Markdown files to publish
+            docs_path: Root documentation directory
+
+        Returns:
+            RefreshReport with counts and total wall time
+        """
+        start = time.perf_counter()
+        report = RefreshReport(total_files=len(md_files))
+
+        groups = self._group_by_channel(md_files, docs_path, report)
+        report.channel_count = len(groups)
+
+        logger.info(
+            f"Refreshing {len(md_files)} file(s) across {len(groups)} channel(s) "
+            f"with {self.concurrency} worker(s)"
+        )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(
+            *(
+                self._run_channel(channel, files, docs_path, report, semaphore)
+                for channel, files in groups.values()
+            )
+        )
+
+        await self._retire_stale(md_files, docs_path, report)
+
+        report.elapsed = time.perf_counter() - start
+        logger.info(
+            f"Refresh finished in {report.elapsed:.2f}s: "
+            f"{report.created_count} created, {report.updated_count} updated, "
+            f"{report.unchanged_count} unchanged, {report.retired_count} retired, "
+            f"{report.error_count} error(s)"
+        )
+
+        return report
+
+    async def _retire_stale(
+        self, md_files: List[Path], docs_path: Path, report: RefreshReport
+    ):
+        """Retire indexed summaries whose file no longer exists."""
+        index = self.bot.message_index
+        current = {index.normalize_path(f.relative_to(docs_path)) for f in md_files}
+
+        for path in index.paths():
+            if path in current:
+                continue
+
+            try:
+                if await self.bot.retire_messages(path, priority=PRIORITY_LOW):
+                    report.retired_count += 1
+            except Exception as e:
+                report.error_count += 1
+                logger.error(f"Error retiring summary of {path}: {e}", exc_info=True)
+
+    def _group_by_channel(
+        self, md_files: List[Path], docs_path: Path, report: RefreshReport
+    ) -> Dict[int, Tuple[discord.TextChannel, List[Path]]]:
+        """
+        Group files by target channel, keeping their original order.
+
+        Args:
+            md_files: Markdown files to publish
+            docs_path: Root documentation directory
+            report: Report updated with resolution errors
+
+        Returns:
+            Dict mapping channel ID to (channel, files)
+        """
+        groups: Dict[int, Tuple[discord.TextChannel, List[Path]]] = {}
+
+        for md_file in md_files:
+            # Skip README files
+            if md_file.name.upper() == "README.MD":
+                logger.info(f"Skipping README: {md_file.name}")
+                continue
+
+            relative_path = md_file.relative_to(docs_path)
+            channel = self.channel_manager.get_channel_for_path(str(relative_path))
+            if not channel:
+                report.error_count += 1
+                logger.error(f"No channel found for {relative_path}")
+                continue
+
+            groups.setdefault(channel.id, (channel, []))[1].append(md_file)
+
+        return groups
+
+    async def _run_channel(
+        self,
+        channel: discord.TextChannel,
+        files: List[Path],
+        docs_path: Path,
+        report: RefreshReport,
+        semaphore: asyncio.Semaphore,
+    ):
+        """Process all files of one channel sequentially."""
+        async with semaphore:
+            for md_file in files:
+                try:
+                    await self._process_file(channel, md_file, docs_path, report)
+                except Exception as e:
+                    report.error_count += 1
+                    logger.error(f"Error processing {md_file.name}: {e}", exc_info=True)
+
+    async def _process_file(
+        self,
+        channel: discord.TextChannel,
+        md_file: Path,
+        docs_path: Path,
+        report: RefreshReport,
+    ):
+        """Render and publish the summary of a single file."""
+        logger.info(f"Processing: {md_file.name}")
+
+        # Read file content
+        content = md_file.read_text(encoding="utf-8")
+        if not content.strip():
+            logger.warning(f"Skipping empty file: {md_file.name}")
+            return
+
+        # Always render: publish_summary skips the API call when the embed is
+        # identical, so config or format changes still reach Discord
+        relative_path = str(md_file.relative_to(docs_path))
+        file_hash = content_hash(content)
+
+        # Build summary
+        summary = await self.bot.processing_pool.summarize(
+            self.summary_builder, md_file, content, docs_path
+        )
+        embed = self.summary_builder.create_summary_embed(summary)
+
+        # Edit the indexed message or create a new one
+        result = await self.bot.publish_summary(
+            channel, relative_path, embed, file_hash, priority=PRIORITY_LOW
+        )
+        if result == "updated":
+            report.updated_count += 1
+        elif result == "created":
+            report.created_count += 1
+        else:
+            report.unchanged_count += 1
+
+        report.success_count += 1
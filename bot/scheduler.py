@@ -0,0 +1,394 @@
+"""Rate-limit-aware scheduler for outbound Discord API requests."""
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import aiohttp
+from utils.logger import get_logger
+from utils.metrics import DISCORD_RATE_LIMITS, DISCORD_REQUESTS
+
+logger = get_logger("bot.scheduler")
+
+# Lower value = dispatched first
+PRIORITY_HIGH = 0  # Live updates (webhook / watcher)
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10  # Bulk work (/refresh)
+
+# Path segments whose following ID is a "major parameter" (own bucket)
+_MAJOR_SEGMENTS = ("channels", "guilds", "webhooks")
+_API_PREFIX = re.compile(r"^/api(/v\d+)?")
+_ANY_ID = re.compile(r"/\d+")
+
+
+def route_key(method: str, channel_id: int, with_message_id: bool = False) -> str:
+    """
+    Build the scheduler route key for a channel messages endpoint.
+
+    Args:
+        method: HTTP method (e.g., "POST", "PATCH")
+        channel_id: Channel ID (major parameter)
+        with_message_id: Whether the route targets a single message
+
+    Returns:
+        Route key (e.g., "PATCH /channels/123/messages/{id}")
+    """
+    key = f"{method} /channels/{channel_id}/messages"
+    return key + "/{id}" if with_message_id else key
+
+
+def route_key_from_url(method: str, path: str) -> str:
+    """
+    Normalize a Discord API URL path into a scheduler route key.
+
+    Major parameters (channel, guild, webhook IDs) are kept, other IDs are
+    replaced by a placeholder, so keys match those built by route_key().
+
+    Args:
+        method: HTTP method
+        path: URL path (e.g., "/api/v10/channels/123/messages/456")
+
+    Returns:
+        Route key (e.g., "PATCH /channels/123/messages/{id}")
+    """
+    segments = _API_PREFIX.sub("", path).strip("/").split("/")
+    normalized = []
+
+    for i, segment in enumerate(segments):
+        if segment.isdigit() and (i == 0 or segments[i - 1] not in _MAJOR_SEGMENTS):
+            normalized.append("{id}")
+        else:
+            normalized.append(segment)
+
+    return f"{method} /" + "/".join(normalized)
+
+
+@dataclass
+class RouteBucket:
+    """Rate limit state of a single route, as reported by Discord."""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None  # None = unknown (no headers seen yet)
+    reset_at: float = 0.0  # time.monotonic() deadline
+    next_allowed: float = 0.0  # Spacing used while the bucket is unknown
+    in_flight: int = 0
+
+    def wait_time(self, now: float) -> float:
+        """
+        Get how long a new request on this route must wait.
+
+        Args:
+            now: Current time.monotonic() value
+
+        Returns:
+            0.0 if a request can be sent now, seconds to wait otherwise
+        """
+        if self.reset_at and now >= self.reset_at:
+            # Window elapsed: the bucket is full again
+            self.remaining = self.limit
+            self.reset_at = 0.0
+
+        if self.remaining is None:
+            if self.in_flight:
+                return float("inf")  # Wait for the in-flight request's headers
+            return max(0.0, self.next_allowed - now)
+
+        if self.remaining - self.in_flight > 0:
+            return 0.0
+
+        if self.reset_at:
+            return self.reset_at - now
+
+        return float("inf")  # Exhausted, waiting for an in-flight response
+
+
+@dataclass(order=True)
+class _QueuedRequest:
+    """A request waiting in the scheduler queue."""
+
+    priority: int
+    sequence: int
+    route: str = field(compare=False)
+    factory: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class OutboundScheduler:
+    """
+    Central queue for outbound Discord sends and edits.
+
+    Requests are dispatched by priority as soon as their route's bucket has
+    capacity. Each route keeps a heap of its requests keyed on (priority,
+    sequence), so finding the next request only looks at each route's head.
+    Bucket state is learned from Discord's X-RateLimit-* response headers
+    through an aiohttp trace hooked into discord.py's HTTP client.
+    """
+
+    def __init__(self, unknown_bucket_delay: float = 0.5):
+        """
+        Initialize the scheduler.
+
+        Args:
+            unknown_bucket_delay: Spacing between requests on a route whose
+                rate limit headers have not been seen yet
+        """
+        self.unknown_bucket_delay = unknown_bucket_delay
+        self._buckets: Dict[str, RouteBucket] = {}
+        self._queues: Dict[str, List[_QueuedRequest]] = {}  # Route -> heap
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._executing: Set[asyncio.Task] = set()
+        self._global_reset_at = 0.0
+
+        # Statistics
+        self.sent_count = 0
+        self.failed_count = 0
+        self.rate_limited_count = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def start(self):
+        """Start the dispatcher task (requires a running event loop)."""
+        if self._dispatcher and not self._dispatcher.done():
+            return
+
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        logger.info("Outbound scheduler started")
+
+    async def stop(self):
+        """Stop the dispatcher and cancel pending and in-flight requests."""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        for task in list(self._executing):
+            task.cancel()
+        await asyncio.gather(*self._executing, return_exceptions=True)
+
+        for queue in self._queues.values():
+            for request in queue:
+                if not request.future.done():
+                    request.future.cancel()
+        self._queues.clear()
+
+        logger.info("Outbound scheduler stopped")
+
+    async def submit(
+        self,
+        route: str,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_NORMAL,
+    ) -> Any:
+        """
+        Queue a request and wait for its result.
+
+        Args:
+            route: Route key (see route_key())
+            factory: Zero-argument callable returning the request coroutine
+            priority: Dispatch priority (lower first)
+
+        Returns:
+            The result of the request coroutine
+
+        Raises:
+            Whatever the request coroutine raises
+        """
+        self.start()
+
+        request = _QueuedRequest(
+            priority=priority,
+            sequence=next(self._sequence),
+            route=route,
+            factory=factory,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        heapq.heappush(self._queues.setdefault(route, []), request)
+        self._wakeup.set()
+
+        return await request.future
+
+    def _next_ready(self) -> Tuple[Optional[_QueuedRequest], Optional[float]]:
+        """
+        Find the highest-priority request whose route can be sent now.
+
+        Returns:
+            (request, None) if one is ready, otherwise (None, seconds until
+            the earliest bucket frees up, or None to wait for a new event)
+        """
+        now = time.monotonic()
+
+        if now < self._global_reset_at:
+            return None, self._global_reset_at - now
+
+        best: Optional[List[_QueuedRequest]] = None
+        min_wait = float("inf")
+
+        for route, queue in list(self._queues.items()):
+            # Drop requests whose caller stopped waiting (cancelled)
+            while queue and queue[0].future.done():
+                heapq.heappop(queue)
+            if not queue:
+                del self._queues[route]
+                continue
+
+            wait = self._buckets.setdefault(route, RouteBucket()).wait_time(now)
+            if wait > 0:
+                min_wait = min(min_wait, wait)
+            elif best is None or queue[0] < best[0]:
+                best = queue
+
+        if best is not None:
+            request = heapq.heappop(best)
+            if not best:
+                del self._queues[request.route]
+            return request, None
+
+        return None, None if min_wait == float("inf") else min_wait
+
+    async def _dispatch_loop(self):
+        """Dispatch queued requests as their buckets allow."""
+        while True:
+            request, delay = self._next_ready()
+
+            if request is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            waited = time.monotonic() - request.enqueued_at
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+            self._buckets[request.route].in_flight += 1
+            task = asyncio.create_task(self._execute(request))
+            self._executing.add(task)
+            task.add_done_callback(self._executing.discard)
+
+    async def _execute(self, request: _QueuedRequest):
+        """Run a dispatched request and resolve its future."""
+        bucket = self._buckets[request.route]
+
+        try:
+            result = await request.factory()
+            self.sent_count += 1
+            if not request.future.done():
+                request.future.set_result(result)
+
+        except Exception as e:
+            self.failed_count += 1
+            if not request.future.done():
+                request.future.set_exception(e)
+
+        except BaseException:
+            # Cancelled (e.g., shutdown): never leave the caller waiting
+            self.failed_count += 1
+            if not request.future.done():
+                request.future.cancel()
+            raise
+
+        finally:
+            bucket.in_flight -= 1
+            if bucket.remaining is None:
+                bucket.next_allowed = time.monotonic() + self.unknown_bucket_delay
+            self._wakeup.set()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Build an aiohttp trace that feeds response headers to the scheduler.
+
+        Pass it to discord.py through the Client `http_trace` argument.
+
+        Returns:
+            aiohttp.TraceConfig instance
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_end(session, context, params):
+            self.record_response(
+                params.method,
+                params.url.path,
+                params.response.status,
+                params.response.headers,
+            )
+
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+    def record_response(self, method: str, path: str, status: int, headers):
+        """
+        Update bucket state from a Discord API response.
+
+        Args:
+            method: HTTP method
+            path: URL path
+            status: HTTP status code
+            headers: Response headers
+        """
+        route = route_key_from_url(method, path)
+        bucket = self._buckets.setdefault(route, RouteBucket())
+        now = time.monotonic()
+
+        # Metrics labels without any ID, to bound their cardinality
+        route_label = _ANY_ID.sub("/{id}", route)
+        DISCORD_REQUESTS.inc(route_label, str(status))
+
+        if status == 429:
+            self.rate_limited_count += 1
+            DISCORD_RATE_LIMITS.inc(
+                route_label, "global" if headers.get("X-RateLimit-Global") else "route"
+            )
+            retry_after = float(
+                headers.get("Retry-After")
+                or headers.get("X-RateLimit-Reset-After")
+                or self.unknown_bucket_delay
+            )
+
+            if headers.get("X-RateLimit-Global"):
+                self._global_reset_at = now + retry_after
+                logger.warning(f"Global rate limit hit, pausing {retry_after:.2f}s")
+            else:
+                bucket.remaining = 0
+                bucket.reset_at = now + retry_after
+                logger.warning(f"Rate limited on {route}, retry in {retry_after:.2f}s")
+
+        elif "X-RateLimit-Remaining" in headers:
+            bucket.remaining = int(headers["X-RateLimit-Remaining"])
+            bucket.limit = int(headers.get("X-RateLimit-Limit", bucket.remaining + 1))
+            bucket.reset_at = now + float(headers.get("X-RateLimit-Reset-After", 0))
+
+        if self._wakeup:
+            self._wakeup.set()
+
+    def get_stats(self) -> dict:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dict with queue depth, in-flight count, sent/failed/429 counters
+            and average/max queue wait time in seconds
+        """
+        dispatched = self.sent_count + self.failed_count
+        return {
+            "queue_depth": sum(len(queue) for queue in self._queues.values()),
+            "in_flight": sum(b.in_flight for b in self._buckets.values()),
+            "sent": self.sent_count,
+            "failed": self.failed_count,
+            "rate_limited": self.rate_limited_count,
+            "avg_wait": self.total_wait / dispatched if dispatched else 0.0,
+            "max_wait": self.max_wait,
+            "routes": len(self._buckets),
+        }
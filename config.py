@@ -5,6 +5,23 @@ from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
+# Folder paths (relative to docs/) to Discord channel names ("root" for
+# files at the docs root)
+CHANNEL_MAPPING = {
+    "01-users": "docs-users",
+    "02-developers/agent": "docs-agent",
+    "02-developers/api": "docs-api",
+    "02-developers/backend": "docs-backend",
+    "02-developers/dashboard": "docs-dashboard",
+    "02-developers/database": "docs-database",
+    "02-developers/installer": "docs-installer",
+    "02-developers/testing": "docs-testing",
+    "03-devops": "docs-devops",
+    "04-management": "docs-management",
+    "05-implementation": "docs-implementation",
+    "root": "documentation",
+}
+
 
 class Config:
     """Bot configuration loaded from environment variables."""
@@ -23,12 +40,27 @@ class Config:
         # Bot Behavior
         self.auto_start_watcher = self._get_bool("AUTO_START_WATCHER", True)
         self.watch_recursive = self._get_bool("WATCH_RECURSIVE", True)
+        # "native" (OS notifications) or "polling" (network/bind-mounted volumes)
+        self.watcher_backend = self._get_env("WATCHER_BACKEND", "native").lower()
+        self.watch_poll_interval = self._get_float("WATCH_POLL_INTERVAL", 2.0)
+        self.watch_debounce = self._get_float("WATCH_DEBOUNCE", 1.0)
+        self.watch_max_wait = self._get_float("WATCH_MAX_WAIT", 10.0)
+        self.watch_queue_size = self._get_int("WATCH_QUEUE_SIZE", 100)
+        self.watch_workers = self._get_int("WATCH_WORKERS", 2)
+        self.reconcile_on_start = self._get_bool("RECONCILE_ON_START", True)
 
         # Message Formatting
         self.embed_color = int(self._get_env("EMBED_COLOR", "0x5865F2"), 16)
         self.max_message_length = self._get_int("MAX_MESSAGE_LENGTH", 2000)
         self.message_delay = self._get_float("MESSAGE_DELAY", 0.5)
 
+        # Refresh
+        self.refresh_concurrency = self._get_int("REFRESH_CONCURRENCY", 4)
+
+        # Event loop monitoring (seconds)
+        self.loop_lag_interval = self._get_float("LOOP_LAG_INTERVAL", 0.5)
+        self.loop_lag_threshold = self._get_float("LOOP_LAG_THRESHOLD", 0.25)
+
         # Logging
         self.log_level = self._get_env("LOG_LEVEL", "INFO")
         self.log_file = self._get_env("LOG_FILE", "bot.log")
@@ -37,6 +69,12 @@ class Config:
         self.use_webhook = self._get_bool("USE_WEBHOOK", False)
         self.webhook_port = self._get_int("WEBHOOK_PORT", 8080)
         self.webhook_secret = os.getenv("WEBHOOK_SECRET", "")
+        self.webhook_queue_size = self._get_int("WEBHOOK_QUEUE_SIZE", 100)
+        self.webhook_workers = self._get_int("WEBHOOK_WORKERS", 4)
+        self.webhook_coalesce_window = self._get_float("WEBHOOK_COALESCE_WINDOW", 2.0)
+
+        # Git backend for webhook mode ("subprocess" or "dulwich")
+        self.git_backend = self._get_env("GIT_BACKEND", "subprocess").lower()
 
         # GitHub Configuration (for links in embeds)
         self.github_repo_url = self._get_env("GITHUB_REPO_URL", "")
@@ -45,6 +83,21 @@ class Config:
         self.auto_create_channels = self._get_bool("AUTO_CREATE_CHANNELS", True)
         self.docs_category_id = self._get_int("DOCS_CATEGORY_ID", 0)  # 0 = not set
 
+        # What happens to the message of a deleted doc ("delete" or "archive")
+        self.deleted_doc_action = self._get_env("DELETED_DOC_ACTION", "delete").lower()
+
+        # State persistence (file → message index)
+        self.state_db_path = Path(self._get_env("STATE_DB_PATH", "bot_state.db")).expanduser()
+
+        # Parse cache (parsed documents and summaries, keyed by content hash)
+        self.parse_cache_entries = self._get_int("PARSE_CACHE_ENTRIES", 256)
+        self.parse_cache_mb = self._get_int("PARSE_CACHE_MB", 32)
+        self.parse_cache_disk = self._get_bool("PARSE_CACHE_DISK", False)
+
+        # Process pool for large documents (0 workers = parse on the event loop)
+        self.offload_workers = self._get_int("OFFLOAD_WORKERS", 2)
+        self.offload_threshold_kb = self._get_int("OFFLOAD_THRESHOLD_KB", 128)
+
         # Validate configuration
         self._validate()
 
@@ -122,6 +175,70 @@ class Config:
                 f"MAX_MESSAGE_LENGTH too small: {self.max_message_length}"
             )
 
+        # Validate git backend
+        if self.git_backend not in ("subprocess", "dulwich"):
+            raise ValueError(
+                f"GIT_BACKEND must be 'subprocess' or 'dulwich', got: {self.git_backend}"
+            )
+
+        # Validate deleted doc action
+        if self.deleted_doc_action not in ("delete", "archive"):
+            raise ValueError(
+                f"DELETED_DOC_ACTION must be 'delete' or 'archive', got: {self.deleted_doc_action}"
+            )
+
+        # Validate watcher backend
+        if self.watcher_backend not in ("native", "polling"):
+            raise ValueError(
+                f"WATCHER_BACKEND must be 'native' or 'polling', got: {self.watcher_backend}"
+            )
+
+        if self.watch_poll_interval <= 0:
+            raise ValueError(
+                f"WATCH_POLL_INTERVAL must be positive, got: {self.watch_poll_interval}"
+            )
+
+        # Validate watcher debouncing
+        if self.watch_debounce < 0 or self.watch_max_wait < 0:
+            raise ValueError(
+                f"WATCH_DEBOUNCE and WATCH_MAX_WAIT must be positive, "
+                f"got: {self.watch_debounce}, {self.watch_max_wait}"
+            )
+
+        # Validate watcher queue
+        if self.watch_queue_size < 1 or self.watch_workers < 1:
+            raise ValueError(
+                f"WATCH_QUEUE_SIZE and WATCH_WORKERS must be at least 1, "
+                f"got: {self.watch_queue_size}, {self.watch_workers}"
+            )
+
+        # Validate parse cache bounds
+        if self.parse_cache_entries < 0 or self.parse_cache_mb < 0:
+            raise ValueError(
+                f"PARSE_CACHE_ENTRIES and PARSE_CACHE_MB cannot be negative, "
+                f"got: {self.parse_cache_entries}, {self.parse_cache_mb}"
+            )
+
+        # Validate process pool
+        if self.offload_workers < 0 or self.offload_threshold_kb < 0:
+            raise ValueError(
+                f"OFFLOAD_WORKERS and OFFLOAD_THRESHOLD_KB cannot be negative, "
+                f"got: {self.offload_workers}, {self.offload_threshold_kb}"
+            )
+
+        # Validate event loop monitoring
+        if self.loop_lag_interval <= 0 or self.loop_lag_threshold <= 0:
+            raise ValueError(
+                f"LOOP_LAG_INTERVAL and LOOP_LAG_THRESHOLD must be positive, "
+                f"got: {self.loop_lag_interval}, {self.loop_lag_threshold}"
+            )
+
+        # Validate refresh concurrency
+        if self.refresh_concurrency < 1:
+            raise ValueError(
+                f"REFRESH_CONCURRENCY must be at least 1, got: {self.refresh_concurrency}"
+            )
+
     def get_channel_mapping(self) -> dict[str, str]:
         """
         Get folder to channel name mapping.
@@ -129,20 +246,7 @@ class Config:
         Returns:
             Dict mapping folder paths (relative to docs/) to Discord channel names.
         """
-        return {
-            "01-users": "docs-users",
-            "02-developers/agent": "docs-agent",
-            "02-developers/api": "docs-api",
-            "02-developers/backend": "docs-backend",
-            "02-developers/dashboard": "docs-dashboard",
-            "02-developers/database": "docs-database",
-            "02-developers/installer": "docs-installer",
-            "02-developers/testing": "docs-testing",
-            "03-devops": "docs-devops",
-            "04-management": "docs-management",
-            "05-implementation": "docs-implementation",
-            "root": "documentation",
-        }
+        return dict(CHANNEL_MAPPING)
 
 
 def load_config() -> Config:
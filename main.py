@@ -145,9 +145,16 @@ async def main():
         # File watcher mode for local development
         from watcher.file_watcher import DocsWatcher
         from watcher.event_handler import DocsEventHandler
+        from watcher.reconciler import StartupReconciler
 
         event_handler = DocsEventHandler(bot, config)
         watcher = DocsWatcher(config, event_handler)
+        reconciler = StartupReconciler(
+            event_handler,
+            event_handler.manifest,
+            config.docs_path,
+            recursive=config.watch_recursive,
+        )
         watcher_instance = watcher
 
         @bot.event
@@ -185,6 +192,14 @@ async def main():
                 except Exception as e:
                     logger.error(f"Failed to start file watcher: {e}")
 
+                # Catch up on edits made while the bot was offline (once:
+                # on_ready fires again after reconnects)
+                if config.reconcile_on_start and not reconciler.has_run:
+                    try:
+                        await reconciler.run()
+                    except Exception as e:
+                        logger.error(f"Startup reconciliation failed: {e}", exc_info=True)
+
     try:
         # Start the bot (blocking)
         logger.info("🚀 Starting Discord bot...")
@@ -198,8 +213,10 @@ async def main():
         # Cleanup
         logger.info("Cleaning up...")
 
-        if watcher_instance and watcher_instance.is_running:
-            watcher_instance.stop()
+        if watcher_instance:
+            if watcher_instance.is_running:
+                watcher_instance.stop()
+            await watcher_instance.event_handler.stop()
 
         if webhook_server:
             await webhook_server.stop()
@@ -2,12 +2,16 @@
 
 import discord
 from datetime import datetime
-from typing import List
+from typing import Iterable, Iterator, List
 from processors.markdown_parser import ParsedDocument
 from utils.logger import get_logger
 
 logger = get_logger("embed_builder")
 
+# Discord limits for a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
 
 class EmbedBuilder:
     """Builds Discord embeds from parsed content."""
@@ -71,6 +75,22 @@ class EmbedBuilder:
 
         return embed
 
+    def iter_embeds(
+        self, parsed_doc: ParsedDocument, chunks: Iterable[dict]
+    ) -> Iterator[discord.Embed]:
+        """
+        Lazily create embeds from content chunks.
+
+        Args:
+            parsed_doc: Parsed document object
+            chunks: Chunk dicts (list or generator)
+
+        Yields:
+            Discord Embed objects, one per chunk
+        """
+        for chunk in chunks:
+            yield self.create_embed(parsed_doc, chunk, chunk["file_name"])
+
     def create_embeds_from_chunks(
         self, parsed_doc: ParsedDocument, chunks: List[dict]
     ) -> List[discord.Embed]:
@@ -84,13 +104,7 @@ class EmbedBuilder:
         Returns:
             List of Discord Embed objects
         """
-        embeds = []
-
-        for chunk in chunks:
-            embed = self.create_embed(
-                parsed_doc, chunk, chunk["file_name"]
-            )
-            embeds.append(embed)
+        embeds = list(self.iter_embeds(parsed_doc, chunks))
 
         logger.info(
             f"Created {len(embeds)} embed(s) for {parsed_doc.title}"
@@ -98,6 +112,79 @@ class EmbedBuilder:
 
         return embeds
 
+    def iter_batches(
+        self,
+        embeds: Iterable[discord.Embed],
+        max_embeds: int = MAX_EMBEDS_PER_MESSAGE,
+        max_chars: int = MAX_EMBED_CHARS_PER_MESSAGE,
+    ) -> Iterator[List[discord.Embed]]:
+        """
+        Pack embeds into multi-embed messages as they are produced.
+
+        Embeds keep their order: each message is filled until adding the
+        next embed would exceed the embed count or the total character
+        count (title, description, fields, footer) allowed per message. A
+        batch is yielded as soon as it is complete, so the first message can
+        be sent before later embeds are built.
+
+        With chunks of about 1900 characters the character limit is reached
+        first: about three chunk embeds fit in a message, not ten.
+
+        Args:
+            embeds: Embeds to pack, in posting order (list or generator)
+            max_embeds: Maximum embeds per message
+            max_chars: Maximum total embed characters per message
+
+        Yields:
+            Embed batches, one per message
+        """
+        current = []
+        current_chars = 0
+
+        for embed in embeds:
+            size = len(embed)
+
+            if current and current_chars + size > max_chars:
+                yield current
+                current = []
+                current_chars = 0
+
+            current.append(embed)
+            current_chars += size
+
+            if len(current) >= max_embeds:
+                yield current
+                current = []
+                current_chars = 0
+
+        if current:
+            yield current
+
+    def pack_embeds(
+        self,
+        embeds: List[discord.Embed],
+        max_embeds: int = MAX_EMBEDS_PER_MESSAGE,
+        max_chars: int = MAX_EMBED_CHARS_PER_MESSAGE,
+    ) -> List[List[discord.Embed]]:
+        """
+        Pack embeds into multi-embed messages within Discord's limits.
+
+        See iter_batches() for the packing rules.
+
+        Args:
+            embeds: Embeds to pack, in posting order
+            max_embeds: Maximum embeds per message
+            max_chars: Maximum total embed characters per message
+
+        Returns:
+            List of embed batches, one per message
+        """
+        batches = list(self.iter_batches(embeds, max_embeds, max_chars))
+
+        logger.debug(f"Packed {len(embeds)} embed(s) into {len(batches)} message(s)")
+
+        return batches
+
     def create_simple_embed(
         self, title: str, description: str, color: int = None
     ) -> discord.Embed:
@@ -121,6 +208,25 @@ class EmbedBuilder:
 
         return embed
 
+    def create_archived_embed(self, file_name: str) -> discord.Embed:
+        """
+        Create the embed replacing the message of a deleted document.
+
+        Args:
+            file_name: Name of the deleted file
+
+        Returns:
+            Discord Embed object with archived styling
+        """
+        embed = discord.Embed(
+            title=f"🗑️ {file_name}",
+            description="Ce document a été supprimé du dépôt.",
+            color=0x747F8D,  # Grey
+            timestamp=datetime.utcnow(),
+        )
+
+        return embed
+
     def create_error_embed(self, error_message: str) -> discord.Embed:
         """
         Create an error embed.
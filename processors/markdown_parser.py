@@ -1,9 +1,18 @@
 """Markdown parsing and conversion for Discord."""
 
+import os
 import re
 from dataclasses import dataclass
 from typing import List, Optional
+from processors.markdown_tokenizer import (
+    TOKEN_BLOCKQUOTE,
+    TOKEN_HEADING,
+    TokenizedDocument,
+    tokenize,
+)
 from utils.logger import get_logger
+from utils.message_index import content_hash
+from utils.parse_cache import KIND_PARSED, ParseCache
 
 logger = get_logger("markdown_parser")
 
@@ -26,36 +35,57 @@ class ParsedDocument:
     content: str
     code_blocks: List[CodeBlock]
     metadata: dict
+    tokens: Optional[TokenizedDocument] = None  # Block tokens, reused by other processors
 
 
 class MarkdownParser:
     """Parser for markdown documents."""
 
-    def __init__(self):
-        """Initialize the markdown parser."""
-        self.code_block_pattern = re.compile(
-            r"```(\w*)\n(.*?)```", re.DOTALL | re.MULTILINE
-        )
+    def __init__(self, cache: Optional[ParseCache] = None):
+        """
+        Initialize the markdown parser.
 
-    def parse_file(self, file_path: str, content: str) -> ParsedDocument:
+        Args:
+            cache: Cache of parsed documents (None to always parse)
+        """
+        self.cache = cache
+        self.metadata_pattern = re.compile(r">\s*\*\*(.+?)\*\*\s*[:\-]\s*(.+)")
+
+    def parse_file(
+        self,
+        file_path: str,
+        content: str,
+        tokens: Optional[TokenizedDocument] = None,
+        count_lookup: bool = True,
+    ) -> ParsedDocument:
         """
         Parse a markdown file.
 
         Args:
             file_path: Path to the file
             content: File content
+            tokens: Already tokenized content (tokenized here if omitted)
+            count_lookup: Whether the cache lookup counts in the cache
+                statistics (False when called after a missed summary lookup)
 
         Returns:
             ParsedDocument object
         """
+        cached = self.get_cached(file_path, content, count=count_lookup)
+        if cached is not None:
+            return cached
+
+        if tokens is None:
+            tokens = tokenize(content)
+
         # Extract title (first h1 heading)
-        title = self._extract_title(content, file_path)
+        title = self._extract_title(tokens, file_path)
 
         # Extract code blocks
-        code_blocks = self._extract_code_blocks(content)
+        code_blocks = self._extract_code_blocks(tokens)
 
         # Extract metadata from blockquotes at start
-        metadata = self._extract_metadata(content)
+        metadata = self._extract_metadata(tokens)
 
         logger.debug(
             f"Parsed {file_path}: title='{title}', "
@@ -63,47 +93,78 @@ class MarkdownParser:
             f"{len(metadata)} metadata items"
         )
 
-        return ParsedDocument(
+        parsed = ParsedDocument(
             title=title,
             content=content,
             code_blocks=code_blocks,
             metadata=metadata,
+            tokens=tokens,
         )
 
-    def _extract_title(self, content: str, file_path: str) -> str:
+        self.remember(file_path, parsed)
+        return parsed
+
+    def get_cached(
+        self, file_path: str, content: str, count: bool = True
+    ) -> Optional[ParsedDocument]:
+        """
+        Look up an already parsed version of a document.
+
+        Args:
+            file_path: Path to the file
+            content: File content
+            count: Whether the lookup counts in the cache statistics
+
+        Returns:
+            Cached ParsedDocument, or None if not cached (or no cache)
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(KIND_PARSED, self._cache_key(file_path, content), count)
+
+    def remember(self, file_path: str, parsed: ParsedDocument):
+        """
+        Cache a document parsed elsewhere (e.g., in a worker process).
+
+        Args:
+            file_path: Path to the file
+            parsed: ParsedDocument of the file
+        """
+        if self.cache is None:
+            return
+
+        # Content, plus roughly as much again for the token texts
+        key = self._cache_key(file_path, parsed.content)
+        self.cache.put(KIND_PARSED, key, parsed, 2 * len(parsed.content) + 512)
+
+    @staticmethod
+    def _cache_key(file_path: str, content: str) -> str:
+        """Build the cache key (the title falls back to the file name)."""
+        return ParseCache.make_key(content_hash(content), os.path.basename(file_path))
+
+    def _extract_title(self, tokens: TokenizedDocument, file_path: str) -> str:
         """Extract the first h1 heading as title."""
-        match = re.search(r"^#\s+(.+?)$", content, re.MULTILINE)
-
-        if match:
-            return match.group(1).strip()
-        else:
-            # Fallback to filename
-            import os
-
-            return os.path.basename(file_path).replace(".md", "")
-
-    def _extract_code_blocks(self, content: str) -> List[CodeBlock]:
-        """Extract all code blocks from the content."""
-        code_blocks = []
-
-        for match in self.code_block_pattern.finditer(content):
-            language = match.group(1) or "text"
-            code_content = match.group(2)
-            start_pos = match.start()
-            end_pos = match.end()
-
-            code_blocks.append(
-                CodeBlock(
-                    language=language,
-                    content=code_content,
-                    start_pos=start_pos,
-                    end_pos=end_pos,
-                )
+        for heading in tokens.headings(level=1):
+            if heading.text:
+                return heading.text
+
+        # Fallback to filename
+        return os.path.basename(file_path).replace(".md", "")
+
+    def _extract_code_blocks(self, tokens: TokenizedDocument) -> List[CodeBlock]:
+        """Extract all (closed) code blocks from the token stream."""
+        return [
+            CodeBlock(
+                language=fence.language or "text",
+                content=fence.text,
+                start_pos=fence.start,
+                end_pos=fence.end,
             )
+            for fence in tokens.fences()
+            if fence.closed
+        ]
 
-        return code_blocks
-
-    def _extract_metadata(self, content: str) -> dict:
+    def _extract_metadata(self, tokens: TokenizedDocument) -> dict:
         """
         Extract metadata from blockquotes at the start of the file.
 
@@ -112,27 +173,20 @@ class MarkdownParser:
             > **Date** : 2026-01-02
         """
         metadata = {}
-
-        # Look for blockquotes at the start (after title)
-        lines = content.split("\n")
         in_blockquote = False
 
-        for line in lines:
-            stripped = line.strip()
-
-            # Skip empty lines and title
-            if not stripped or stripped.startswith("#"):
+        for token in tokens.tokens:
+            # Headings do not end the metadata block
+            if token.kind == TOKEN_HEADING:
                 continue
 
-            # Check if this is a blockquote
-            if stripped.startswith(">"):
+            if token.kind == TOKEN_BLOCKQUOTE:
                 in_blockquote = True
                 # Try to parse key: value
-                match = re.search(r">\s*\*\*(.+?)\*\*\s*[:\-]\s*(.+)", stripped)
-                if match:
-                    key = match.group(1).strip()
-                    value = match.group(2).strip()
-                    metadata[key] = value
+                for line in token.text.split("\n"):
+                    match = self.metadata_pattern.search(line)
+                    if match:
+                        metadata[match.group(1).strip()] = match.group(2).strip()
             elif in_blockquote:
                 # End of blockquote section
                 break
@@ -161,42 +215,31 @@ class MarkdownParser:
         # No conversion needed for now - Discord handles most markdown well
         return content
 
-    def extract_sections(self, content: str) -> List[tuple[str, str]]:
+    def extract_sections(
+        self, content: str, tokens: Optional[TokenizedDocument] = None
+    ) -> List[tuple[str, str]]:
         """
         Extract sections (by h2 headers) from content.
 
         Args:
             content: Markdown content
+            tokens: Already tokenized content (tokenized here if omitted)
 
         Returns:
             List of (section_title, section_content) tuples
         """
+        if tokens is None:
+            tokens = tokenize(content)
+
+        headings = [h for h in tokens.headings(level=2) if h.text]
         sections = []
-        lines = content.split("\n")
-
-        current_section_title = None
-        current_section_lines = []
-
-        for line in lines:
-            # Check if this is an h2 heading
-            if line.startswith("## "):
-                # Save previous section if exists
-                if current_section_title:
-                    sections.append(
-                        (current_section_title, "\n".join(current_section_lines))
-                    )
-
-                # Start new section
-                current_section_title = line[3:].strip()
-                current_section_lines = []
-            else:
-                if current_section_title is not None:
-                    current_section_lines.append(line)
 
-        # Save last section
-        if current_section_title:
-            sections.append(
-                (current_section_title, "\n".join(current_section_lines))
-            )
+        for i, heading in enumerate(headings):
+            body_start = heading.end + 1
+            if i + 1 < len(headings):
+                body = content[body_start:headings[i + 1].start - 1]
+            else:
+                body = content[body_start:]
+            sections.append((heading.text, body))
 
         return sections
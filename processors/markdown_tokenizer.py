@@ -0,0 +1,174 @@
+"""Single-pass block-level markdown tokenizer."""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+from utils.logger import get_logger
+
+logger = get_logger("markdown_tokenizer")
+
+# Token kinds
+TOKEN_HEADING = "heading"
+TOKEN_FENCE = "fence"
+TOKEN_BLOCKQUOTE = "blockquote"
+TOKEN_PARAGRAPH = "paragraph"
+
+FENCE_MARKER = "```"
+
+
+@dataclass
+class Token:
+    """A block of a markdown document, with its character offsets."""
+
+    kind: str  # One of the TOKEN_* constants
+    start: int  # Offset of the block's first character
+    end: int  # Offset just past the block's last line (newline excluded)
+    text: str = ""  # Heading text, fence body, or stripped lines joined by "\n"
+    level: int = 0  # Heading level (1-6)
+    language: str = ""  # Fence info string
+    closed: bool = True  # False for a fence left open at the end of the file
+
+
+@dataclass
+class TokenizedDocument:
+    """Token stream and line statistics of a markdown document."""
+
+    content: str
+    tokens: List[Token] = field(default_factory=list)
+    line_count: int = 0
+
+    @property
+    def byte_size(self) -> int:
+        """Size of the content encoded as UTF-8."""
+        if self.content.isascii():
+            return len(self.content)
+        return len(self.content.encode("utf-8"))
+
+    def headings(self, level: Optional[int] = None) -> List[Token]:
+        """
+        Get the heading tokens, optionally of a single level.
+
+        Args:
+            level: Heading level to keep (None for all)
+
+        Returns:
+            List of heading tokens in document order
+        """
+        return [
+            token
+            for token in self.tokens
+            if token.kind == TOKEN_HEADING and (level is None or token.level == level)
+        ]
+
+    def fences(self) -> List[Token]:
+        """Get the fenced code block tokens in document order."""
+        return [token for token in self.tokens if token.kind == TOKEN_FENCE]
+
+
+def _heading_level(line: str) -> int:
+    """Get the level of an ATX heading line ("## Title"), 0 if not a heading."""
+    level = len(line) - len(line.lstrip("#"))
+    if 1 <= level <= 6 and len(line) > level and line[level] in " \t":
+        return level
+    return 0
+
+
+def tokenize(content: str) -> TokenizedDocument:
+    """
+    Split a markdown document into block tokens in one pass over its lines.
+
+    Recognizes ATX headings (at the start of a line), ``` fenced code
+    blocks, blockquotes and paragraphs. Lines inside a fence are never
+    reported as headings or quotes.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        TokenizedDocument with the tokens and line count
+    """
+    doc = TokenizedDocument(content=content)
+    tokens = doc.tokens
+
+    block: Optional[Token] = None  # Open paragraph or blockquote
+    block_lines: List[str] = []
+    fence: Optional[Token] = None  # Open fenced code block
+    fence_body_start = 0
+
+    def close_block():
+        nonlocal block
+        if block is not None:
+            block.text = "\n".join(block_lines)
+            tokens.append(block)
+            block = None
+            block_lines.clear()
+
+    pos = 0
+    length = len(content)
+    line_count = 0
+
+    while pos <= length:
+        newline = content.find("\n", pos)
+        line_end = length if newline == -1 else newline
+        line = content[pos:line_end]
+        line_count += 1
+
+        stripped = line.strip()
+
+        if fence is not None:
+            if stripped.startswith(FENCE_MARKER) and not stripped.strip("`"):
+                fence.end = line_end
+                fence.text = content[fence_body_start:pos]
+                tokens.append(fence)
+                fence = None
+
+        elif stripped.startswith(FENCE_MARKER):
+            close_block()
+            fence = Token(
+                kind=TOKEN_FENCE,
+                start=pos,
+                end=line_end,
+                language=stripped[len(FENCE_MARKER):].strip(),
+            )
+            fence_body_start = min(line_end + 1, length)
+
+        elif not stripped:
+            close_block()
+
+        elif line.startswith("#") and _heading_level(line):
+            close_block()
+            level = _heading_level(line)
+            tokens.append(
+                Token(
+                    kind=TOKEN_HEADING,
+                    start=pos,
+                    end=line_end,
+                    text=line[level:].strip(),
+                    level=level,
+                )
+            )
+
+        else:
+            kind = TOKEN_BLOCKQUOTE if stripped.startswith(">") else TOKEN_PARAGRAPH
+            if block is not None and block.kind != kind:
+                close_block()
+            if block is None:
+                block = Token(kind=kind, start=pos, end=line_end)
+            block.end = line_end
+            block_lines.append(stripped)
+
+        if newline == -1:
+            break
+        pos = newline + 1
+
+    close_block()
+
+    if fence is not None:
+        # Unclosed fence: runs to the end of the document
+        fence.end = length
+        fence.text = content[fence_body_start:]
+        fence.closed = False
+        tokens.append(fence)
+
+    doc.line_count = line_count
+    logger.debug(f"Tokenized {line_count} lines into {len(tokens)} blocks")
+    return doc
@@ -1,11 +1,69 @@
 """Smart message splitting for Discord's 2000 character limit."""
 
-import re
-from typing import List
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+from processors.markdown_tokenizer import TokenizedDocument, tokenize
 from utils.logger import get_logger
 
 logger = get_logger("message_splitter")
 
+# How far back from the chunk limit a split point is searched
+LOOK_BACK = 500
+
+CLOSING_FENCE = "\n```"
+
+
+@dataclass
+class ChunkSpan:
+    """A chunk of the original content, described by offsets."""
+
+    start: int  # Offset of the chunk's first character
+    end: int  # Offset just past the chunk's last character
+    reopen: str = ""  # Fence prepended to reopen a split code block
+    close: bool = False  # Whether a closing fence is appended
+
+    def text(self, content: str) -> str:
+        """Materialize the chunk."""
+        if self.start == self.end and self.reopen:
+            body = self.reopen.rstrip()
+        else:
+            body = self.reopen + content[self.start:self.end]
+        return body + CLOSING_FENCE if self.close else body
+
+
+class _FenceIndex:
+    """Code block ranges of a document, computed once per split."""
+
+    def __init__(self, content: str, tokens: TokenizedDocument):
+        self.fences = tokens.fences()
+        self.starts = [fence.start for fence in self.fences]
+
+        # Code block bodies: from the end of the opening line to the end of
+        # the closing marker (end of content if never closed)
+        self.ranges = []
+        for fence in self.fences:
+            opening_end = content.find("\n", fence.start, fence.end)
+            end = fence.end if fence.closed else fence.end + 1
+            self.ranges.append((opening_end, end))
+
+    def fence_at(self, offset: int) -> int:
+        """
+        Find the code block containing an offset.
+
+        Returns:
+            Index of the fence if the offset is past its opening line and
+            before the end of its closing marker, -1 otherwise
+        """
+        index = bisect_right(self.starts, offset) - 1
+        if index < 0:
+            return -1
+
+        opening_end, end = self.ranges[index]
+        if opening_end != -1 and opening_end < offset < end:
+            return index
+        return -1
+
 
 class MessageSplitter:
     """Splits long messages intelligently while preserving formatting."""
@@ -18,9 +76,10 @@ class MessageSplitter:
             max_length: Maximum length per chunk (default 1900 to leave room for embed overhead)
         """
         self.max_length = max_length
-        self.code_block_pattern = re.compile(r"```(\w*)\n", re.MULTILINE)
 
-    def split(self, content: str) -> List[str]:
+    def split(
+        self, content: str, tokens: Optional[TokenizedDocument] = None
+    ) -> List[str]:
         """
         Split content into chunks that fit within Discord's limits.
 
@@ -34,6 +93,8 @@ class MessageSplitter:
 
         Args:
             content: Content to split
+            tokens: Already tokenized content, used to locate code blocks
+                (tokenized here if omitted)
 
         Returns:
             List of content chunks
@@ -41,132 +102,186 @@ class MessageSplitter:
         if len(content) <= self.max_length:
             return [content]
 
-        chunks = []
-        remaining = content
-
-        while remaining:
-            if len(remaining) <= self.max_length:
-                # Last chunk
-                chunks.append(remaining)
-                break
-
-            # Find the best split point
-            chunk, remaining = self._find_split_point(remaining)
-            chunks.append(chunk)
+        chunks = [span.text(content) for span in self.iter_spans(content, tokens)]
 
         logger.debug(f"Split content into {len(chunks)} chunks")
         return chunks
 
-    def _find_split_point(self, content: str) -> tuple[str, str]:
+    def iter_spans(
+        self, content: str, tokens: Optional[TokenizedDocument] = None
+    ) -> Iterator[ChunkSpan]:
         """
-        Find the best point to split the content.
+        Yield the chunks of the content as offsets, without copying it.
+
+        Code block ranges are indexed once, then a cursor walks the content.
+        Each chunk costs one binary search and bounded look-back searches
+        (at most LOOK_BACK characters each), so splitting is linear in the
+        document size.
+
+        Args:
+            content: Content to split
+            tokens: Already tokenized content (tokenized here if omitted)
+
+        Yields:
+            ChunkSpan objects in order
+        """
+        if len(content) <= self.max_length:
+            yield ChunkSpan(0, len(content))
+            return
+
+        if tokens is None:
+            tokens = tokenize(content)
+        fences = _FenceIndex(content, tokens)
+
+        pos = 0  # Start of the remaining content
+        reopen = ""  # Fence reopened at the start of the remaining content
+        length = len(content)
+
+        while pos < length:
+            if len(reopen) + length - pos <= self.max_length:
+                # Last chunk
+                yield ChunkSpan(pos, length, reopen)
+                return
+
+            span, pos, reopen = self._next_span(content, fences, pos, reopen)
+            yield span
+
+    def _next_span(
+        self, content: str, fences: _FenceIndex, pos: int, reopen: str
+    ) -> tuple[ChunkSpan, int, str]:
+        """
+        Find the best point to end the chunk starting at `pos`.
 
         Returns:
-            Tuple of (chunk, remaining_content)
+            Tuple of (chunk span, start of the next chunk, its reopened fence)
         """
-        max_pos = self.max_length
+        # Absolute offsets of the chunk limit and of the look-back window
+        limit = pos + self.max_length - len(reopen)
+        search_start = max(pos, limit - LOOK_BACK)
 
         # Check if we're inside a code block
-        code_block_info = self._get_code_block_state(content[:max_pos])
+        fence_index = fences.fence_at(limit)
 
-        if code_block_info["inside"]:
-            # We're inside a code block, need to close it
-            chunk, remaining = self._split_inside_code_block(
-                content, max_pos, code_block_info
-            )
-            return chunk, remaining
+        if fence_index != -1:
+            # Close the code block at a newline and reopen it in the next chunk
+            language = fences.fences[fence_index].language
+            cut = content.rfind("\n", search_start, limit)
+            if cut == -1:
+                cut = limit
 
-        # Try to find good split points in order of priority
-        search_start = max(0, max_pos - 500)  # Look back up to 500 chars
+            logger.debug(f"Split inside code block (language: {language or 'none'})")
+            span = ChunkSpan(pos, self._trim_end(content, pos, cut), reopen, close=True)
+            return span, self._skip_space(content, cut), f"```{language}\n"
 
         # 1. Try double newline (paragraph break)
-        pos = content.rfind("\n\n", search_start, max_pos)
-        if pos != -1:
-            return content[: pos + 2].rstrip(), content[pos + 2 :].lstrip()
+        cut = content.rfind("\n\n", search_start, limit)
+        if cut != -1:
+            return self._cut(content, pos, reopen, cut + 2, cut + 2)
 
         # 2. Try single newline
-        pos = content.rfind("\n", search_start, max_pos)
-        if pos != -1:
-            return content[: pos + 1].rstrip(), content[pos + 1 :].lstrip()
+        cut = content.rfind("\n", search_start, limit)
+        if cut != -1:
+            return self._cut(content, pos, reopen, cut + 1, cut + 1)
 
         # 3. Try sentence end
         for punct in (".", "!", "?"):
-            pos = content.rfind(f"{punct} ", search_start, max_pos)
-            if pos != -1:
-                return (
-                    content[: pos + 2].rstrip(),
-                    content[pos + 2 :].lstrip(),
-                )
+            cut = content.rfind(f"{punct} ", search_start, limit)
+            if cut != -1:
+                return self._cut(content, pos, reopen, cut + 2, cut + 2)
 
         # 4. Try word boundary
-        pos = content.rfind(" ", search_start, max_pos)
-        if pos != -1:
-            return content[:pos].rstrip(), content[pos + 1 :].lstrip()
+        cut = content.rfind(" ", search_start, limit)
+        if cut != -1:
+            return self._cut(content, pos, reopen, cut, cut + 1)
 
         # 5. Hard cut (last resort)
-        logger.warning(f"Had to perform hard cut at position {max_pos}")
-        return content[:max_pos], content[max_pos:]
-
-    def _get_code_block_state(self, content: str) -> dict:
-        """
-        Determine if we're currently inside a code block.
-
-        Returns:
-            Dict with 'inside' (bool) and 'language' (str) keys
+        logger.warning(f"Had to perform hard cut at position {limit}")
+        return ChunkSpan(pos, limit, reopen), limit, ""
+
+    def _cut(
+        self, content: str, pos: int, reopen: str, chunk_end: int, next_start: int
+    ) -> tuple[ChunkSpan, int, str]:
+        """Cut a chunk outside code blocks, trimming whitespace around the cut."""
+        span = ChunkSpan(pos, self._trim_end(content, pos, chunk_end), reopen)
+        return span, self._skip_space(content, next_start), ""
+
+    @staticmethod
+    def _trim_end(content: str, start: int, end: int) -> int:
+        """Move `end` back over trailing whitespace (not before `start`)."""
+        while end > start and content[end - 1].isspace():
+            end -= 1
+        return end
+
+    @staticmethod
+    def _skip_space(content: str, pos: int) -> int:
+        """Move `pos` forward over leading whitespace."""
+        while pos < len(content) and content[pos].isspace():
+            pos += 1
+        return pos
+
+    def count_chunks(
+        self, content: str, tokens: Optional[TokenizedDocument] = None
+    ) -> int:
         """
-        # Count code fence markers (```)
-        fence_markers = content.count("```")
+        Count the chunks of the content without building them.
 
-        # Odd number means we're inside a code block
-        inside = fence_markers % 2 == 1
-
-        language = ""
-        if inside:
-            # Find the last opening fence to get the language
-            last_fence = content.rfind("```")
-            if last_fence != -1:
-                # Extract language from the line with the fence
-                line_end = content.find("\n", last_fence)
-                if line_end != -1:
-                    fence_line = content[last_fence:line_end]
-                    language = fence_line[3:].strip()  # Remove ```
-
-        return {"inside": inside, "language": language}
+        Args:
+            content: Content to split
+            tokens: Already tokenized content (tokenized here if omitted)
 
-    def _split_inside_code_block(
-        self, content: str, max_pos: int, code_block_info: dict
-    ) -> tuple[str, str]:
+        Returns:
+            Number of chunks split() would return
         """
-        Split content when we're inside a code block.
-
-        This will:
-        1. Close the code block at the split point
-        2. Reopen it in the next chunk
+        return sum(1 for _ in self.iter_spans(content, tokens))
+
+    def iter_chunks(
+        self,
+        content: str,
+        file_name: str,
+        tokens: Optional[TokenizedDocument] = None,
+        total: Optional[int] = None,
+        spans: Optional[List[ChunkSpan]] = None,
+    ) -> Iterator[dict]:
         """
-        language = code_block_info["language"]
+        Lazily split content into chunks with metadata.
 
-        # Try to split at a newline within the code block
-        search_start = max(0, max_pos - 500)
-        pos = content.rfind("\n", search_start, max_pos)
+        The total is resolved up front by a cheap counting pass over the
+        chunk offsets, then each chunk is built only when consumed.
 
-        if pos == -1:
-            # No newline found, split at max_pos
-            pos = max_pos
+        Args:
+            content: Content to split
+            file_name: Name of the file
+            tokens: Already tokenized content (tokenized here if omitted)
+            total: Chunk count if already known (see count_chunks())
+            spans: Chunk offsets if already computed (e.g., in a worker process)
 
-        # Create chunk with closing fence
-        chunk = content[:pos].rstrip() + "\n```"
+        Yields:
+            Dicts with 'content', 'part', 'total', 'file_name' keys
+        """
+        if spans is not None:
+            total = len(spans)
+        else:
+            if tokens is None and len(content) > self.max_length:
+                tokens = tokenize(content)
 
-        # Create remaining with opening fence
-        remaining = f"```{language}\n" + content[pos:].lstrip()
+            if total is None:
+                total = self.count_chunks(content, tokens)
 
-        logger.debug(
-            f"Split inside code block (language: {language or 'none'})"
-        )
+            spans = self.iter_spans(content, tokens)
 
-        return chunk, remaining
+        for i, span in enumerate(spans, 1):
+            yield {
+                "content": span.text(content),
+                "part": i,
+                "total": total,
+                "file_name": file_name,
+            }
 
     def split_with_metadata(
-        self, content: str, file_name: str
+        self,
+        content: str,
+        file_name: str,
+        tokens: Optional[TokenizedDocument] = None,
     ) -> List[dict]:
         """
         Split content and return chunks with metadata.
@@ -174,21 +289,9 @@ class MessageSplitter:
         Args:
             content: Content to split
             file_name: Name of the file
+            tokens: Already tokenized content (tokenized here if omitted)
 
         Returns:
             List of dicts with 'content', 'part', 'total' keys
         """
-        chunks = self.split(content)
-
-        result = []
-        for i, chunk in enumerate(chunks, 1):
-            result.append(
-                {
-                    "content": chunk,
-                    "part": i,
-                    "total": len(chunks),
-                    "file_name": file_name,
-                }
-            )
-
-        return result
+        return list(self.iter_chunks(content, file_name, tokens))
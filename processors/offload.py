@@ -0,0 +1,177 @@
+"""Process pool offload of CPU-bound processing for large documents."""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+from processors.markdown_parser import MarkdownParser, ParsedDocument
+from processors.message_splitter import ChunkSpan, MessageSplitter
+from processors.summary_builder import DocumentSummary, SummaryBuilder
+from utils.logger import get_logger
+from utils.metrics import PROCESSING_SECONDS, timed
+
+logger = get_logger("offload")
+
+
+# Worker entry points: module-level so they can be pickled by reference,
+# and returning plain dataclasses so results pickle back cheaply
+
+
+def _parse_and_split(
+    file_path: str, content: str, max_length: int
+) -> Tuple[ParsedDocument, List[ChunkSpan]]:
+    """Parse a document and compute its chunk offsets (worker side)."""
+    parsed = MarkdownParser().parse_file(file_path, content)
+    spans = list(MessageSplitter(max_length).iter_spans(content, parsed.tokens))
+    return parsed, spans
+
+
+def _split(content: str, max_length: int) -> List[ChunkSpan]:
+    """Compute the chunk offsets of a document (worker side)."""
+    return list(MessageSplitter(max_length).iter_spans(content))
+
+
+def _summarize(
+    github_repo_url: str, file_path: Path, content: str, docs_root: Path
+) -> DocumentSummary:
+    """Build the summary of a document (worker side)."""
+    return SummaryBuilder(github_repo_url).build_summary(file_path, content, docs_root)
+
+
+class ProcessingPool:
+    """
+    Runs parsing, splitting and summarizing of large documents in worker
+    processes, so they do not block the event loop (gateway heartbeats,
+    slash commands).
+
+    Documents below the size threshold are processed inline: for them the
+    pickling round trip costs more than the work itself. Cached results
+    are looked up on the loop before anything is sent to a worker, and
+    results computed by a worker are cached on return.
+    """
+
+    def __init__(self, workers: int = 2, threshold: int = 128 * 1024):
+        """
+        Initialize the pool (worker processes are started on first use).
+
+        Args:
+            workers: Number of worker processes (0 to always process inline)
+            threshold: Content length (characters) from which work is offloaded
+        """
+        self.workers = workers
+        self.threshold = threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Statistics
+        self.offloaded = 0
+        self.inline = 0
+
+    def should_offload(self, content: str) -> bool:
+        """Check whether a document is large enough to be offloaded."""
+        return self.workers > 0 and len(content) >= self.threshold
+
+    @timed(PROCESSING_SECONDS, "parse")
+    async def parse_and_split(
+        self,
+        parser: MarkdownParser,
+        splitter: MessageSplitter,
+        file_path: str,
+        content: str,
+    ) -> Tuple[ParsedDocument, Optional[List[ChunkSpan]]]:
+        """
+        Parse a document and, if it is offloaded, split it.
+
+        Args:
+            parser: MarkdownParser (and its cache) used on the loop
+            splitter: MessageSplitter whose settings are used
+            file_path: Path to the file
+            content: File content
+
+        Returns:
+            Tuple of (parsed document, chunk spans). Spans are None when the
+            document was parsed inline: the caller splits it lazily.
+        """
+        if not self.should_offload(content):
+            self.inline += 1
+            return parser.parse_file(file_path, content), None
+
+        parsed = parser.get_cached(file_path, content)
+        if parsed is not None:
+            spans = await self._run(_split, content, splitter.max_length)
+            return parsed, spans
+
+        parsed, spans = await self._run(
+            _parse_and_split, file_path, content, splitter.max_length
+        )
+        parser.remember(file_path, parsed)
+        return parsed, spans
+
+    @timed(PROCESSING_SECONDS, "summarize")
+    async def summarize(
+        self,
+        builder: SummaryBuilder,
+        file_path: Path,
+        content: str,
+        docs_root: Path,
+    ) -> DocumentSummary:
+        """
+        Build the summary of a document.
+
+        Args:
+            builder: SummaryBuilder (and its cache) used on the loop
+            file_path: Path to the markdown file
+            content: File content
+            docs_root: Root documentation directory
+
+        Returns:
+            DocumentSummary object
+        """
+        if not self.should_offload(content):
+            self.inline += 1
+            return builder.build_summary(file_path, content, docs_root)
+
+        summary = builder.get_cached(file_path, content, docs_root)
+        if summary is not None:
+            return summary
+
+        summary = await self._run(
+            _summarize, builder.github_repo_url, file_path, content, docs_root
+        )
+        builder.remember(file_path, content, docs_root, summary)
+        return summary
+
+    async def _run(self, func, *args):
+        """Run a worker entry point in the pool."""
+        if self._executor is None:
+            # Spawned workers: forking a process that runs threads (watchdog,
+            # SQLite, aiohttp) is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started processing pool with {self.workers} worker(s)")
+
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        """
+        Get offload statistics.
+
+        Returns:
+            Dict with offloaded and inline job counts and the pool settings
+        """
+        return {
+            "workers": self.workers,
+            "threshold": self.threshold,
+            "offloaded": self.offloaded,
+            "inline": self.inline,
+        }
@@ -1,13 +1,15 @@
 """Build compact summaries for documentation files."""
 
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 import discord
 from processors.markdown_parser import MarkdownParser
+from processors.markdown_tokenizer import TOKEN_HEADING, TOKEN_PARAGRAPH, TokenizedDocument
 from utils.logger import get_logger
+from utils.message_index import content_hash
+from utils.parse_cache import KIND_SUMMARY, ParseCache
 
 logger = get_logger("summary_builder")
 
@@ -30,14 +32,16 @@ class DocumentSummary:
 class SummaryBuilder:
     """Generates compact summaries for documentation files."""
 
-    def __init__(self, github_repo_url: str = ""):
+    def __init__(self, github_repo_url: str = "", cache: Optional[ParseCache] = None):
         """
         Initialize the summary builder.
 
         Args:
             github_repo_url: Base GitHub URL (e.g., "https://github.com/user/repo/blob/main/docs")
+            cache: Cache of parsed documents and summaries (None to disable)
         """
-        self.parser = MarkdownParser()
+        self.cache = cache
+        self.parser = MarkdownParser(cache=cache)
         self.github_repo_url = github_repo_url.rstrip("/")
 
     def build_summary(
@@ -54,38 +58,44 @@ class SummaryBuilder:
         Returns:
             DocumentSummary object
         """
-        # Parse the document
-        parsed = self.parser.parse_file(str(file_path), content)
+        cached = self.get_cached(file_path, content, docs_root)
+        if cached is not None:
+            return cached
+
+        relative_path = file_path.relative_to(docs_root)
+
+        # Get last modified time
+        last_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
+
+        # Parse the document (tokenized once, reused below); the summary miss
+        # above already counted as this file's cache lookup
+        parsed = self.parser.parse_file(str(file_path), content, count_lookup=False)
+        tokens = parsed.tokens
 
         # Extract title
         title = parsed.title
 
         # Extract description (first paragraph after title)
-        description = self._extract_description(content)
+        description = self._extract_description(tokens)
 
         # Extract section titles (h2 headers only)
-        sections = self.parser.extract_sections(content)
-        section_titles = [section[0] for section in sections]
+        section_titles = [h.text for h in tokens.headings(level=2) if h.text]
 
         # Calculate stats
-        file_size = self._format_file_size(len(content.encode("utf-8")))
-        line_count = len(content.split("\n"))
+        file_size = self._format_file_size(tokens.byte_size)
+        line_count = tokens.line_count
         code_block_count = len(parsed.code_blocks)
 
         # Build GitHub URL
-        relative_path = file_path.relative_to(docs_root)
         github_url = self._build_github_url(relative_path)
 
-        # Get last modified time
-        last_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
-
         logger.debug(
             f"Built summary for {file_path.name}: "
             f"{len(section_titles)} sections, "
             f"{code_block_count} code blocks"
         )
 
-        return DocumentSummary(
+        summary = DocumentSummary(
             title=title,
             description=description,
             sections=section_titles,
@@ -97,44 +107,91 @@ class SummaryBuilder:
             file_name=file_path.name,
         )
 
-    def _extract_description(self, content: str) -> str:
+        self.remember(file_path, content, docs_root, summary)
+        return summary
+
+    def get_cached(
+        self, file_path: Path, content: str, docs_root: Path
+    ) -> Optional[DocumentSummary]:
+        """
+        Look up the summary of already seen content at the same path.
+
+        Args:
+            file_path: Path to the markdown file
+            content: File content
+            docs_root: Root documentation directory
+
+        Returns:
+            Cached DocumentSummary with a fresh modification time, or None
+        """
+        if self.cache is None:
+            return None
+
+        cached = self.cache.get(KIND_SUMMARY, self._cache_key(file_path, content, docs_root))
+        if cached is None:
+            return None
+
+        # Same content at the same path: only the modification time can differ
+        last_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
+        return replace(cached, last_modified=last_modified)
+
+    def remember(
+        self, file_path: Path, content: str, docs_root: Path, summary: DocumentSummary
+    ):
+        """
+        Cache a summary built elsewhere (e.g., in a worker process).
+
+        Args:
+            file_path: Path to the markdown file
+            content: File content
+            docs_root: Root documentation directory
+            summary: DocumentSummary of the file
+        """
+        if self.cache is None:
+            return
+
+        key = self._cache_key(file_path, content, docs_root)
+        size = len(summary.description) + sum(len(s) for s in summary.sections) + 512
+        self.cache.put(KIND_SUMMARY, key, summary, size)
+
+    def _cache_key(self, file_path: Path, content: str, docs_root: Path) -> str:
+        """Build the cache key (the GitHub URL depends on the path and base URL)."""
+        relative_path = file_path.relative_to(docs_root)
+        return ParseCache.make_key(
+            content_hash(content), relative_path.as_posix(), self.github_repo_url
+        )
+
+    def _extract_description(self, tokens: TokenizedDocument) -> str:
         """
         Extract the first paragraph after the title as description.
 
         Args:
-            content: Markdown content
+            tokens: Tokenized markdown content
 
         Returns:
             Description text (max 200 chars)
         """
-        lines = content.split("\n")
         description_lines = []
         found_title = False
-        in_description = False
-
-        for line in lines:
-            stripped = line.strip()
 
+        for token in tokens.tokens:
             # Skip until we find the title
             if not found_title:
-                if stripped.startswith("# "):
-                    found_title = True
-                continue
-
-            # Skip empty lines and blockquotes after title
-            if not stripped or stripped.startswith(">"):
+                found_title = token.kind == TOKEN_HEADING and token.level == 1
                 continue
 
-            # Skip h2 headers
-            if stripped.startswith("## "):
+            # Stop at the first h2 header
+            if token.kind == TOKEN_HEADING and token.level == 2:
                 break
 
-            # Found content
-            in_description = True
-            description_lines.append(stripped)
+            # Blockquotes (metadata), code blocks and sub-headings are skipped
+            if token.kind != TOKEN_PARAGRAPH:
+                continue
+
+            description_lines.extend(token.text.split("\n"))
 
-            # Stop at first paragraph break or after ~200 chars
-            if not stripped or len(" ".join(description_lines)) > 200:
+            # Stop after ~200 chars
+            if len(" ".join(description_lines)) > 200:
                 break
 
         description = " ".join(description_lines).strip()
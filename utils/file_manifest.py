@@ -0,0 +1,145 @@
+"""Persistent manifest of the last seen stat and hash of each doc file."""
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from utils.logger import get_logger
+from utils.message_index import MessageIndex
+
+logger = get_logger("file_manifest")
+
+
+@dataclass
+class ManifestEntry:
+    """Stat and content hash of a file when it was last published."""
+
+    path: str  # Path relative to docs root, POSIX separators
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+    def matches(self, mtime_ns: int, size: int) -> bool:
+        """Check whether a file's current stat is the one recorded."""
+        return self.mtime_ns == mtime_ns and self.size == size
+
+
+class FileManifest:
+    """
+    SQLite-backed store of doc path → (mtime, size, content hash).
+
+    Lives in the state database next to the message index. A file whose
+    mtime and size still match its entry has not changed since it was
+    published, so it does not need to be read or hashed again.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the manifest.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the files table if it does not exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+                """
+            )
+
+    def get(self, relative_path) -> Optional[ManifestEntry]:
+        """
+        Look up the recorded stat of a file.
+
+        Args:
+            relative_path: Path relative to docs root
+
+        Returns:
+            ManifestEntry, or None if the file is not recorded
+        """
+        row = self._conn.execute(
+            "SELECT path, mtime_ns, size, content_hash FROM files WHERE path = ?",
+            (MessageIndex.normalize_path(relative_path),),
+        ).fetchone()
+
+        return ManifestEntry(*row) if row else None
+
+    def load(self) -> Dict[str, ManifestEntry]:
+        """
+        Load the whole manifest.
+
+        Returns:
+            Dict mapping relative paths to ManifestEntry objects
+        """
+        rows = self._conn.execute(
+            "SELECT path, mtime_ns, size, content_hash FROM files"
+        ).fetchall()
+        return {row[0]: ManifestEntry(*row) for row in rows}
+
+    def set(self, relative_path, mtime_ns: int, size: int, content_hash: str):
+        """
+        Record the stat and hash of a published file.
+
+        Args:
+            relative_path: Path relative to docs root
+            mtime_ns: Modification time in nanoseconds (os.stat st_mtime_ns)
+            size: Size in bytes
+            content_hash: Hash of the published content
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                (MessageIndex.normalize_path(relative_path), mtime_ns, size, content_hash),
+            )
+
+    def set_many(self, entries: Iterable[ManifestEntry]):
+        """
+        Record the stat and hash of several files in one transaction.
+
+        Args:
+            entries: ManifestEntry objects to store
+        """
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        MessageIndex.normalize_path(entry.path),
+                        entry.mtime_ns,
+                        entry.size,
+                        entry.content_hash,
+                    )
+                    for entry in entries
+                ],
+            )
+
+    def remove(self, relative_path):
+        """
+        Forget a file (deleted or moved away).
+
+        Args:
+            relative_path: Path relative to docs root
+        """
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM files WHERE path = ?",
+                (MessageIndex.normalize_path(relative_path),),
+            )
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -0,0 +1,241 @@
+"""Event loop lag monitoring and stall profiling."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+from utils.logger import get_logger
+
+logger = get_logger("loop_lag")
+
+# Frames from these files are reported as the blocking code
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class StallReport:
+    """A period during which the event loop was blocked."""
+
+    started_at: float  # time.time() when the stall was detected
+    lag: float  # How late the loop woke up, in seconds
+    task: str = ""  # Task running when the stall was detected
+    location: str = ""  # Innermost project frame ("file.py:12 in func")
+    stack: str = ""  # Stack of the loop thread during the stall
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "started_at": self.started_at,
+            "lag": self.lag,
+            "task": self.task,
+            "location": self.location,
+            "stack": self.stack,
+        }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Get a percentile of already sorted values (nearest rank).
+
+    Args:
+        sorted_values: Values in ascending order
+        q: Percentile between 0 and 100
+
+    Returns:
+        The percentile, 0.0 if there are no values
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag and finds the code that blocks the loop.
+
+    A task sleeps for a fixed interval and records how much later than
+    expected it was resumed: anything blocking the loop (parsing, file
+    I/O, logging) shows up as lag, and so does the delay of gateway
+    heartbeats.
+
+    Lag is only known once the loop is free again, when the culprit is
+    gone. So a watchdog thread also checks that the loop keeps waking up:
+    when it is more than `threshold` late, the thread captures the loop
+    thread's stack and the running task while they are still blocking.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        threshold: float = 0.25,
+        window: int = 600,
+        max_reports: int = 20,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between two measurements
+            threshold: Lag (seconds) from which a stall is reported
+            window: Number of recent measurements used for percentiles
+            max_reports: Number of recent stall reports kept
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.samples: deque = deque(maxlen=window)
+        self.stalls: deque = deque(maxlen=max_reports)
+        self.max_lag = 0.0
+        self.stall_count = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id = 0
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Shared with the watchdog thread (plain attribute swaps)
+        self._deadline = 0.0  # perf_counter() at which the loop should wake up
+        self._captured_deadline = 0.0  # Deadline of the last captured stall
+        self._pending: Optional[StallReport] = None
+
+    def start(self):
+        """Start measuring in the running event loop."""
+        if self._task is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._deadline = time.perf_counter() + self.interval
+        self._task = asyncio.create_task(self._run())
+
+        self._stop_event.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        """Stop measuring."""
+        self._stop_event.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _run(self):
+        """Sleep and record the wake-up delay until cancelled."""
+        while True:
+            self._deadline = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._deadline)
+
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            report, self._pending = self._pending, None
+            if lag >= self.threshold:
+                self._report_stall(report or StallReport(time.time(), lag), lag)
+
+    def _report_stall(self, report: StallReport, lag: float):
+        """Record and log a stall once the loop is free again."""
+        report.lag = lag
+        self.stalls.append(report)
+        self.stall_count += 1
+
+        if report.stack:
+            logger.warning(
+                f"Event loop blocked for {lag * 1000:.0f} ms in "
+                f"{report.location or 'unknown code'} (task: {report.task or 'none'})\n"
+                f"{report.stack}"
+            )
+        else:
+            # Shorter than the watchdog's resolution: no stack captured
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms")
+
+    def _watch(self):
+        """Capture the loop thread's stack while it is blocked (watchdog thread)."""
+        while not self._stop_event.wait(self.threshold / 2):
+            deadline = self._deadline
+            if deadline == self._captured_deadline:
+                continue  # Already captured this stall
+
+            if time.perf_counter() - deadline >= self.threshold:
+                self._captured_deadline = deadline
+                self._pending = self._capture()
+
+    def _capture(self) -> StallReport:
+        """Snapshot what the loop thread is running."""
+        report = StallReport(started_at=time.time(), lag=0.0)
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is not None:
+            stack = traceback.extract_stack(frame)
+            report.stack = "".join(traceback.format_list(stack))
+
+            for entry in reversed(stack):
+                if entry.filename.startswith(_PROJECT_ROOT):
+                    relative = os.path.relpath(entry.filename, _PROJECT_ROOT)
+                    report.location = f"{relative}:{entry.lineno} in {entry.name}"
+                    break
+
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+
+        if task is not None:
+            coro = task.get_coro()
+            name = getattr(coro, "__qualname__", repr(coro))
+            report.task = f"{task.get_name()} ({name})"
+
+        return report
+
+    def get_stats(self) -> dict:
+        """
+        Get lag statistics in seconds.
+
+        Returns:
+            Dict with the last lag, the average and percentiles of the
+            recent window, the max lag since startup and the stall count
+        """
+        samples = list(self.samples)
+        ordered = sorted(samples)
+        last_stall = self.stalls[-1] if self.stalls else None
+        return {
+            "last": samples[-1] if samples else 0.0,
+            "avg": sum(samples) / len(samples) if samples else 0.0,
+            "p50": percentile(ordered, 50),
+            "p95": percentile(ordered, 95),
+            "p99": percentile(ordered, 99),
+            "window_max": ordered[-1] if ordered else 0.0,
+            "max": self.max_lag,
+            "threshold": self.threshold,
+            "stalls": self.stall_count,
+            "last_stall": (last_stall.location or last_stall.task) if last_stall else None,
+        }
+
+    def recent_stalls(self, limit: int = 5) -> List[dict]:
+        """
+        Get the most recent stall reports, newest first.
+
+        Args:
+            limit: Maximum number of reports
+
+        Returns:
+            List of StallReport dicts
+        """
+        return [report.to_dict() for report in reversed(self.stalls)][:limit]
@@ -0,0 +1,337 @@
+"""Persistent index mapping documentation files to their Discord messages."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from utils.logger import get_logger
+
+logger = get_logger("message_index")
+
+
+def content_hash(content: str) -> str:
+    """
+    Compute the hash recorded for a file's content.
+
+    Args:
+        content: File content
+
+    Returns:
+        Hex SHA-256 digest of the UTF-8 encoded content
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def render_hash(content: str, *settings) -> str:
+    """
+    Compute the hash recorded for content rendered with the given settings.
+
+    A change to any setting the rendering depends on yields a new hash, so
+    the published output is treated as stale like a changed file.
+
+    Args:
+        content: File content
+        *settings: Renderer version and configuration values
+
+    Returns:
+        Hex SHA-256 digest of the settings and the content
+    """
+    payload = json.dumps([str(setting) for setting in settings]) + "\n" + content
+    return content_hash(payload)
+
+
+def embed_hash(embed) -> str:
+    """
+    Compute a stable hash of a rendered embed.
+
+    Args:
+        embed: discord.Embed (or any object with a to_dict() method)
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON form of the embed
+    """
+    payload = json.dumps(embed.to_dict(), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IndexEntry:
+    """Represents the Discord message(s) published for a documentation file."""
+
+    path: str  # Path relative to docs root, POSIX separators
+    kind: str  # "summary" (one message per file) or "document" (full content)
+    channel_id: int
+    message_ids: List[int]
+    content_hash: str
+    updated_at: float
+    embed_hash: str = ""  # Hash of the last published embed (summary entries)
+
+
+class MessageIndex:
+    """SQLite-backed store of doc path → channel ID, message IDs and content hash."""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the message index.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+        logger.info(f"Message index opened: {self.db_path} ({self.count()} entries)")
+
+    def _create_schema(self):
+        """Create the messages table if it does not exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    path TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    channel_id INTEGER NOT NULL,
+                    message_ids TEXT NOT NULL,
+                    content_hash TEXT NOT NULL DEFAULT '',
+                    updated_at REAL NOT NULL,
+                    embed_hash TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (path, kind)
+                )
+                """
+            )
+
+            # Databases created before embed hashes were tracked
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(messages)")
+            }
+            if "embed_hash" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE messages ADD COLUMN embed_hash TEXT NOT NULL DEFAULT ''"
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_channel "
+                "ON messages (channel_id)"
+            )
+
+    @staticmethod
+    def normalize_path(relative_path) -> str:
+        """
+        Normalize a path relative to the docs root into an index key.
+
+        Args:
+            relative_path: Path or string (e.g., "02-developers\\backend\\API.md")
+
+        Returns:
+            POSIX-style key (e.g., "02-developers/backend/API.md")
+        """
+        return str(relative_path).replace("\\", "/").lstrip("/")
+
+    def get(self, relative_path, kind: str = "summary") -> Optional[IndexEntry]:
+        """
+        Look up the indexed message(s) for a file.
+
+        Args:
+            relative_path: Path relative to docs root
+            kind: Entry kind ("summary" or "document")
+
+        Returns:
+            IndexEntry if the file has been published, None otherwise
+        """
+        row = self._conn.execute(
+            "SELECT path, kind, channel_id, message_ids, content_hash, updated_at, embed_hash "
+            "FROM messages WHERE path = ? AND kind = ?",
+            (self.normalize_path(relative_path), kind),
+        ).fetchone()
+
+        return self._row_to_entry(row) if row else None
+
+    def set(
+        self,
+        relative_path,
+        channel_id: int,
+        message_ids: List[int],
+        content_hash: str = "",
+        kind: str = "summary",
+        embed_hash: str = "",
+    ):
+        """
+        Record the message(s) published for a file.
+
+        Args:
+            relative_path: Path relative to docs root
+            channel_id: ID of the channel holding the message(s)
+            message_ids: IDs of the published message(s), in order
+            content_hash: Hash of the file content that was published
+            kind: Entry kind ("summary" or "document")
+            embed_hash: Hash of the embed that was published
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO messages "
+                "(path, kind, channel_id, message_ids, content_hash, updated_at, embed_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.normalize_path(relative_path),
+                    kind,
+                    channel_id,
+                    json.dumps([int(m) for m in message_ids]),
+                    content_hash,
+                    time.time(),
+                    embed_hash,
+                ),
+            )
+
+    def is_unchanged(
+        self,
+        relative_path,
+        channel_id: int,
+        content_hash: str,
+        kind: str = "summary",
+    ) -> bool:
+        """
+        Check whether a file's content was already published to a channel.
+
+        A hit means the caller can skip parsing, rendering and the Discord
+        API call entirely, so the hash must cover the rendering settings
+        too (see render_hash).
+
+        Args:
+            relative_path: Path relative to docs root
+            channel_id: ID of the channel the file maps to
+            content_hash: Hash of the current content and rendering settings
+            kind: Entry kind ("summary" or "document")
+
+        Returns:
+            True if the same content is already published in that channel
+        """
+        entry = self.get(relative_path, kind)
+
+        return bool(
+            entry
+            and entry.message_ids
+            and entry.channel_id == channel_id
+            and entry.content_hash == content_hash
+            and (kind != "summary" or entry.embed_hash)
+        )
+
+    def remove(self, relative_path, kind: str = "summary") -> Optional[IndexEntry]:
+        """
+        Remove a file from the index.
+
+        Args:
+            relative_path: Path relative to docs root
+            kind: Entry kind ("summary" or "document")
+
+        Returns:
+            The removed IndexEntry, or None if the file was not indexed
+        """
+        entry = self.get(relative_path, kind)
+
+        if entry:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM messages WHERE path = ? AND kind = ?",
+                    (entry.path, kind),
+                )
+
+        return entry
+
+    def move(self, old_path, new_path, kind: str = "summary") -> Optional[IndexEntry]:
+        """
+        Move an entry to a new path (file renamed), keeping its messages.
+
+        Any entry already indexed at the new path is replaced.
+
+        Args:
+            old_path: Previous path relative to docs root
+            new_path: New path relative to docs root
+            kind: Entry kind ("summary" or "document")
+
+        Returns:
+            The moved IndexEntry (with its new path), or None if the old
+            path was not indexed
+        """
+        entry = self.get(old_path, kind)
+
+        if not entry:
+            return None
+
+        new_key = self.normalize_path(new_path)
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE path = ? AND kind = ?", (new_key, kind)
+            )
+            self._conn.execute(
+                "UPDATE messages SET path = ? WHERE path = ? AND kind = ?",
+                (new_key, entry.path, kind),
+            )
+
+        entry.path = new_key
+        return entry
+
+    def paths(self, kind: str = "summary") -> List[str]:
+        """
+        Get all indexed paths of a kind.
+
+        Args:
+            kind: Entry kind ("summary" or "document")
+
+        Returns:
+            List of paths relative to docs root
+        """
+        rows = self._conn.execute(
+            "SELECT path FROM messages WHERE kind = ?", (kind,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def entries_for_channel(self, channel_id: int) -> List[IndexEntry]:
+        """
+        Get all entries whose messages live in a channel.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            List of IndexEntry objects
+        """
+        rows = self._conn.execute(
+            "SELECT path, kind, channel_id, message_ids, content_hash, updated_at, embed_hash "
+            "FROM messages WHERE channel_id = ?",
+            (channel_id,),
+        ).fetchall()
+
+        return [self._row_to_entry(row) for row in rows]
+
+    def is_message_indexed(self, channel_id: int, message_id: int) -> bool:
+        """Check whether a message is already owned by an indexed file."""
+        return any(
+            message_id in entry.message_ids
+            for entry in self.entries_for_channel(channel_id)
+        )
+
+    def count(self) -> int:
+        """Return the number of indexed entries."""
+        return self._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> IndexEntry:
+        """Convert a database row to an IndexEntry."""
+        path, kind, channel_id, message_ids, content_hash, updated_at, embed_hash = row
+        return IndexEntry(
+            path=path,
+            kind=kind,
+            channel_id=channel_id,
+            message_ids=json.loads(message_ids),
+            content_hash=content_hash,
+            updated_at=updated_at,
+            embed_hash=embed_hash,
+        )
@@ -0,0 +1,272 @@
+"""In-process metrics rendered in the Prometheus text exposition format."""
+
+import functools
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+# Latency buckets in seconds (upper bounds, +Inf is implicit)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a decimal part)."""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class of a metric family with optional labels."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+
+    def _labels(self, values: Tuple[str, ...], extra: str = "") -> str:
+        """Render the label set of a sample."""
+        pairs = [
+            f'{name}="{_escape(str(value))}"'
+            for name, value in zip(self.labelnames, values)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        """Render the family (HELP, TYPE and sample lines)."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """
+        Increase the count.
+
+        Args:
+            *labels: Label values, in the order of labelnames
+            amount: Increment
+        """
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._labels(labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (usually set when scraped)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str):
+        """
+        Set the value.
+
+        Args:
+            value: New value
+            *labels: Label values, in the order of labelnames
+        """
+        self._values[labels] = value
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._labels(labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (e.g., seconds)
+            *labels: Label values, in the order of labelnames
+        """
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+
+        # Non-cumulative counts: cumulated when rendered
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = self._labels(labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Set of metric families rendered together.
+
+    Metrics are updated from the event loop thread only, so recording is a
+    dict update without locking.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family (names must be unique)."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render all metrics in the text exposition format (version 0.0.4).
+
+        Returns:
+            Exposition text, newline terminated
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def timed(histogram: Histogram, *labels: str) -> Callable:
+    """
+    Decorate a coroutine function to observe its duration in a histogram.
+
+    Failed calls are observed too.
+
+    Args:
+        histogram: Histogram receiving durations in seconds
+        *labels: Label values of the observations
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, *labels)
+        return wrapper
+    return decorator
+
+
+# Metrics of the bot
+
+REGISTRY = MetricsRegistry()
+
+WEBHOOK_DELIVERIES = REGISTRY.counter(
+    "docsbot_webhook_deliveries_total",
+    "GitHub webhook deliveries received, by event type and outcome.",
+    ("event", "status"),
+)
+WEBHOOK_QUEUE_DEPTH = REGISTRY.gauge(
+    "docsbot_webhook_queue_depth",
+    "Push jobs waiting in the webhook job queue.",
+)
+WEBHOOK_PENDING_FILES = REGISTRY.gauge(
+    "docsbot_webhook_pending_files",
+    "Files waiting in the push coalescer.",
+)
+GIT_PULL_SECONDS = REGISTRY.histogram(
+    "docsbot_git_pull_seconds",
+    "Duration of git pulls in webhook mode.",
+)
+PROCESSING_SECONDS = REGISTRY.histogram(
+    "docsbot_file_processing_seconds",
+    "Per-file processing latency, by stage (parse, summarize, publish).",
+    ("stage",),
+)
+DISCORD_REQUESTS = REGISTRY.counter(
+    "docsbot_discord_requests_total",
+    "Discord API responses, by route and HTTP status.",
+    ("route", "status"),
+)
+DISCORD_RATE_LIMITS = REGISTRY.counter(
+    "docsbot_discord_rate_limits_total",
+    "Discord API 429 responses, by route and scope (route or global).",
+    ("route", "scope"),
+)
+PARSE_CACHE_HIT_RATIO = REGISTRY.gauge(
+    "docsbot_parse_cache_hit_ratio",
+    "Share of parse cache lookups served from the cache.",
+)
+PARSE_CACHE_ENTRIES = REGISTRY.gauge(
+    "docsbot_parse_cache_entries",
+    "Entries in the in-memory parse cache.",
+)
+LOOP_LAG_SECONDS = REGISTRY.gauge(
+    "docsbot_event_loop_lag_seconds",
+    "Event loop lag percentiles over the recent window.",
+    ("quantile",),
+)
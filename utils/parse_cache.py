@@ -0,0 +1,257 @@
+"""LRU cache of parsed documents and summaries, keyed by content hash."""
+
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+from utils.logger import get_logger
+
+logger = get_logger("parse_cache")
+
+# Cache namespaces
+KIND_PARSED = "parsed"  # ParsedDocument
+KIND_SUMMARY = "summary"  # DocumentSummary
+
+# Part of every key: bump it whenever ParsedDocument, DocumentSummary or the
+# parsing and summary output change, so entries cached on disk by an older
+# version are not served after an upgrade
+CACHE_VERSION = "v2"
+
+# How many disk writes between two prunes of the on-disk tier
+_DISK_PRUNE_EVERY = 100
+
+
+class ParseCache:
+    """
+    Memoizes parsing results of documents whose content was already seen.
+
+    Entries are keyed by kind and a key built from the content hash (plus
+    whatever else the result depends on, like the file path). The memory
+    tier is an LRU bounded both by entry count and by the estimated total
+    size of the cached values. The optional disk tier stores the same
+    entries in the state database so warm restarts skip parsing too; keys
+    start with CACHE_VERSION and entries of other versions are dropped
+    when it is opened.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        db_path: Optional[Path] = None,
+        disk_max_entries: int = 5000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Maximum estimated size of the entries kept in memory
+            db_path: SQLite database of the disk tier (None to disable it)
+            disk_max_entries: Maximum number of entries kept on disk
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_max_entries = disk_max_entries
+
+        self._entries: OrderedDict = OrderedDict()  # (kind, key) -> (value, size)
+        self._bytes = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+        if db_path is not None:
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema()
+            self._drop_other_versions()
+
+        # Statistics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _create_schema(self):
+        """Create the disk tier table if it does not exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+                """
+            )
+
+    def _drop_other_versions(self):
+        """Delete the disk entries written with another CACHE_VERSION."""
+        with self._conn:
+            dropped = self._conn.execute(
+                "DELETE FROM parse_cache WHERE key NOT LIKE ?", (f"{CACHE_VERSION}:%",)
+            ).rowcount
+
+        if dropped:
+            logger.info(f"Dropped {dropped} parse cache entries of another version")
+
+    def get(self, kind: str, key: str, count: bool = True) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            kind: Cache namespace (KIND_PARSED or KIND_SUMMARY)
+            key: Entry key (see make_key())
+            count: Whether to count the lookup in the hit/miss statistics
+                (False for lookups nested in an already counted one)
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        entry = self._entries.get((kind, key))
+        if entry is not None:
+            self._entries.move_to_end((kind, key))
+            if count:
+                self.hits += 1
+            return entry[0]
+
+        value = self._disk_get(kind, key)
+        if value is not None:
+            if count:
+                self.disk_hits += 1
+            return value
+
+        if count:
+            self.misses += 1
+        return None
+
+    def put(self, kind: str, key: str, value: Any, size: int):
+        """
+        Cache a value, evicting the least recently used entries if needed.
+
+        Args:
+            kind: Cache namespace (KIND_PARSED or KIND_SUMMARY)
+            key: Entry key (see make_key())
+            value: Value to cache
+            size: Estimated size of the value in bytes
+        """
+        self._put_memory(kind, key, value, size)
+
+        if self._conn is not None:
+            self._disk_put(kind, key, value, size)
+
+    def _put_memory(self, kind: str, key: str, value: Any, size: int):
+        """Insert an entry in the memory tier and enforce its bounds."""
+        if size > self.max_bytes:
+            return  # Would evict everything else
+
+        old = self._entries.pop((kind, key), None)
+        if old is not None:
+            self._bytes -= old[1]
+
+        self._entries[(kind, key)] = (value, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _disk_get(self, kind: str, key: str) -> Optional[Any]:
+        """Load an entry from the disk tier and promote it to memory."""
+        if self._conn is None:
+            return None
+
+        row = self._conn.execute(
+            "SELECT payload, size FROM parse_cache WHERE kind = ? AND key = ?",
+            (kind, key),
+        ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            value = pickle.loads(row[0])
+        except Exception as e:
+            # Written by an incompatible version: drop it
+            logger.debug(f"Dropping unreadable cache entry {kind}:{key}: {e}")
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM parse_cache WHERE kind = ? AND key = ?", (kind, key)
+                )
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE parse_cache SET used_at = ? WHERE kind = ? AND key = ?",
+                (time.time(), kind, key),
+            )
+
+        self._put_memory(kind, key, value, row[1])
+        return value
+
+    def _disk_put(self, kind: str, key: str, value: Any, size: int):
+        """Write an entry to the disk tier, pruning old entries now and then."""
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Cannot store {kind}:{key} on disk: {e}")
+            return
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (kind, key, payload, size, used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, key, payload, size, time.time()),
+            )
+
+            self._disk_writes += 1
+            if self._disk_writes % _DISK_PRUNE_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM parse_cache WHERE rowid IN ("
+                    "SELECT rowid FROM parse_cache ORDER BY used_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,),
+                )
+
+    @staticmethod
+    def make_key(content_hash: str, *parts) -> str:
+        """
+        Build an entry key.
+
+        Args:
+            content_hash: Hash of the document content
+            *parts: Other inputs the cached result depends on (e.g., path)
+
+        Returns:
+            Key string, prefixed with CACHE_VERSION
+        """
+        return ":".join([CACHE_VERSION, content_hash, *(str(part) for part in parts)])
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with hit/miss/eviction counters, entry count and size
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "disk": self._conn is not None,
+        }
+
+    def close(self):
+        """Close the disk tier connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
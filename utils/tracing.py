@@ -0,0 +1,300 @@
+"""Lightweight per-job tracing, correlated by webhook delivery ID."""
+
+import contextvars
+import functools
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from utils.logger import get_logger
+from utils.loop_lag import percentile
+
+logger = get_logger("tracing")
+
+# Traces the current task records spans into, and the nesting depth
+_current: contextvars.ContextVar = contextvars.ContextVar(
+    "trace_current", default=((), 0)
+)
+
+
+@dataclass
+class Span:
+    """A timed stage of a job."""
+
+    name: str
+    start: float  # time.monotonic()
+    end: float = 0.0  # 0 while running
+    depth: int = 0  # Nesting level (0 = top-level stage)
+    attrs: dict = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (up to now if still running)."""
+        return (self.end or time.monotonic()) - self.start
+
+
+@dataclass
+class Trace:
+    """All the stages of one job, from webhook delivery to Discord."""
+
+    trace_id: str  # Delivery ID (or a generated ID)
+    name: str
+    started_at: float  # time.time(), for display
+    start: float  # time.monotonic()
+    end: float = 0.0
+    status: str = ""
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (up to now if still running)."""
+        return (self.end or time.monotonic()) - self.start
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict (offsets relative to the start)."""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "status": self.status,
+            "finished": bool(self.end),
+            "spans": [
+                {
+                    "name": span.name,
+                    "offset": span.start - self.start,
+                    "duration": span.duration,
+                    "depth": span.depth,
+                    "attrs": span.attrs,
+                }
+                for span in self.spans
+            ],
+        }
+
+    def stage_totals(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Aggregate the spans by name.
+
+        Returns:
+            Dict mapping span names to (count, total duration), in order of
+            first occurrence
+        """
+        totals: Dict[str, Tuple[int, float]] = {}
+        for span in self.spans:
+            count, total = totals.get(span.name, (0, 0.0))
+            totals[span.name] = (count + 1, total + span.duration)
+        return totals
+
+    def summary(self) -> str:
+        """One-line summary for the logs."""
+        stages = ", ".join(
+            f"{name}{f' x{count}' if count > 1 else ''} {total * 1000:.0f} ms"
+            for name, (count, total) in self.stage_totals().items()
+        )
+        return (
+            f"Trace {self.trace_id} ({self.status or 'done'}): "
+            f"{self.duration * 1000:.0f} ms total - {stages or 'no spans'}"
+        )
+
+
+class Tracer:
+    """
+    Records spans into the traces active in the current context.
+
+    A trace is started per webhook delivery and activated wherever work
+    for it is done; since a pull cycle can serve several coalesced pushes,
+    several traces can be active at once and a span is recorded in all of
+    them. Spans are no-ops when no trace is active. Finished traces are
+    kept in a ring buffer.
+    """
+
+    def __init__(self, capacity: int = 200):
+        """
+        Initialize the tracer.
+
+        Args:
+            capacity: Number of finished traces kept
+        """
+        self._active: Dict[str, Trace] = {}
+        self._finished: deque = deque(maxlen=capacity)
+
+    def start_trace(self, trace_id: str, name: str) -> Trace:
+        """
+        Start a trace.
+
+        Args:
+            trace_id: Correlation ID (e.g., X-GitHub-Delivery), generated if empty
+            name: Kind of job (e.g., "push")
+
+        Returns:
+            The new Trace
+        """
+        trace_id = trace_id or uuid.uuid4().hex[:12]
+        if trace_id in self._active:
+            # Redelivery while the first delivery is still in progress
+            trace_id = f"{trace_id}#{uuid.uuid4().hex[:4]}"
+
+        trace = Trace(trace_id, name, started_at=time.time(), start=time.monotonic())
+        self._active[trace_id] = trace
+        return trace
+
+    def finish(self, trace_id: str, status: str = ""):
+        """
+        Finish a trace, log its summary and move it to the ring buffer.
+
+        Args:
+            trace_id: ID of an active trace (ignored if unknown)
+            status: Outcome (e.g., "published", "ignored")
+        """
+        trace = self._active.pop(trace_id, None)
+        if trace is None:
+            return
+
+        trace.end = time.monotonic()
+        trace.status = status or trace.status
+        self._finished.append(trace)
+        logger.info(trace.summary())
+
+    @contextmanager
+    def activate(self, *trace_ids: str) -> Iterator[None]:
+        """
+        Record the spans of the enclosed code into the given traces.
+
+        Args:
+            *trace_ids: IDs of active traces (unknown IDs are skipped)
+        """
+        traces = tuple(self._active[t] for t in trace_ids if t in self._active)
+        token = _current.set((traces, 0))
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Optional[Span]]:
+        """
+        Time the enclosed code as a span of the active traces.
+
+        Args:
+            name: Stage name
+            **attrs: Extra attributes (e.g., file path)
+
+        Yields:
+            The Span, or None if no trace is active
+        """
+        traces, depth = _current.get()
+        if not traces:
+            yield None
+            return
+
+        span = Span(name, time.monotonic(), depth=depth, attrs=attrs)
+        for trace in traces:
+            trace.spans.append(span)
+
+        token = _current.set((traces, depth + 1))
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            span.end = time.monotonic()
+            _current.reset(token)
+
+    def record(self, trace_id: str, name: str, start: float, end: float, **attrs):
+        """
+        Add an already measured top-level span (e.g., a queue wait).
+
+        Args:
+            trace_id: ID of an active trace (ignored if unknown)
+            name: Stage name
+            start: Start time (time.monotonic())
+            end: End time (time.monotonic())
+            **attrs: Extra attributes
+        """
+        trace = self._active.get(trace_id)
+        if trace is not None:
+            trace.spans.append(Span(name, start, end, attrs=attrs))
+
+    def get(self, trace_id: str) -> Optional[dict]:
+        """
+        Get an active or recent trace.
+
+        Args:
+            trace_id: Trace ID
+
+        Returns:
+            Trace dict, or None if unknown
+        """
+        trace = self._active.get(trace_id)
+        if trace is None:
+            trace = next(
+                (t for t in reversed(self._finished) if t.trace_id == trace_id), None
+            )
+        return trace.to_dict() if trace else None
+
+    def recent(self, limit: int = 20, slowest: bool = False) -> List[dict]:
+        """
+        Get recent finished traces.
+
+        Args:
+            limit: Maximum number of traces
+            slowest: Sort by duration instead of newest first
+
+        Returns:
+            List of trace dicts
+        """
+        traces = list(reversed(self._finished))
+        if slowest:
+            traces.sort(key=lambda t: t.duration, reverse=True)
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    def stage_stats(self) -> Dict[str, dict]:
+        """
+        Get per-stage latency percentiles over the finished traces.
+
+        Stage durations are summed per trace, so a stage run for several
+        files counts once with its total time.
+
+        Returns:
+            Dict mapping stage names to count, p50, p95, p99 and max (seconds)
+        """
+        durations: Dict[str, List[float]] = {"total": []}
+        for trace in self._finished:
+            durations["total"].append(trace.duration)
+            for name, (_, total) in trace.stage_totals().items():
+                durations.setdefault(name, []).append(total)
+
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1] if values else 0.0,
+            }
+        return stats
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorate a coroutine function to record its calls as spans.
+
+    Args:
+        name: Stage name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Tracer of the bot
+TRACER = Tracer()
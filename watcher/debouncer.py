@@ -0,0 +1,174 @@
+"""Trailing-edge debouncing of file system events."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from utils.logger import get_logger
+
+logger = get_logger("watcher.debouncer")
+
+# When events of different types are merged, the highest ranked one is kept
+EVENT_RANK = {"modified": 0, "moved": 1, "created": 2}
+
+
+def merge_event_types(current: str, new: str) -> str:
+    """
+    Merge a new event into the pending event type of a file.
+
+    A deletion replaces any pending event, and any later event replaces a
+    pending deletion (the file was recreated). Other events keep the highest
+    ranked type.
+
+    Args:
+        current: Pending event type
+        new: Type of the new event
+
+    Returns:
+        Event type to keep
+    """
+    if "deleted" in (current, new):
+        return new
+    return new if EVENT_RANK.get(new, 0) > EVENT_RANK.get(current, 0) else current
+
+
+@dataclass
+class _PendingFile:
+    """Events of a file waiting for it to settle."""
+
+    event_type: str
+    first_seen: float  # time.monotonic() of the first merged event
+    event_count: int
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class FileDebouncer:
+    """
+    Hands each file over once after its events stop arriving.
+
+    Every event (re)starts a per-path quiet-period timer; the file is handed
+    to `callback` only when no event arrived for `quiet_period` seconds, so
+    editors writing in several steps publish the final content. A file that
+    keeps changing is still handed over `max_wait` seconds after its first
+    event. If `callback` refuses a file (returns False), it stays pending and
+    is retried after another quiet period. Methods must be called on the
+    event loop thread (use `loop.call_soon_threadsafe` from watchdog threads).
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, str], bool],
+        quiet_period: float = 1.0,
+        max_wait: float = 10.0,
+    ):
+        """
+        Initialize the debouncer.
+
+        Args:
+            callback: Function called with (file_path, event_type), returning
+                False if the file cannot be accepted yet
+            quiet_period: Seconds without events before a file is handed over
+            max_wait: Maximum seconds between the first event and hand-over
+        """
+        self.callback = callback
+        self.quiet_period = quiet_period
+        self.max_wait = max(max_wait, quiet_period)
+
+        self._pending: Dict[str, _PendingFile] = {}
+
+        # Statistics
+        self.events_received = 0
+        self.events_merged = 0
+        self.files_settled = 0
+        self.retries = 0
+
+    def touch(self, file_path: str, event_type: str):
+        """
+        Record an event for a file and push back its publish time.
+
+        Args:
+            file_path: Path to the changed file
+            event_type: Type of event (created, modified, moved, deleted)
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        self.events_received += 1
+
+        pending = self._pending.get(file_path)
+        if pending is None:
+            pending = _PendingFile(event_type=event_type, first_seen=now, event_count=0)
+            self._pending[file_path] = pending
+        else:
+            self.events_merged += 1
+            pending.timer.cancel()
+            pending.event_type = merge_event_types(pending.event_type, event_type)
+
+        pending.event_count += 1
+
+        # Trailing edge, capped by the max wait since the first event
+        deadline = min(now + self.quiet_period, pending.first_seen + self.max_wait)
+        pending.timer = loop.call_later(
+            max(0.0, deadline - now), self._fire, file_path
+        )
+
+    def cancel(self, file_path: str) -> bool:
+        """
+        Drop the pending events of a file (e.g., it was deleted or moved away).
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if events were pending, False otherwise
+        """
+        pending = self._pending.pop(file_path, None)
+        if pending is None:
+            return False
+
+        pending.timer.cancel()
+        logger.debug(f"Dropped {pending.event_count} pending event(s) for {file_path}")
+        return True
+
+    def _fire(self, file_path: str):
+        """Hand a settled file to the callback."""
+        pending = self._pending.get(file_path)
+        if pending is None:
+            return
+
+        if not self.callback(file_path, pending.event_type):
+            # Not accepted (e.g., queue full): keep merging events meanwhile
+            self.retries += 1
+            pending.timer = asyncio.get_running_loop().call_later(
+                self.quiet_period, self._fire, file_path
+            )
+            return
+
+        del self._pending[file_path]
+        self.files_settled += 1
+
+        if pending.event_count > 1:
+            logger.debug(
+                f"Coalesced {pending.event_count} events for {file_path} "
+                f"into one '{pending.event_type}'"
+            )
+
+    def stop(self):
+        """Cancel all pending timers."""
+        for pending in self._pending.values():
+            pending.timer.cancel()
+        self._pending.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get debouncing statistics.
+
+        Returns:
+            Dict with event, merge and hand-over counters
+        """
+        return {
+            "events_received": self.events_received,
+            "events_merged": self.events_merged,
+            "files_settled": self.files_settled,
+            "retries": self.retries,
+            "pending_files": len(self._pending),
+        }
@@ -1,12 +1,19 @@
 """File system event handler for documentation changes."""
 
-import asyncio
+import os
 from pathlib import Path
+from typing import Optional
 from watchdog.events import FileSystemEventHandler, FileModifiedEvent, FileCreatedEvent
 from utils.logger import get_logger
+from bot.client import PartialPostError
 from processors.markdown_parser import MarkdownParser
 from processors.message_splitter import MessageSplitter
 from processors.embed_builder import EmbedBuilder
+from utils.file_manifest import FileManifest
+from utils.message_index import content_hash, render_hash
+from utils.parse_cache import CACHE_VERSION
+from watcher.debouncer import FileDebouncer
+from watcher.event_queue import FileEventQueue
 
 logger = get_logger("event_handler")
 
@@ -27,13 +34,33 @@ class DocsEventHandler(FileSystemEventHandler):
         self.config = config
 
         # Initialize processors
-        self.parser = MarkdownParser()
+        self.parser = MarkdownParser(cache=bot.parse_cache)
         self.splitter = MessageSplitter(max_length=config.max_message_length - 100)
         self.embed_builder = EmbedBuilder(embed_color=config.embed_color)
 
-        # Debouncing: track last processed time for each file
-        self.last_processed = {}
-        self.debounce_seconds = 2
+        # Everything the published messages depend on besides the content
+        self.render_settings = (
+            CACHE_VERSION,
+            config.embed_color,
+            config.max_message_length,
+        )
+
+        # Stat and hash of published files, for the startup reconciliation
+        self.manifest = FileManifest(config.state_db_path)
+
+        # Settled files are published by a fixed pool of workers
+        self.event_queue = FileEventQueue(
+            self._process_file_async,
+            max_depth=config.watch_queue_size,
+            workers=config.watch_workers,
+        )
+
+        # Trailing-edge debouncing: queue each file once it has settled
+        self.debouncer = FileDebouncer(
+            self._enqueue_file,
+            quiet_period=config.watch_debounce,
+            max_wait=config.watch_max_wait,
+        )
 
     def on_modified(self, event):
         """Called when a file is modified."""
@@ -60,52 +87,122 @@ class DocsEventHandler(FileSystemEventHandler):
 
         if self._is_markdown_file(event.src_path):
             logger.info(f"File deleted: {event.src_path}")
-            # Optionally handle deletions (e.g., post a deletion notice)
+            # Same per-path queue as publishes: a publish still pending or
+            # running for this file cannot re-index it after the retirement
+            self._process_file(event.src_path, "deleted")
+
+    def on_moved(self, event):
+        """Called when a file is renamed or moved."""
+        if event.is_directory:
+            return
+
+        src_is_markdown = self._is_markdown_file(event.src_path)
+        dest_is_markdown = self._is_markdown_file(event.dest_path)
+
+        if src_is_markdown and dest_is_markdown:
+            logger.info(f"File moved: {event.src_path} → {event.dest_path}")
+            # Move the mapping first so unchanged content is not reposted
+            self.bot.loop.call_soon_threadsafe(
+                self._move_file, event.src_path, event.dest_path
+            )
+            self._process_file(event.dest_path, "moved")
+
+        elif src_is_markdown:
+            self.on_deleted(event)
+
+        elif dest_is_markdown:
+            logger.info(f"File created: {event.dest_path}")
+            self._process_file(event.dest_path, "created")
 
     def _is_markdown_file(self, file_path: str) -> bool:
         """Check if file is a markdown file."""
         path = Path(file_path)
         return path.suffix.lower() in (".md", ".markdown")
 
-    def _should_process(self, file_path: str) -> bool:
+    def _process_file(self, file_path: str, event_type: str):
+        """
+        Schedule a file change to be posted to Discord once it settles.
+
+        Args:
+            file_path: Path to the changed file
+            event_type: Type of event (created, modified, moved, deleted)
+        """
+        # Watchdog runs handlers in its own thread: hand over to the bot loop
+        self.bot.loop.call_soon_threadsafe(self.debouncer.touch, file_path, event_type)
+
+    def schedule_publish(self, file_path: str, event_type: str):
         """
-        Check if file should be processed (debouncing).
+        Schedule a file to be posted once it settles (from the event loop).
 
         Args:
             file_path: Path to the file
+            event_type: Type of event (created, modified, moved, reconciled)
+        """
+        self.debouncer.touch(file_path, event_type)
 
-        Returns:
-            True if should process, False if too soon
+    async def retire_file(self, relative_path: str):
         """
-        import time
+        Retire the messages of a deleted file and forget it.
 
-        now = time.time()
-        last_time = self.last_processed.get(file_path, 0)
+        Args:
+            relative_path: Path relative to docs root
+        """
+        self.manifest.remove(relative_path)
+        await self.bot.retire_messages(relative_path, kind="document")
 
-        if now - last_time < self.debounce_seconds:
-            logger.debug(f"Debouncing file: {file_path}")
-            return False
+    def _move_file(self, src_path: str, dest_path: str):
+        """
+        Move the messages of a renamed file to its new path.
 
-        self.last_processed[file_path] = now
-        return True
+        If the new path maps to another channel, the old messages are retired
+        instead (through the queue) and the file is posted in the new channel.
 
-    def _process_file(self, file_path: str, event_type: str):
+        Args:
+            src_path: Previous path of the file
+            dest_path: New path of the file
         """
-        Process a file change and post to Discord.
+        if self._channel_id(src_path) != self._channel_id(dest_path):
+            self.debouncer.touch(src_path, "deleted")
+            return
+
+        self.debouncer.cancel(src_path)
+        src_relative = self._relative_path(src_path)
+        self.manifest.remove(src_relative)
+        self.bot.move_messages(src_relative, self._relative_path(dest_path), "document")
+
+    def _channel_id(self, file_path: str) -> Optional[int]:
+        """Get the ID of the channel a file maps to (None if unresolved)."""
+        if not self.bot.channel_resolver:
+            return None
+        return self.bot.channel_resolver.resolve_channel(self._extract_folder(file_path))
+
+    def _enqueue_file(self, file_path: str, event_type: str) -> bool:
+        """
+        Queue a settled file for publishing.
 
         Args:
             file_path: Path to the changed file
-            event_type: Type of event (created, modified, deleted)
+            event_type: Type of event (created, modified, moved)
+
+        Returns:
+            False if the queue is full (the debouncer retries later)
         """
-        # Debounce
-        if not self._should_process(file_path):
-            return
+        result = self.event_queue.offer(file_path, event_type)
 
-        # Run async processing in the event loop
-        asyncio.run_coroutine_threadsafe(
-            self._process_file_async(file_path, event_type),
-            self.bot.loop
-        )
+        if result == "full":
+            logger.debug(
+                f"Watcher queue full ({self.event_queue.max_depth}), "
+                f"delaying {Path(file_path).name}"
+            )
+            return False
+
+        return True
+
+    async def stop(self):
+        """Drop pending events and stop the publishing workers."""
+        self.debouncer.stop()
+        await self.event_queue.stop()
+        self.manifest.close()
 
     async def _process_file_async(self, file_path: str, event_type: str):
         """
@@ -115,7 +212,22 @@ class DocsEventHandler(FileSystemEventHandler):
             file_path: Path to the file
             event_type: Type of event
         """
+        if event_type == "deleted":
+            if os.path.exists(file_path):
+                # Recreated after the deletion event: publish it instead
+                event_type = "created"
+            else:
+                await self.retire_file(self._relative_path(file_path))
+                return
+
         try:
+            # Stat before reading: a later write changes the recorded mtime
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                logger.warning(f"File vanished before processing: {file_path}")
+                return
+
             # Read file content
             content = await self._read_file(file_path)
 
@@ -131,30 +243,79 @@ class DocsEventHandler(FileSystemEventHandler):
                 f"Processing {file_name} (event: {event_type}, folder: {folder_name})"
             )
 
-            # Parse markdown
-            parsed_doc = self.parser.parse_file(file_path, content)
+            # Skip parsing and posting if this content is already live
+            relative_path = self._relative_path(file_path)
+            file_hash = content_hash(content)
+            published_hash = render_hash(content, *self.render_settings)
+            channel = (
+                self.bot.channel_resolver.get_channel(folder_name)
+                if self.bot.channel_resolver
+                else None
+            )
+            if channel and self.bot.message_index.is_unchanged(
+                relative_path, channel.id, published_hash, kind="document"
+            ):
+                logger.info(f"Content unchanged for {file_name}, skipping")
+                self.manifest.set(relative_path, stat.st_mtime_ns, stat.st_size, file_hash)
+                return
 
-            # Split content into chunks
-            chunks = self.splitter.split_with_metadata(
-                parsed_doc.content, file_name
+            # Parse markdown (in a worker process for large documents, which
+            # are then split there too)
+            parsed_doc, spans = await self.bot.processing_pool.parse_and_split(
+                self.parser, self.splitter, file_path, content
             )
 
+            # Stream chunks → embeds → messages: the first message is posted
+            # while later chunks are still to be split
+            if spans is None:
+                chunk_count = self.splitter.count_chunks(parsed_doc.content, parsed_doc.tokens)
+            else:
+                chunk_count = len(spans)
+
             logger.info(
-                f"Split {file_name} into {len(chunks)} chunk(s)"
+                f"Split {file_name} into {chunk_count} chunk(s)"
             )
 
-            # Create embeds
-            embeds = self.embed_builder.create_embeds_from_chunks(
-                parsed_doc, chunks
+            chunks = self.splitter.iter_chunks(
+                parsed_doc.content,
+                file_name,
+                parsed_doc.tokens,
+                total=chunk_count,
+                spans=spans,
             )
+            embeds = self.embed_builder.iter_embeds(parsed_doc, chunks)
 
             # Post to Discord
-            success = await self.bot.post_to_channel(folder_name, embeds)
+            previous = self.bot.message_index.get(relative_path, kind="document")
+            try:
+                messages = await self.bot.post_to_channel(folder_name, embeds)
+            except PartialPostError as e:
+                # Never leave a truncated copy next to the previous version,
+                # which stays indexed until a complete post replaces it
+                await self._delete_partial(e.messages)
+                logger.error(
+                    f"❌ Failed to post {file_name} to Discord after "
+                    f"{len(e.messages)} message(s), removed them"
+                )
+                return
 
-            if success:
+            if messages:
+                self.bot.message_index.set(
+                    relative_path,
+                    messages[0].channel.id,
+                    [m.id for m in messages],
+                    published_hash,
+                    kind="document",
+                )
+                self.manifest.set(relative_path, stat.st_mtime_ns, stat.st_size, file_hash)
+
+                # The new version is live: remove the previous one, which the
+                # index no longer references
+                if previous:
+                    await self._delete_previous(previous)
                 logger.info(
                     f"✅ Successfully posted {file_name} to Discord "
-                    f"({len(embeds)} message(s))"
+                    f"({chunk_count} embed(s) in {len(messages)} message(s))"
                 )
             else:
                 logger.error(f"❌ Failed to post {file_name} to Discord")
@@ -165,6 +326,34 @@ class DocsEventHandler(FileSystemEventHandler):
                 exc_info=True
             )
 
+    async def _delete_previous(self, entry):
+        """
+        Delete the messages of a document version that was replaced.
+
+        Args:
+            entry: IndexEntry of the previous version
+        """
+        channel = self.bot.get_channel(entry.channel_id)
+        if not channel:
+            logger.warning(f"Channel {entry.channel_id} of {entry.path} no longer exists")
+            return
+
+        await self.bot.delete_messages(channel, entry.message_ids)
+        logger.info(
+            f"Deleted {len(entry.message_ids)} message(s) of the previous "
+            f"version of {entry.path}"
+        )
+
+    async def _delete_partial(self, messages):
+        """
+        Delete the messages of a document post that failed midway.
+
+        Args:
+            messages: Messages sent before the failure
+        """
+        channel = messages[0].channel
+        await self.bot.delete_messages(channel, [m.id for m in messages])
+
     async def _read_file(self, file_path: str) -> str:
         """
         Read file content asynchronously.
@@ -186,6 +375,21 @@ class DocsEventHandler(FileSystemEventHandler):
             logger.error(f"Failed to read file {file_path}: {e}")
             return ""
 
+    def _relative_path(self, file_path: str) -> str:
+        """
+        Get the index key (path relative to docs root) for a file.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Relative path, or the file name if outside the docs root
+        """
+        try:
+            return str(Path(file_path).relative_to(self.config.docs_path))
+        except ValueError:
+            return Path(file_path).name
+
     def _extract_folder(self, file_path: str) -> str:
         """
         Extract the folder name for channel mapping.
@@ -0,0 +1,153 @@
+"""Bounded queue between settled watcher events and Discord publishing."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+from utils.logger import get_logger
+from watcher.debouncer import merge_event_types
+
+logger = get_logger("watcher.event_queue")
+
+
+class FileEventQueue:
+    """
+    Bounded async queue of file paths drained by a fixed pool of workers.
+
+    Each path is queued at most once: offering a path that is already
+    waiting only merges its event type. A path is never processed by two
+    workers at the same time. When the queue is full the offer is refused
+    and the caller keeps the event pending instead of fanning out work.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, str], Awaitable[None]],
+        max_depth: int = 100,
+        workers: int = 2,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            handler: Coroutine function called with (file_path, event_type)
+            max_depth: Maximum number of distinct queued paths
+            workers: Number of worker tasks
+        """
+        self.handler = handler
+        self.max_depth = max_depth
+        self.worker_count = max(1, workers)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._queued: Dict[str, str] = {}  # Path -> merged event type
+        self._active: Dict[str, asyncio.Event] = {}  # Paths being processed
+
+        # Statistics
+        self.queued_count = 0
+        self.merged_count = 0
+        self.rejected_count = 0
+        self.processed_count = 0
+        self.failed_count = 0
+        self.max_depth_seen = 0
+
+    def start(self):
+        """Start the worker tasks (requires a running event loop)."""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        logger.info(
+            f"Watcher queue started ({self.worker_count} worker(s), max depth {self.max_depth})"
+        )
+
+    async def stop(self):
+        """Cancel the worker tasks; queued paths are dropped."""
+        for task in self._workers:
+            task.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queued.clear()
+        logger.info("Watcher queue stopped")
+
+    def offer(self, file_path: str, event_type: str) -> str:
+        """
+        Queue a path without waiting.
+
+        Args:
+            file_path: Path to the changed file
+            event_type: Type of event (created, modified, moved, deleted)
+
+        Returns:
+            "queued", "merged" if the path was already waiting, or "full"
+            if the queue is at max depth
+        """
+        self.start()
+
+        queued_type = self._queued.get(file_path)
+        if queued_type is not None:
+            self._queued[file_path] = merge_event_types(queued_type, event_type)
+            self.merged_count += 1
+            return "merged"
+
+        try:
+            self._queue.put_nowait(file_path)
+        except asyncio.QueueFull:
+            self.rejected_count += 1
+            return "full"
+
+        self._queued[file_path] = event_type
+        self.queued_count += 1
+        self.max_depth_seen = max(self.max_depth_seen, self._queue.qsize())
+        return "queued"
+
+    async def _worker(self, worker_id: int):
+        """Process paths until cancelled."""
+        while True:
+            file_path = await self._queue.get()
+
+            try:
+                # Another worker is still publishing an older version
+                while file_path in self._active:
+                    await self._active[file_path].wait()
+
+                # Events offered from here on queue a new pass
+                event_type = self._queued.pop(file_path, "modified")
+                done = self._active[file_path] = asyncio.Event()
+
+                try:
+                    await self.handler(file_path, event_type)
+                    self.processed_count += 1
+                except Exception as e:
+                    self.failed_count += 1
+                    logger.error(
+                        f"Worker {worker_id} failed on {file_path}: {e}", exc_info=True
+                    )
+                finally:
+                    del self._active[file_path]
+                    done.set()
+
+            finally:
+                self._queue.task_done()
+
+    def get_stats(self) -> dict:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dict with depth, active count and counters
+        """
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_depth": self.max_depth,
+            "max_depth_seen": self.max_depth_seen,
+            "active": len(self._active),
+            "workers": self.worker_count,
+            "queued": self.queued_count,
+            "merged": self.merged_count,
+            "rejected": self.rejected_count,
+            "processed": self.processed_count,
+            "failed": self.failed_count,
+        }
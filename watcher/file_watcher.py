@@ -3,6 +3,7 @@
 from watchdog.observers import Observer
 from pathlib import Path
 from utils.logger import get_logger
+from watcher.polling import PollingDirectoryWatcher
 
 logger = get_logger("file_watcher")
 
@@ -20,15 +21,27 @@ class DocsWatcher:
         """
         self.config = config
         self.event_handler = event_handler
-        self.observer = Observer()
+        self.observer = self._create_observer()
         self.is_running = False
 
+    def _create_observer(self):
+        """
+        Create the observer for the configured watcher backend.
+
+        Returns:
+            watchdog Observer (native notifications) or PollingDirectoryWatcher
+        """
+        if self.config.watcher_backend == "polling":
+            return PollingDirectoryWatcher(interval=self.config.watch_poll_interval)
+        return Observer()
+
     def start(self):
         """Start watching the documentation folder."""
         docs_path = str(self.config.docs_path)
 
         logger.info(f"Starting file watcher on: {docs_path}")
         logger.info(f"Recursive: {self.config.watch_recursive}")
+        logger.info(f"Backend: {self.config.watcher_backend}")
 
         try:
             self.observer.schedule(
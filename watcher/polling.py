@@ -0,0 +1,306 @@
+"""Polling watcher backend with an incremental os.scandir directory index."""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEventHandler,
+)
+from utils.logger import get_logger
+
+logger = get_logger("watcher.polling")
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+RECENT_MTIME_NS = 2_000_000_000  # Folders modified less than 2s ago are relisted
+
+
+@dataclass
+class _FileState:
+    """Last seen identity of a file."""
+
+    inode: int
+    mtime_ns: int
+    size: int
+
+
+@dataclass
+class _DirState:
+    """Last seen listing of a directory."""
+
+    mtime_ns: int
+    files: Dict[str, _FileState] = field(default_factory=dict)  # Name -> state
+    subdirs: Set[str] = field(default_factory=set)  # Names
+
+
+class PollingDirectoryWatcher:
+    """
+    Detects docs changes by periodically polling the file system.
+
+    Meant for network filesystems and bind-mounted volumes, where native
+    file system notifications are unreliable. An in-memory index of each
+    directory (mtime and the inode, mtime and size of its markdown files)
+    is kept between scans. A directory whose mtime did not change has the
+    same entries, so it is not listed again: only its known files are
+    stat'ed for content changes. Renames are detected by inode.
+
+    Mirrors the subset of the watchdog Observer API used by DocsWatcher
+    and dispatches regular watchdog events to the handler.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        """
+        Initialize the polling watcher.
+
+        Args:
+            interval: Seconds between two scans
+        """
+        self.interval = interval
+        self._handler: Optional[FileSystemEventHandler] = None
+        self._root = ""
+        self._recursive = True
+        self._dirs: Dict[str, _DirState] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.scans = 0
+        self.dirs_listed = 0
+        self.last_scan_time = 0.0
+
+    def schedule(
+        self, event_handler: FileSystemEventHandler, path: str, recursive: bool = True
+    ):
+        """
+        Set the handler and directory to watch.
+
+        Args:
+            event_handler: Handler receiving watchdog events
+            path: Directory to watch
+            recursive: Whether to watch subfolders
+        """
+        self._handler = event_handler
+        self._root = os.path.abspath(path)
+        self._recursive = recursive
+
+    def start(self):
+        """Start the polling thread, which builds the initial index first."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="docs-polling-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Ask the polling thread to stop."""
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait for the polling thread to exit."""
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """Build the initial index, then scan until stopped."""
+        # Indexing a large tree takes a while: keep it off the caller's
+        # thread, which is the event loop at bot startup. Until it succeeds,
+        # files already present must not be reported as created.
+        indexed = False
+        while not self._stop_event.is_set():
+            try:
+                self._scan(emit=indexed)
+                if not indexed:
+                    indexed = True
+                    logger.info(
+                        f"Polling watcher indexed {len(self._dirs)} folder(s), "
+                        f"scanning every {self.interval}s"
+                    )
+            except Exception as e:
+                logger.error(f"Polling scan failed: {e}", exc_info=True)
+
+            self._stop_event.wait(self.interval)
+
+    def _scan(self, emit: bool):
+        """
+        Update the index and dispatch the changes found.
+
+        Args:
+            emit: Whether to dispatch events (False for the initial index)
+        """
+        start = time.perf_counter()
+        created: List[Tuple[str, _FileState]] = []
+        deleted: List[Tuple[str, _FileState]] = []
+        modified: List[str] = []
+
+        self._scan_dir(self._root, created, deleted, modified)
+
+        self.scans += 1
+        self.last_scan_time = time.perf_counter() - start
+
+        if not emit:
+            return
+
+        # A deletion and a creation of the same inode is a rename
+        deleted_by_inode = {state.inode: path for path, state in deleted}
+        moved_sources = set()
+
+        for path, state in created:
+            src_path = deleted_by_inode.pop(state.inode, None)
+            if src_path:
+                moved_sources.add(src_path)
+                self._handler.dispatch(FileMovedEvent(src_path, path))
+            else:
+                self._handler.dispatch(FileCreatedEvent(path))
+
+        for path, _ in deleted:
+            if path not in moved_sources:
+                self._handler.dispatch(FileDeletedEvent(path))
+
+        for path in modified:
+            self._handler.dispatch(FileModifiedEvent(path))
+
+    def _scan_dir(
+        self,
+        directory: str,
+        created: List[Tuple[str, _FileState]],
+        deleted: List[Tuple[str, _FileState]],
+        modified: List[str],
+    ):
+        """
+        Scan one directory, then its subdirectories.
+
+        A directory that cannot be stat'ed or listed (e.g., ESTALE or EIO on
+        a network filesystem) keeps its last known state until a later scan
+        succeeds. Directories are only forgotten when their parent's listing
+        no longer contains them.
+        """
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError as e:
+            logger.warning(f"Cannot stat {directory}, keeping its last state: {e}")
+            return
+
+        state = self._dirs.get(directory)
+
+        if state is not None and state.mtime_ns == dir_mtime:
+            # Same entries as last time: only check the known files' content
+            for name, old in list(state.files.items()):
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    deleted.append((path, state.files.pop(name)))
+                    continue
+                except OSError as e:
+                    logger.warning(f"Cannot stat {path}, keeping its last state: {e}")
+                    continue
+
+                if st.st_mtime_ns != old.mtime_ns or st.st_size != old.size:
+                    state.files[name] = _FileState(st.st_ino, st.st_mtime_ns, st.st_size)
+                    modified.append(path)
+        else:
+            state = self._list_dir(directory, dir_mtime, state, created, deleted, modified)
+            if state is None:
+                return
+
+        for name in list(state.subdirs):
+            self._scan_dir(os.path.join(directory, name), created, deleted, modified)
+
+    def _list_dir(
+        self,
+        directory: str,
+        dir_mtime: int,
+        old_state: Optional[_DirState],
+        created: List[Tuple[str, _FileState]],
+        deleted: List[Tuple[str, _FileState]],
+        modified: List[str],
+    ) -> Optional[_DirState]:
+        """
+        List a new or changed directory and diff it with its old listing.
+
+        Returns:
+            The new state, or None if the directory could not be listed (its
+            old state is kept)
+        """
+        state = _DirState(mtime_ns=dir_mtime)
+
+        # With coarse mtime granularity (e.g., 1s on some network filesystems)
+        # an entry added later in the same tick would leave the mtime as is:
+        # don't trust a very recent mtime and list the folder again next time
+        if time.time_ns() - dir_mtime < RECENT_MTIME_NS:
+            state.mtime_ns = -1
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+
+                    if entry.is_dir(follow_symlinks=False):
+                        if self._recursive:
+                            state.subdirs.add(entry.name)
+                    elif entry.name.lower().endswith(MARKDOWN_SUFFIXES):
+                        st = entry.stat()
+                        state.files[entry.name] = _FileState(
+                            st.st_ino, st.st_mtime_ns, st.st_size
+                        )
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}, keeping its last state: {e}")
+            return None
+
+        self.dirs_listed += 1
+        old_files = old_state.files if old_state else {}
+
+        for name, file_state in state.files.items():
+            path = os.path.join(directory, name)
+            old = old_files.get(name)
+
+            if old is None:
+                created.append((path, file_state))
+            elif old != file_state:
+                # New inode at the same path: atomic save (write + rename)
+                modified.append(path)
+
+        for name, old in old_files.items():
+            if name not in state.files:
+                deleted.append((os.path.join(directory, name), old))
+
+        if old_state:
+            for name in old_state.subdirs - state.subdirs:
+                self._forget_dir(os.path.join(directory, name), deleted)
+
+        self._dirs[directory] = state
+        return state
+
+    def _forget_dir(self, directory: str, deleted: List[Tuple[str, _FileState]]):
+        """Drop a removed directory (and its subdirectories) from the index."""
+        state = self._dirs.pop(directory, None)
+        if state is None:
+            return
+
+        for name, file_state in state.files.items():
+            deleted.append((os.path.join(directory, name), file_state))
+
+        for name in state.subdirs:
+            self._forget_dir(os.path.join(directory, name), deleted)
+
+    def get_stats(self) -> dict:
+        """
+        Get polling statistics.
+
+        Returns:
+            Dict with scan counters and the last scan duration in seconds
+        """
+        return {
+            "folders": len(self._dirs),
+            "files": sum(len(state.files) for state in self._dirs.values()),
+            "scans": self.scans,
+            "folders_listed": self.dirs_listed,
+            "last_scan_time": self.last_scan_time,
+        }
@@ -0,0 +1,231 @@
+"""Startup reconciliation of the docs folder against the file manifest."""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+from utils.file_manifest import FileManifest, ManifestEntry
+from utils.logger import get_logger
+from utils.message_index import MessageIndex, content_hash
+
+logger = get_logger("watcher.reconciler")
+
+
+@dataclass
+class ReconcileReport:
+    """Outcome of a startup reconciliation scan."""
+
+    scanned: int = 0  # Markdown files found on disk
+    unchanged: int = 0  # Same mtime/size, or same content after a touch
+    changed: List[str] = field(default_factory=list)  # New or edited files
+    deleted: List[str] = field(default_factory=list)  # Gone while offline
+    on_disk: List[str] = field(default_factory=list)  # All scanned files
+    unreadable: List[str] = field(default_factory=list)  # Folders that could not be listed
+    refreshed: List[ManifestEntry] = field(default_factory=list)  # New stat of touched files
+    elapsed: float = 0.0  # Scan wall time in seconds
+
+    @property
+    def incomplete(self) -> bool:
+        """Whether some folders could not be listed."""
+        return bool(self.unreadable)
+
+
+def scan_markdown_files(
+    docs_path: Path, recursive: bool = True
+) -> Tuple[Dict[str, os.stat_result], List[str]]:
+    """
+    Walk the docs folder with os.scandir.
+
+    Args:
+        docs_path: Root documentation directory
+        recursive: Whether to descend into subfolders
+
+    Returns:
+        Tuple of (dict mapping relative POSIX paths to their stat results,
+        relative POSIX prefixes of the subfolders that could not be listed)
+
+    Raises:
+        OSError: If the docs root itself cannot be listed
+    """
+    found = {}
+    unreadable = []
+    stack: List[Tuple[str, str]] = [(str(docs_path), "")]
+
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.name.lower().endswith((".md", ".markdown")):
+                        found[prefix + entry.name] = entry.stat()
+        except OSError as e:
+            if not prefix:
+                # Unmounted or stale mount: nothing can be compared
+                raise
+            logger.warning(f"Cannot scan {directory}: {e}")
+            unreadable.append(prefix)
+
+    return found, unreadable
+
+
+class StartupReconciler:
+    """
+    Finds the docs changes made while the bot was not running.
+
+    A fast os.scandir walk is compared with the manifest of the last
+    published files: files whose mtime and size match are skipped without
+    being read, touched files are hashed and only those whose content
+    differs are republished. Files recorded in the manifest but missing
+    on disk have their messages retired, unless the scan could not have
+    seen them (folder not listed, or subfolder of a non-recursive scan).
+    """
+
+    def __init__(
+        self,
+        event_handler,
+        manifest: FileManifest,
+        docs_path: Path,
+        recursive: bool = True,
+    ):
+        """
+        Initialize the reconciler.
+
+        Args:
+            event_handler: DocsEventHandler used to publish and retire files
+            manifest: FileManifest of the last published files
+            docs_path: Root documentation directory
+            recursive: Whether to scan subfolders
+        """
+        self.event_handler = event_handler
+        self.manifest = manifest
+        self.docs_path = Path(docs_path)
+        self.recursive = recursive
+        self.has_run = False
+
+    async def run(self) -> ReconcileReport:
+        """
+        Scan the docs folder and publish or retire what changed.
+
+        Returns:
+            ReconcileReport with the scan results
+        """
+        start = time.perf_counter()
+        self.has_run = True
+
+        # The manifest's connection is only used on the loop: the scan
+        # thread works on a snapshot and returns the rows to update
+        manifest = self.manifest.load()
+        report = await asyncio.to_thread(self._scan, manifest)
+        if report.refreshed:
+            self.manifest.set_many(report.refreshed)
+
+        # Documents published before the manifest existed are only indexed
+        indexed = self.event_handler.bot.message_index.paths("document")
+        missing = set(report.deleted) | (set(indexed) - set(report.on_disk))
+        report.deleted = sorted(
+            path for path in missing if self._was_scanned(path, report.unreadable)
+        )
+
+        if report.deleted and not report.on_disk:
+            # An empty mount point looks exactly like a deleted docs tree
+            logger.error(
+                f"No markdown file found in {self.docs_path} but "
+                f"{len(report.deleted)} file(s) are published: not retiring "
+                f"anything (is the docs folder mounted?)"
+            )
+            report.deleted = []
+
+        for relative_path in report.changed:
+            self.event_handler.schedule_publish(
+                str(self.docs_path / relative_path), "reconciled"
+            )
+
+        for relative_path in report.deleted:
+            await self.event_handler.retire_file(relative_path)
+
+        report.elapsed = time.perf_counter() - start
+        logger.info(
+            f"Startup reconciliation: {report.scanned} file(s) scanned in "
+            f"{report.elapsed:.2f}s, {len(report.changed)} changed, "
+            f"{len(report.deleted)} deleted, {report.unchanged} unchanged"
+        )
+        if report.incomplete:
+            logger.warning(
+                f"Startup reconciliation incomplete: could not list "
+                f"{', '.join(report.unreadable)} (their files were not retired)"
+            )
+        return report
+
+    def _was_scanned(self, relative_path: str, unreadable: List[str]) -> bool:
+        """
+        Check whether the scan could have seen a file.
+
+        Args:
+            relative_path: Path relative to docs root
+            unreadable: Prefixes of the folders that could not be listed
+
+        Returns:
+            False for files in unlisted folders, or in subfolders when the
+            scan is not recursive
+        """
+        relative_path = MessageIndex.normalize_path(relative_path)
+        if not self.recursive and "/" in relative_path:
+            return False
+        return not relative_path.startswith(tuple(unreadable))
+
+    def _scan(self, manifest: Dict[str, ManifestEntry]) -> ReconcileReport:
+        """
+        Compare the docs folder with the manifest (blocking).
+
+        Args:
+            manifest: Snapshot of the manifest, consumed by the scan
+
+        Returns:
+            ReconcileReport, whose refreshed entries are still to be stored
+        """
+        report = ReconcileReport()
+        on_disk, report.unreadable = scan_markdown_files(self.docs_path, self.recursive)
+        report.scanned = len(on_disk)
+        report.on_disk = list(on_disk)
+
+        for relative_path, stat in on_disk.items():
+            entry = manifest.pop(relative_path, None)
+
+            if entry and entry.matches(stat.st_mtime_ns, stat.st_size):
+                report.unchanged += 1
+                continue
+
+            if entry:
+                # Touched (checkout, editor save without edits...): compare content
+                try:
+                    content = (self.docs_path / relative_path).read_text(encoding="utf-8")
+                except OSError as e:
+                    logger.warning(f"Cannot read {relative_path}: {e}")
+                    continue
+
+                if content_hash(content) == entry.content_hash:
+                    report.refreshed.append(
+                        ManifestEntry(
+                            relative_path,
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                            entry.content_hash,
+                        )
+                    )
+                    report.unchanged += 1
+                    continue
+
+            report.changed.append(relative_path)
+
+        # Whatever is left in the manifest no longer exists on disk (run()
+        # keeps only the paths this scan could have seen)
+        report.deleted = sorted(manifest)
+        return report
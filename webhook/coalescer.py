@@ -0,0 +1,192 @@
+"""Coalesce bursts of pushes into single pull-and-publish cycles."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from utils.logger import get_logger
+from utils.tracing import TRACER
+
+logger = get_logger("webhook.coalescer")
+
+
+class PushCoalescer:
+    """
+    Merges the file sets of pushes arriving close together.
+
+    The first push opens a pending cycle that waits `window` seconds before
+    running. Pushes arriving while a cycle is pending or running are merged
+    into the next cycle, so a burst of pushes results in one `git pull` and
+    each file is published at most once per cycle. A merged cycle covers
+    the commit range from the first push's `before` to the last `after`.
+
+    `submit` returns a future resolved when the cycle containing the push
+    ends, so callers that await it (the webhook job queue workers) bound
+    the number of pushes in flight. The traces of all the pushes of a cycle
+    are active while it runs, and are finished when it ends.
+    """
+
+    def __init__(
+        self,
+        run_cycle: Callable[[List[str], str, str], Awaitable[int]],
+        window: float = 2.0,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            run_cycle: Coroutine function pulling and publishing a cycle,
+                called with (files, before, after), returning the number
+                of files processed
+            window: Seconds to wait for more pushes before starting a cycle
+        """
+        self.run_cycle = run_cycle
+        self.window = window
+
+        self._pending: Optional[Set[str]] = None
+        self._pending_pushes = 0
+        self._pending_before = ""
+        self._pending_after = ""
+        self._pending_traces: Dict[str, float] = {}  # Trace ID -> submit time
+        self._pending_waiters: List[asyncio.Future] = []
+        self._runner: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.pushes_received = 0
+        self.pushes_coalesced = 0
+        self.cycles_run = 0
+        self.cycles_failed = 0
+        self.files_published = 0
+
+    def submit(
+        self, files: Iterable[str], before: str = "", after: str = "", trace_id: str = ""
+    ) -> asyncio.Future:
+        """
+        Add a push to the next cycle.
+
+        Args:
+            files: Changed files listed in the payload, relative to repo root
+            before: Commit SHA before the push
+            after: Commit SHA after the push
+            trace_id: Trace of the push delivery (see utils.tracing)
+
+        Returns:
+            Future resolved with the number of files processed by the cycle
+            containing the push (set to its exception if the cycle fails,
+            cancelled if the coalescer stops first)
+        """
+        self.pushes_received += 1
+
+        if self._pending is None:
+            self._pending = set()
+            self._pending_pushes = 0
+            self._pending_before = before
+            self._pending_traces = {}
+            self._pending_waiters = []
+        else:
+            self.pushes_coalesced += 1
+
+        self._pending.update(files)
+        self._pending_pushes += 1
+        self._pending_after = after or self._pending_after
+        if trace_id:
+            self._pending_traces[trace_id] = time.monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending_waiters.append(waiter)
+
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        return waiter
+
+    @property
+    def is_busy(self) -> bool:
+        """Whether a cycle is pending or running."""
+        return self._runner is not None and not self._runner.done()
+
+    async def _run(self):
+        """Run cycles until no pushes are pending."""
+        while self._pending is not None:
+            # Give the rest of the burst a chance to arrive
+            await asyncio.sleep(self.window)
+
+            files = sorted(self._pending)
+            pushes = self._pending_pushes
+            before, after = self._pending_before, self._pending_after
+            traces = self._pending_traces
+            waiters = self._pending_waiters
+            self._pending = None
+            self._pending_waiters = []
+
+            logger.info(
+                f"Starting cycle for {pushes} push(es), {len(files)} file(s)"
+            )
+
+            started = time.monotonic()
+            for trace_id, submitted in traces.items():
+                TRACER.record(trace_id, "coalesce_wait", submitted, started)
+
+            status = "cancelled"
+            try:
+                with TRACER.activate(*traces):
+                    processed = await self.run_cycle(files, before, after)
+                self.cycles_run += 1
+                self.files_published += processed or 0
+                status = "published"
+                self._resolve(waiters, result=processed or 0)
+            except Exception as e:
+                self.cycles_failed += 1
+                status = "failed"
+                logger.error(f"Push cycle failed: {e}", exc_info=True)
+                self._resolve(waiters, error=e)
+            finally:
+                self._resolve(waiters)  # Cancelled
+                for trace_id in traces:
+                    TRACER.finish(trace_id, status)
+
+    @staticmethod
+    def _resolve(
+        waiters: List[asyncio.Future],
+        result: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ):
+        """Resolve the waiters of a cycle that are still pending (cancel if no outcome)."""
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            elif result is not None:
+                waiter.set_result(result)
+            else:
+                waiter.cancel()
+
+    async def stop(self):
+        """Cancel the running or pending cycle and its waiters."""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+        self._pending = None
+        self._resolve(self._pending_waiters)
+        self._pending_waiters = []
+
+    def get_stats(self) -> dict:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dict with push, cycle and pending file counters
+        """
+        return {
+            "pushes_received": self.pushes_received,
+            "pushes_coalesced": self.pushes_coalesced,
+            "cycles_run": self.cycles_run,
+            "cycles_failed": self.cycles_failed,
+            "files_published": self.files_published,
+            "pending_files": len(self._pending) if self._pending else 0,
+            "busy": self.is_busy,
+        }
@@ -0,0 +1,571 @@
+"""Git backends: `git` subprocesses or in-process object database access."""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from utils.logger import get_logger
+
+logger = get_logger("webhook.git_backend")
+
+# Change types reported by diff()
+CHANGE_ADDED = "added"
+CHANGE_MODIFIED = "modified"
+CHANGE_DELETED = "deleted"
+CHANGE_RENAMED = "renamed"
+
+
+@dataclass
+class FileChange:
+    """A file changed between two commits."""
+
+    change_type: str  # One of the CHANGE_* constants
+    path: str  # Path relative to repo root (old path for deletions)
+    old_path: Optional[str] = None  # Previous path for renames
+
+
+def _entry_path(entry) -> Optional[str]:
+    """Get the decoded path of a dulwich tree change side (None if absent)."""
+    if entry is None or entry.path is None:
+        return None
+    return entry.path.decode()
+
+
+class SubprocessGitBackend:
+    """Runs `git` commands as subprocesses (default backend)."""
+
+    name = "subprocess"
+
+    def __init__(self, repo_path: Path, remote: str = "origin"):
+        """
+        Initialize the backend.
+
+        Args:
+            repo_path: Repository root
+            remote: Remote to pull/fetch from
+        """
+        self.repo_path = Path(repo_path)
+        self.remote = remote
+
+    async def _run(self, *args: str) -> tuple[int, str, str]:
+        """
+        Run a git command in the repository.
+
+        Returns:
+            Tuple of (return code, stdout, stderr)
+        """
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=str(self.repo_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        return process.returncode, stdout.decode().strip(), stderr.decode().strip()
+
+    async def pull(self) -> bool:
+        """
+        Fast-forward the current branch from the remote.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        code, out, err = await self._run("pull", "--ff-only")
+
+        if code == 0:
+            logger.info(f"Git pull successful: {out}")
+            return True
+
+        logger.error(f"Git pull failed: {err}")
+        return False
+
+    async def fetch(self) -> bool:
+        """
+        Fetch the remote without touching the working tree.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        code, _, err = await self._run("fetch", self.remote)
+
+        if code != 0:
+            logger.error(f"Git fetch failed: {err}")
+        return code == 0
+
+    async def resolve(self, ref: str) -> Optional[str]:
+        """
+        Resolve a ref (e.g., "HEAD", "origin/main") to a commit SHA.
+
+        Returns:
+            Hex commit SHA, or None if the ref does not exist
+        """
+        code, out, _ = await self._run("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+        return out if code == 0 and out else None
+
+    async def is_ancestor(self, ancestor: str, commit: str) -> bool:
+        """
+        Check whether a commit is reachable from another.
+
+        Args:
+            ancestor: Candidate ancestor commit SHA
+            commit: Descendant commit SHA
+
+        Returns:
+            True if `ancestor` is `commit` or one of its ancestors
+        """
+        code, _, _ = await self._run("merge-base", "--is-ancestor", ancestor, commit)
+        return code == 0
+
+    async def diff(self, old: str, new: str, prefix: str = "") -> List[FileChange]:
+        """
+        List files changed between two commits, with rename detection.
+
+        Args:
+            old: Old commit SHA or ref
+            new: New commit SHA or ref
+            prefix: Only report paths under this prefix (e.g., "docs/")
+
+        Returns:
+            List of FileChange objects
+        """
+        args = ["diff", "--name-status", "-M", old, new]
+        if prefix:
+            args += ["--", prefix]
+
+        code, out, err = await self._run(*args)
+
+        if code != 0:
+            logger.error(f"Git diff {old}..{new} failed: {err}")
+            return []
+
+        changes = []
+        for line in out.splitlines():
+            parts = line.split("\t")
+            status = parts[0][:1]
+
+            if status == "R" and len(parts) == 3:
+                changes.append(FileChange(CHANGE_RENAMED, parts[2], old_path=parts[1]))
+            elif status == "A":
+                changes.append(FileChange(CHANGE_ADDED, parts[1]))
+            elif status == "D":
+                changes.append(FileChange(CHANGE_DELETED, parts[1]))
+            elif status in ("M", "T", "C") and len(parts) >= 2:
+                changes.append(FileChange(CHANGE_MODIFIED, parts[-1]))
+
+        return changes
+
+    async def read_file(self, commit: str, path: str) -> Optional[str]:
+        """
+        Read a file's content.
+
+        The working tree matches HEAD after a pull, so it is read from disk
+        instead of spawning `git show`.
+
+        Args:
+            commit: Commit SHA (unused, see above)
+            path: Path relative to repo root
+
+        Returns:
+            File content, or None if the file does not exist
+        """
+        full_path = self.repo_path / path
+        if not full_path.exists():
+            return None
+        return full_path.read_text(encoding="utf-8")
+
+
+class DulwichGitBackend:
+    """
+    Reads commits, trees and blobs in-process with dulwich.
+
+    Fetching, diffing and reading changed docs never fork a `git` process.
+    On pull only the files changed between the old and new commits are
+    written to the working tree, instead of a full checkout; like
+    `git pull --ff-only`, the pull is refused if that would overwrite
+    local changes.
+    """
+
+    name = "dulwich"
+
+    def __init__(self, repo_path: Path, remote: str = "origin"):
+        """
+        Initialize the backend.
+
+        Args:
+            repo_path: Repository root
+            remote: Remote to pull/fetch from
+
+        Raises:
+            ImportError: If dulwich is not installed
+        """
+        from dulwich.repo import Repo
+
+        self.repo_path = Path(repo_path)
+        self.remote = remote
+        self.repo = Repo(str(self.repo_path))
+
+    def _branch_ref(self) -> bytes:
+        """Get the ref HEAD points to (e.g., b"refs/heads/main")."""
+        return self.repo.refs.get_symrefs().get(b"HEAD", b"refs/heads/main")
+
+    def _remote_ref(self) -> bytes:
+        """Get the remote-tracking ref of the current branch."""
+        branch = self._branch_ref().replace(b"refs/heads/", b"")
+        return b"refs/remotes/" + self.remote.encode() + b"/" + branch
+
+    def _fetch_sync(self):
+        """Fetch the remote into the object database."""
+        from dulwich import porcelain
+
+        with open(os.devnull, "wb") as devnull:
+            porcelain.fetch(
+                self.repo,
+                remote_location=self.remote,
+                outstream=devnull,
+                errstream=devnull,
+            )
+
+    async def fetch(self) -> bool:
+        """
+        Fetch the remote without touching the working tree.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await asyncio.to_thread(self._fetch_sync)
+            return True
+        except Exception as e:
+            logger.error(f"Git fetch failed: {e}")
+            return False
+
+    def _pull_sync(self) -> bool:
+        """Fetch and fast-forward the current branch (blocking)."""
+        self._fetch_sync()
+
+        branch_ref = self._branch_ref()
+        old = self.repo.refs[branch_ref]
+        new = self.repo.refs[self._remote_ref()]
+
+        if old == new:
+            logger.info("Git pull successful: already up to date")
+            return True
+
+        if not self._is_ancestor(old, new):
+            logger.error("Git pull failed: not a fast-forward")
+            return False
+
+        self._sync_worktree(old, new)
+        self.repo.refs[branch_ref] = new
+        logger.info(f"Git pull successful: {old[:7].decode()}..{new[:7].decode()}")
+        return True
+
+    async def pull(self) -> bool:
+        """
+        Fast-forward the current branch from the remote.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            return await asyncio.to_thread(self._pull_sync)
+        except Exception as e:
+            logger.error(f"Git pull failed: {e}")
+            return False
+
+    def _is_ancestor(self, ancestor: bytes, commit: bytes) -> bool:
+        """Check whether `ancestor` is reachable from `commit`."""
+        for entry in self.repo.get_walker(include=[commit]):
+            if entry.commit.id == ancestor:
+                return True
+        return False
+
+    def _sync_worktree(self, old: bytes, new: bytes):
+        """
+        Write the files changed between two commits to the working tree and index.
+
+        Tree entry modes are honoured (executable files, symlinks, gitlinks).
+        Like `git pull --ff-only`, nothing is written if a file about to be
+        changed has local modifications (in the working tree or the index)
+        or an untracked file is in the way.
+
+        Raises:
+            RuntimeError: If local changes would be overwritten
+        """
+        from dulwich.diff_tree import tree_changes
+
+        store = self.repo.object_store
+        changes = list(tree_changes(store, self.repo[old].tree, self.repo[new].tree))
+        index = self.repo.open_index()
+
+        dirty = [
+            path for path in (self._dirty_path(change, index) for change in changes) if path
+        ]
+        if dirty:
+            raise RuntimeError(
+                f"local changes would be overwritten: {', '.join(sorted(dirty)[:10])}"
+            )
+
+        from dulwich.index import build_file_from_blob, index_entry_from_stat
+        from dulwich.objects import S_ISGITLINK
+
+        honor_filemode = self.repo.get_config().get_boolean(
+            b"core", b"filemode", os.name != "nt"
+        )
+
+        for change in changes:
+            old_path = _entry_path(change.old)
+            new_path = _entry_path(change.new)
+
+            if old_path and old_path != new_path:
+                self._remove_path(self.repo_path / old_path)
+                if old_path.encode() in index:
+                    del index[old_path.encode()]
+
+            if not new_path:
+                continue
+
+            new_file = self.repo_path / new_path
+            new_file.parent.mkdir(parents=True, exist_ok=True)
+
+            if S_ISGITLINK(change.new.mode):
+                # Submodule: only its (empty) directory is checked out
+                if new_file.is_symlink() or new_file.is_file():
+                    new_file.unlink()
+                new_file.mkdir(exist_ok=True)
+                st = os.lstat(new_file)
+            else:
+                if new_file.is_dir() and not new_file.is_symlink():
+                    self._remove_path(new_file)  # Former gitlink
+                st = build_file_from_blob(
+                    store[change.new.sha],
+                    change.new.mode,
+                    bytes(new_file),
+                    honor_filemode=honor_filemode,
+                )
+
+            index[new_path.encode()] = index_entry_from_stat(
+                st, change.new.sha, change.new.mode
+            )
+
+        # Keep the git index in sync so `git status` stays clean
+        index.write()
+
+    def _dirty_path(self, change, index) -> Optional[str]:
+        """
+        Check whether the working tree or index differ from a change's old side.
+
+        Returns:
+            The path that would lose local changes, or None if it is clean
+        """
+        from dulwich.index import blob_from_path_and_stat
+        from dulwich.objects import S_ISGITLINK
+
+        path = _entry_path(change.old) or _entry_path(change.new)
+        full_path = self.repo_path / path
+        old_sha = change.old.sha if change.old else None
+        new_sha = change.new.sha if change.new else None
+
+        entry = index[path.encode()] if path.encode() in index else None
+        if (entry.sha if entry else None) != old_sha:
+            return path  # Staged changes
+
+        mode = change.old.mode if old_sha else change.new.mode
+        if S_ISGITLINK(mode):
+            return None
+
+        try:
+            st = os.lstat(full_path)
+        except FileNotFoundError:
+            # Deleted locally: only a conflict if the pull changes the file
+            return path if old_sha and new_sha else None
+
+        if full_path.is_dir() and not full_path.is_symlink():
+            return path
+        current = blob_from_path_and_stat(bytes(full_path), st).id
+
+        # An untracked file in the way is fine if it already has the new content
+        return None if current == (old_sha or new_sha) else path
+
+    def _remove_path(self, path: Path):
+        """Remove a file, symlink or empty directory, then its empty parents."""
+        try:
+            if path.is_dir() and not path.is_symlink():
+                path.rmdir()
+            else:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Cannot remove {path}: {e}")
+            return
+
+        # Like git, drop the directories left empty
+        parent = path.parent
+        while parent != self.repo_path and self.repo_path in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    async def resolve(self, ref: str) -> Optional[str]:
+        """
+        Resolve a ref (e.g., "HEAD", "origin/main") to a commit SHA.
+
+        Returns:
+            Hex commit SHA, or None if the ref does not exist
+        """
+        candidates = [ref.encode()]
+        if not ref.startswith(("refs/", "HEAD")):
+            candidates += [b"refs/remotes/" + ref.encode(), b"refs/heads/" + ref.encode()]
+
+        for candidate in candidates:
+            try:
+                return self.repo.refs[candidate].decode()
+            except KeyError:
+                continue
+
+        # Full commit SHA
+        if len(ref) == 40 and ref.encode() in self.repo.object_store:
+            return ref
+        return None
+
+    async def is_ancestor(self, ancestor: str, commit: str) -> bool:
+        """
+        Check whether a commit is reachable from another.
+
+        Args:
+            ancestor: Candidate ancestor commit SHA
+            commit: Descendant commit SHA
+
+        Returns:
+            True if `ancestor` is `commit` or one of its ancestors
+        """
+        try:
+            return await asyncio.to_thread(
+                self._is_ancestor, ancestor.encode(), commit.encode()
+            )
+        except Exception as e:
+            logger.error(f"Ancestry check {ancestor[:7]}..{commit[:7]} failed: {e}")
+            return False
+
+    def _diff_sync(self, old: str, new: str, prefix: str) -> List[FileChange]:
+        """Compute the tree diff between two commits (blocking)."""
+        from dulwich.diff_tree import (
+            CHANGE_ADD,
+            CHANGE_DELETE,
+            CHANGE_RENAME,
+            RenameDetector,
+            tree_changes,
+        )
+
+        store = self.repo.object_store
+        old_tree = self.repo[old.encode()].tree
+        new_tree = self.repo[new.encode()].tree
+
+        changes = []
+        for change in tree_changes(
+            store, old_tree, new_tree, rename_detector=RenameDetector(store)
+        ):
+            old_path = _entry_path(change.old)
+            new_path = _entry_path(change.new)
+
+            if change.type == CHANGE_ADD:
+                file_change = FileChange(CHANGE_ADDED, new_path)
+            elif change.type == CHANGE_DELETE:
+                file_change = FileChange(CHANGE_DELETED, old_path)
+            elif change.type == CHANGE_RENAME:
+                file_change = FileChange(CHANGE_RENAMED, new_path, old_path=old_path)
+            else:
+                file_change = FileChange(CHANGE_MODIFIED, new_path)
+
+            if prefix and file_change.change_type == CHANGE_RENAMED:
+                # Same result as `git diff -M -- <prefix>`, which cannot pair
+                # paths across the prefix: a move out of it is a deletion
+                # and a move into it an addition
+                old_inside = old_path.startswith(prefix)
+                new_inside = new_path.startswith(prefix)
+                if old_inside and not new_inside:
+                    file_change = FileChange(CHANGE_DELETED, old_path)
+                elif new_inside and not old_inside:
+                    file_change = FileChange(CHANGE_ADDED, new_path)
+
+            if not prefix or file_change.path.startswith(prefix):
+                changes.append(file_change)
+
+        return changes
+
+    async def diff(self, old: str, new: str, prefix: str = "") -> List[FileChange]:
+        """
+        List files changed between two commits, with rename detection.
+
+        Args:
+            old: Old commit SHA
+            new: New commit SHA
+            prefix: Only report paths under this prefix (e.g., "docs/")
+
+        Returns:
+            List of FileChange objects
+        """
+        try:
+            return await asyncio.to_thread(self._diff_sync, old, new, prefix)
+        except Exception as e:
+            logger.error(f"Git diff {old}..{new} failed: {e}")
+            return []
+
+    def _read_file_sync(self, commit: str, path: str) -> Optional[str]:
+        """Read a blob from a commit's tree (blocking)."""
+        from dulwich.object_store import tree_lookup_path
+
+        tree = self.repo[commit.encode()].tree
+        try:
+            _, sha = tree_lookup_path(self.repo.__getitem__, tree, path.encode())
+        except KeyError:
+            return None
+        return self.repo[sha].data.decode("utf-8")
+
+    async def read_file(self, commit: str, path: str) -> Optional[str]:
+        """
+        Read a file's content straight from the object database.
+
+        Args:
+            commit: Commit SHA
+            path: Path relative to repo root
+
+        Returns:
+            File content, or None if the file does not exist in that commit
+        """
+        return await asyncio.to_thread(self._read_file_sync, commit, path)
+
+
+def create_git_backend(name: str, repo_path: Path):
+    """
+    Create the git backend selected in the configuration.
+
+    Falls back to the subprocess backend if dulwich is requested but not
+    installed or the repository cannot be opened.
+
+    Args:
+        name: Backend name ("subprocess" or "dulwich")
+        repo_path: Repository root
+
+    Returns:
+        SubprocessGitBackend or DulwichGitBackend
+    """
+    if name == "dulwich":
+        try:
+            backend = DulwichGitBackend(repo_path)
+            logger.info("Using in-process git backend (dulwich)")
+            return backend
+        except ImportError:
+            logger.warning(
+                "GIT_BACKEND=dulwich but dulwich is not installed, "
+                "falling back to git subprocesses"
+            )
+        except Exception as e:
+            logger.warning(f"Could not open repository with dulwich ({e}), "
+                           f"falling back to git subprocesses")
+
+    return SubprocessGitBackend(repo_path)
@@ -1,12 +1,22 @@
 """Git operations handler for pulling changes and detecting diffs."""
 
 import asyncio
-import subprocess
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from utils.logger import get_logger
+from utils.metrics import GIT_PULL_SECONDS, timed
+from utils.tracing import TRACER, traced
+from bot.scheduler import PRIORITY_HIGH
 from processors.summary_builder import SummaryBuilder
 from utils.channel_manager import ChannelManager
+from utils.message_index import content_hash
+from webhook.git_backend import (
+    CHANGE_DELETED,
+    CHANGE_MODIFIED,
+    CHANGE_RENAMED,
+    FileChange,
+    create_git_backend,
+)
 
 logger = get_logger("webhook.git_handler")
 
@@ -25,33 +35,152 @@ class GitHandler:
         self.bot = bot
         self.config = config
         self.repo_path = config.docs_path.parent  # Repo root (parent of docs/)
+        self.git = create_git_backend(config.git_backend, self.repo_path)
 
         # Initialize summary builder
-        self.summary_builder = SummaryBuilder(github_repo_url=config.github_repo_url)
+        self.summary_builder = SummaryBuilder(
+            github_repo_url=config.github_repo_url, cache=bot.parse_cache
+        )
         self.channel_manager = None  # Will be initialized when needed
 
-    async def pull_and_process(self, modified_files: List[str]):
+        # Serializes git pulls when several webhook workers run at once
+        self._pull_lock = asyncio.Lock()
+
+    async def pull_and_process(
+        self, modified_files: List[str], before: str = "", after: str = ""
+    ) -> int:
         """
         Pull latest changes and process modified files.
 
+        The changed files are taken from an exact local tree diff ending at
+        the pulled HEAD (covering adds, modifications, renames and
+        deletions). It starts at whichever of the local HEAD before the pull
+        and the push's `before` SHA is older, so both the push and commits
+        of earlier pushes that were never processed are published, even
+        when another delivery already pulled them. The file list from the
+        payload is only used when no commit range can be diffed.
+
         Args:
-            modified_files: List of modified file paths (relative to repo root)
+            modified_files: Modified file paths from the payload (relative to repo root)
+            before: Commit SHA before the push
+            after: Commit SHA after the push
+
+        Returns:
+            Number of files processed
         """
         try:
             # Run git pull
-            success = await self._git_pull()
+            async with self._pull_lock:
+                old_head = await self.git.resolve("HEAD")
+                success = await self._git_pull()
+                head = await self.git.resolve("HEAD")
 
             if not success:
                 logger.error("Git pull failed, skipping file processing")
-                return
+                return 0
+
+            if after and head and not head.startswith(after[:7]):
+                logger.warning(
+                    f"HEAD {head[:7]} after pull differs from pushed commit {after[:7]}"
+                )
 
-            # Process each modified file
-            for file_path in modified_files:
-                await self._process_file(file_path)
+            with TRACER.span("diff"):
+                changes = await self._diff_push(before, old_head, head)
+
+            if changes is None:
+                # No usable commit range: trust the payload file list
+                changes = [FileChange(CHANGE_MODIFIED, f) for f in modified_files]
+
+            # Process each changed markdown file
+            processed = 0
+            for change in changes:
+                if change.change_type == CHANGE_RENAMED and change.old_path.endswith(".md"):
+                    if change.path.endswith(".md"):
+                        # Keep the existing message, it is re-edited below
+                        self.bot.move_messages(
+                            self._docs_relative(change.old_path),
+                            self._docs_relative(change.path),
+                        )
+                    else:
+                        await self._retire_file(change.old_path)
+                        processed += 1
+                        continue
+
+                if not change.path.endswith(".md"):
+                    continue
+
+                if change.change_type == CHANGE_DELETED:
+                    with TRACER.span("retire_file", file=change.path):
+                        await self._retire_file(change.path)
+                else:
+                    with TRACER.span("process_file", file=change.path):
+                        await self._process_file(change.path, head)
+                processed += 1
+
+            return processed
 
         except Exception as e:
             logger.error(f"Error in pull_and_process: {e}", exc_info=True)
+            return 0
+
+    async def _diff_push(
+        self, before: str, old_head: Optional[str], head: Optional[str]
+    ) -> Optional[List[FileChange]]:
+        """
+        Compute the docs changes of a push from a local tree diff.
+
+        The diff starts at the old HEAD when the pull applied the whole push
+        and more (commits of pushes that were rejected or dropped before
+        being processed), and at the push's `before` commit when the local
+        clone already held part or all of the push, e.g. because a
+        concurrent delivery pulled it.
+
+        Args:
+            before: Commit SHA before the push (from the payload)
+            old_head: Local HEAD before the pull
+            head: Local HEAD after the pull
+
+        Returns:
+            List of FileChange objects under docs/, or None if no commit
+            range can be diffed
+        """
+        if not head:
+            return None
+
+        # "before" is all zeros for new branches and may be missing locally
+        # after a force-push
+        resolved_before = None
+        if before and before.strip("0"):
+            resolved_before = await self.git.resolve(before)
+
+        start = resolved_before or old_head
+        if not start:
+            return None
+
+        if (
+            resolved_before
+            and old_head
+            and old_head != resolved_before
+            and await self.git.is_ancestor(old_head, resolved_before)
+        ):
+            logger.info(
+                f"Push started at {resolved_before[:7]} but local HEAD was "
+                f"{old_head[:7]}: including the commits pulled in between"
+            )
+            start = old_head
+
+        if start == head:
+            logger.info("No new commits to process")
+            return []
 
+        changes = await self.git.diff(start, head, prefix="docs/")
+        logger.info(
+            f"Tree diff {start[:7]}..{head[:7]}: {len(changes)} change(s) in docs/"
+        )
+        return changes
+
+    @traced("git_pull")
+    @timed(GIT_PULL_SECONDS)
     async def _git_pull(self) -> bool:
         """
         Execute git pull.
@@ -60,52 +189,36 @@ class GitHandler:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Running git pull in {self.repo_path}")
-
-            # Run git pull asynchronously
-            process = await asyncio.create_subprocess_exec(
-                "git", "pull", "--ff-only",
-                cwd=str(self.repo_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                output = stdout.decode().strip()
-                logger.info(f"Git pull successful: {output}")
-                return True
-            else:
-                error = stderr.decode().strip()
-                logger.error(f"Git pull failed: {error}")
-                return False
+            logger.info(f"Running git pull in {self.repo_path} ({self.git.name} backend)")
+            return await self.git.pull()
 
         except Exception as e:
             logger.error(f"Error running git pull: {e}")
             return False
 
-    async def _process_file(self, relative_path: str):
+    async def _process_file(self, relative_path: str, commit: Optional[str] = None):
         """
         Process a single modified file and update its Discord channel.
 
         Args:
             relative_path: Path relative to repo root (e.g., "docs/specs/AGENT_SPECS.md")
+            commit: Commit to read the file from (default: HEAD)
         """
         try:
             full_path = self.repo_path / relative_path
 
-            if not full_path.exists():
-                logger.warning(f"File not found after pull: {full_path}")
-                return
-
             # Skip README files
             if full_path.name.upper() == "README.MD":
                 logger.info(f"Skipping README: {full_path.name}")
                 return
 
-            # Read file content
-            content = full_path.read_text(encoding="utf-8")
+            # Read file content (from the object database with dulwich)
+            with TRACER.span("read_file"):
+                content = await self.git.read_file(commit or "HEAD", relative_path)
+
+            if content is None:
+                logger.warning(f"File not found after pull: {full_path}")
+                return
 
             if not content.strip():
                 logger.warning(f"File is empty: {full_path}")
@@ -128,39 +241,67 @@ class GitHandler:
                     auto_create=self.config.auto_create_channels,
                 )
 
-            # Build summary
-            docs_path = self.config.docs_path
-            summary = self.summary_builder.build_summary(full_path, content, docs_path)
-            embed = self.summary_builder.create_summary_embed(summary)
-
             # Get channel based on path and mapping
-            # relative_path is like "docs/02-developers/backend/API.md"
-            # We need path relative to docs_path: "02-developers/backend/API.md"
-            try:
-                rel_to_docs = full_path.relative_to(docs_path)
-                channel = self.channel_manager.get_channel_for_path(str(rel_to_docs))
-            except ValueError:
-                # File is not under docs_path, try using the relative_path directly
-                channel = self.channel_manager.get_channel_for_path(relative_path.replace("docs/", ""))
+            docs_path = self.config.docs_path
+            rel_to_docs = self._docs_relative(relative_path)
+            with TRACER.span("resolve_channel"):
+                channel = self.channel_manager.get_channel_for_path(rel_to_docs)
 
             if not channel:
                 logger.error(f"No channel found for {file_name}")
                 return
 
-            # Edit existing message or create new one
-            messages = [m async for m in channel.history(limit=1)]
-            if messages and messages[0].author == self.bot.user:
-                # Edit existing message
-                await messages[0].edit(embed=embed)
-                logger.info(f"Updated summary in #{channel.name}")
-            else:
-                # Create new message
-                await channel.send(embed=embed)
-                logger.info(f"Created summary in #{channel.name}")
+            file_hash = content_hash(content)
+
+            # Build summary
+            with TRACER.span("build_summary"):
+                summary = await self.bot.processing_pool.summarize(
+                    self.summary_builder, full_path, content, docs_path
+                )
+                embed = self.summary_builder.create_summary_embed(summary)
+
+            # Edit the indexed message or create a new one
+            with TRACER.span("discord_edit") as span:
+                result = await self.bot.publish_summary(
+                    channel, rel_to_docs, embed, file_hash, priority=PRIORITY_HIGH
+                )
+                if span:
+                    span.attrs["result"] = result
 
         except Exception as e:
             logger.error(f"Error processing file {relative_path}: {e}", exc_info=True)
 
+    def _docs_relative(self, relative_path: str) -> str:
+        """
+        Convert a path relative to the repo root into one relative to docs_path.
+
+        Args:
+            relative_path: e.g., "docs/02-developers/backend/API.md"
+
+        Returns:
+            e.g., "02-developers/backend/API.md"
+        """
+        try:
+            return str((self.repo_path / relative_path).relative_to(self.config.docs_path))
+        except ValueError:
+            # File is not under docs_path, try using the relative_path directly
+            return relative_path.replace("docs/", "")
+
+    async def _retire_file(self, relative_path: str):
+        """
+        Retire the Discord message of a file deleted from the repository.
+
+        Args:
+            relative_path: Path relative to repo root
+        """
+        try:
+            logger.info(f"File deleted: {relative_path}")
+            await self.bot.retire_messages(
+                self._docs_relative(relative_path), priority=PRIORITY_HIGH
+            )
+        except Exception as e:
+            logger.error(f"Error retiring file {relative_path}: {e}", exc_info=True)
+
     async def check_for_updates(self) -> List[str]:
         """
         Check for updates by comparing local and remote.
@@ -170,33 +311,21 @@ class GitHandler:
         """
         try:
             # Fetch remote
-            process = await asyncio.create_subprocess_exec(
-                "git", "fetch", "origin",
-                cwd=str(self.repo_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await process.communicate()
+            await self.git.fetch()
 
             # Get diff between local and remote
-            process = await asyncio.create_subprocess_exec(
-                "git", "diff", "--name-only", "HEAD", "origin/main", "--",
-                "docs/",
-                cwd=str(self.repo_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, _ = await process.communicate()
+            local = await self.git.resolve("HEAD")
+            remote = await self.git.resolve("origin/main")
 
-            if process.returncode != 0:
+            if not local or not remote:
                 return []
 
-            # Parse output
-            files = stdout.decode().strip().split("\n")
-            md_files = [f for f in files if f.endswith(".md") and f]
+            changes = await self.git.diff(local, remote, prefix="docs/")
 
-            return md_files
+            return [
+                change.path for change in changes
+                if change.change_type != CHANGE_DELETED and change.path.endswith(".md")
+            ]
 
         except Exception as e:
             logger.error(f"Error checking for updates: {e}")
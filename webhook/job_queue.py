@@ -0,0 +1,165 @@
+"""In-process job queue for webhook push processing."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger("webhook.job_queue")
+
+
+@dataclass
+class PushJob:
+    """A push delivery waiting to be pulled and published."""
+
+    delivery_id: str  # X-GitHub-Delivery header (may be empty)
+    files: List[str]  # Changed markdown files listed in the payload (fallback)
+    before: str = ""  # Commit SHA before the push
+    after: str = ""  # Commit SHA after the push
+    trace_id: str = ""  # Trace of the delivery (see utils.tracing)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class JobQueue:
+    """
+    Bounded async queue drained by a pool of worker tasks.
+
+    Deliveries are deduplicated by their GitHub delivery ID, so redelivered
+    webhooks are not processed twice. When the queue is full new jobs are
+    rejected, letting the HTTP handler apply backpressure.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[PushJob], Awaitable[None]],
+        max_depth: int = 100,
+        workers: int = 1,
+        dedup_size: int = 1000,
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            handler: Coroutine function processing one job
+            max_depth: Maximum number of queued jobs
+            workers: Number of worker tasks
+            dedup_size: Number of recent delivery IDs remembered
+        """
+        self.handler = handler
+        self.max_depth = max_depth
+        self.worker_count = max(1, workers)
+        self.dedup_size = dedup_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._seen_deliveries: OrderedDict = OrderedDict()
+
+        # Statistics
+        self.enqueued_count = 0
+        self.duplicate_count = 0
+        self.rejected_count = 0
+        self.processed_count = 0
+        self.failed_count = 0
+        self.max_depth_seen = 0
+        self.total_wait = 0.0
+        self.total_run_time = 0.0
+
+    def start(self):
+        """Start the worker tasks (requires a running event loop)."""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        logger.info(
+            f"Job queue started ({self.worker_count} worker(s), max depth {self.max_depth})"
+        )
+
+    async def stop(self):
+        """Cancel the worker tasks; queued jobs are dropped."""
+        for task in self._workers:
+            task.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Job queue stopped")
+
+    def enqueue(self, job: PushJob) -> str:
+        """
+        Add a job to the queue without waiting.
+
+        Args:
+            job: Job to enqueue
+
+        Returns:
+            "queued", "duplicate" if the delivery was already accepted, or
+            "full" if the queue is at max depth
+        """
+        if job.delivery_id and job.delivery_id in self._seen_deliveries:
+            self.duplicate_count += 1
+            logger.info(f"Ignoring duplicate delivery {job.delivery_id}")
+            return "duplicate"
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected_count += 1
+            logger.warning(
+                f"Job queue full ({self.max_depth}), rejecting delivery {job.delivery_id}"
+            )
+            return "full"
+
+        if job.delivery_id:
+            self._seen_deliveries[job.delivery_id] = True
+            while len(self._seen_deliveries) > self.dedup_size:
+                self._seen_deliveries.popitem(last=False)
+
+        self.enqueued_count += 1
+        self.max_depth_seen = max(self.max_depth_seen, self._queue.qsize())
+        return "queued"
+
+    async def _worker(self, worker_id: int):
+        """Process jobs until cancelled."""
+        while True:
+            job = await self._queue.get()
+            started = time.monotonic()
+            self.total_wait += started - job.enqueued_at
+
+            try:
+                await self.handler(job)
+                self.processed_count += 1
+            except Exception as e:
+                self.failed_count += 1
+                logger.error(
+                    f"Worker {worker_id} failed on delivery {job.delivery_id}: {e}",
+                    exc_info=True,
+                )
+            finally:
+                self.total_run_time += time.monotonic() - started
+                self._queue.task_done()
+
+    def get_stats(self) -> dict:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dict with depth, counters and average wait/run times in seconds
+        """
+        done = self.processed_count + self.failed_count
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_depth": self.max_depth,
+            "max_depth_seen": self.max_depth_seen,
+            "workers": self.worker_count,
+            "enqueued": self.enqueued_count,
+            "duplicates": self.duplicate_count,
+            "rejected": self.rejected_count,
+            "processed": self.processed_count,
+            "failed": self.failed_count,
+            "avg_wait": self.total_wait / done if done else 0.0,
+            "avg_run_time": self.total_run_time / done if done else 0.0,
+        }
@@ -4,11 +4,28 @@ import asyncio
 import hashlib
 import hmac
 import json
+import time
 from aiohttp import web
 from utils.logger import get_logger
+from utils.metrics import (
+    LOOP_LAG_SECONDS,
+    PARSE_CACHE_ENTRIES,
+    PARSE_CACHE_HIT_RATIO,
+    REGISTRY,
+    WEBHOOK_DELIVERIES,
+    WEBHOOK_PENDING_FILES,
+    WEBHOOK_QUEUE_DEPTH,
+)
+from utils.tracing import TRACER, Trace
+from webhook.coalescer import PushCoalescer
+from webhook.job_queue import JobQueue, PushJob
 
 logger = get_logger("webhook.server")
 
+# GitHub push payload limits
+MAX_PAYLOAD_COMMITS = 20
+MAX_PAYLOAD_FILES = 2048
+
 
 class WebhookServer:
     """HTTP server for receiving GitHub webhooks."""
@@ -29,14 +46,32 @@ class WebhookServer:
         self.runner = None
         self.site = None
 
+        # Bursts of pushes share a single pull-and-publish cycle
+        self.coalescer = PushCoalescer(
+            git_handler.pull_and_process,
+            window=config.webhook_coalesce_window,
+        )
+
+        # Pushes are processed in the background so GitHub gets a fast reply
+        self.job_queue = JobQueue(
+            self._run_push_job,
+            max_depth=config.webhook_queue_size,
+            workers=config.webhook_workers,
+        )
+
         # Setup routes
         self.app.router.add_post("/webhook", self.handle_webhook)
         self.app.router.add_get("/health", self.health_check)
+        self.app.router.add_get("/metrics", self.metrics)
+        self.app.router.add_get("/traces", self.list_traces)
+        self.app.router.add_get("/traces/{trace_id}", self.get_trace)
 
     async def start(self):
         """Start the webhook server."""
         port = self.config.webhook_port
 
+        self.job_queue.start()
+
         self.runner = web.AppRunner(self.app)
         await self.runner.setup()
 
@@ -52,26 +87,108 @@ class WebhookServer:
             await self.runner.cleanup()
             logger.info("Webhook server stopped")
 
+        await self.job_queue.stop()
+        await self.coalescer.stop()
+
     async def health_check(self, request: web.Request) -> web.Response:
-        """Health check endpoint."""
+        """
+        Health check endpoint.
+
+        Served unauthenticated: only summary statistics are exposed. Stall
+        reports (stacks with file paths and task names) are only logged.
+        """
         return web.json_response({
             "status": "ok",
-            "bot_connected": self.bot.is_ready() if self.bot else False
+            "bot_connected": self.bot.is_ready() if self.bot else False,
+            "queue": self.job_queue.get_stats(),
+            "coalescer": self.coalescer.get_stats(),
+            "loop_lag": self.bot.loop_lag.get_stats() if self.bot else None,
+            "processing_pool": self.bot.processing_pool.get_stats() if self.bot else None,
         })
 
+    async def metrics(self, request: web.Request) -> web.Response:
+        """Metrics endpoint (Prometheus text exposition format)."""
+        # Point-in-time values are sampled when scraped
+        WEBHOOK_QUEUE_DEPTH.set(self.job_queue.get_stats()["depth"])
+        WEBHOOK_PENDING_FILES.set(self.coalescer.get_stats()["pending_files"])
+
+        if self.bot:
+            cache_stats = self.bot.parse_cache.get_stats()
+            PARSE_CACHE_HIT_RATIO.set(cache_stats["hit_rate"])
+            PARSE_CACHE_ENTRIES.set(cache_stats["entries"])
+
+            lag = self.bot.loop_lag.get_stats()
+            for quantile in ("p50", "p95", "p99"):
+                LOOP_LAG_SECONDS.set(lag[quantile], f"0.{quantile[1:]}")
+
+        return web.Response(
+            text=REGISTRY.render(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    async def list_traces(self, request: web.Request) -> web.Response:
+        """
+        Recent traces endpoint.
+
+        Query parameters: `limit` (default 20) and `slowest` (sort by
+        duration instead of newest first).
+        """
+        try:
+            limit = int(request.query.get("limit", 20))
+        except ValueError:
+            return web.json_response({"error": "Invalid limit"}, status=400)
+
+        slowest = request.query.get("slowest", "").lower() in ("1", "true", "yes")
+        return web.json_response({
+            "stages": TRACER.stage_stats(),
+            "traces": TRACER.recent(limit, slowest=slowest),
+        })
+
+    async def get_trace(self, request: web.Request) -> web.Response:
+        """Single trace endpoint (by delivery ID)."""
+        trace = TRACER.get(request.match_info["trace_id"])
+        if trace is None:
+            return web.json_response({"error": "Unknown trace"}, status=404)
+        return web.json_response(trace)
+
     async def handle_webhook(self, request: web.Request) -> web.Response:
         """
         Handle incoming GitHub webhook.
 
+        Each delivery is traced under its delivery ID. Queued pushes keep
+        their trace open until their pull-and-publish cycle ends.
+
         Args:
             request: aiohttp request object
 
         Returns:
             HTTP response
         """
+        trace = TRACER.start_trace(request.headers.get("X-GitHub-Delivery", ""), "webhook")
+
+        with TRACER.activate(trace.trace_id):
+            with TRACER.span("handle_webhook"):
+                response = await self._handle_delivery(request, trace)
+
+        if response.status != 202:
+            TRACER.finish(trace.trace_id)
+        return response
+
+    async def _handle_delivery(self, request: web.Request, trace: Trace) -> web.Response:
+        """
+        Validate a webhook delivery and dispatch it by event type.
+
+        Args:
+            request: aiohttp request object
+            trace: Trace of the delivery
+
+        Returns:
+            HTTP response (202 if a push job was queued)
+        """
         try:
             # Get headers
             event_type = request.headers.get("X-GitHub-Event", "")
+            delivery_id = request.headers.get("X-GitHub-Delivery", "")
             signature = request.headers.get("X-Hub-Signature-256", "")
 
             # Read body
@@ -79,8 +196,12 @@ class WebhookServer:
 
             # Verify signature if secret is configured
             if self.config.webhook_secret:
-                if not self._verify_signature(body, signature):
+                with TRACER.span("verify_signature"):
+                    valid = self._verify_signature(body, signature)
+
+                if not valid:
                     logger.warning("Invalid webhook signature")
+                    self._count_delivery(trace, event_type, "invalid_signature")
                     return web.json_response(
                         {"error": "Invalid signature"}, status=401
                     )
@@ -90,29 +211,47 @@ class WebhookServer:
                 payload = json.loads(body)
             except json.JSONDecodeError:
                 logger.error("Invalid JSON in webhook payload")
+                self._count_delivery(trace, event_type, "invalid_json")
                 return web.json_response(
                     {"error": "Invalid JSON"}, status=400
                 )
 
             # Handle different event types
             if event_type == "push":
-                await self._handle_push(payload)
-                return web.json_response({"status": "processing"})
+                status = self._handle_push(payload, delivery_id, trace.trace_id)
+                self._count_delivery(trace, event_type, status)
+
+                if status == "queued":
+                    return web.json_response({"status": "queued"}, status=202)
+                elif status == "full":
+                    return web.json_response(
+                        {"error": "Queue full, retry later"}, status=503
+                    )
+                return web.json_response({"status": status})
 
             elif event_type == "ping":
                 logger.info("Received GitHub ping - webhook configured correctly!")
+                self._count_delivery(trace, event_type, "pong")
                 return web.json_response({"status": "pong"})
 
             else:
                 logger.debug(f"Ignoring event type: {event_type}")
+                self._count_delivery(trace, event_type, "ignored")
                 return web.json_response({"status": "ignored"})
 
         except Exception as e:
             logger.error(f"Error handling webhook: {e}", exc_info=True)
+            self._count_delivery(trace, request.headers.get("X-GitHub-Event", ""), "error")
             return web.json_response(
                 {"error": "Internal server error"}, status=500
             )
 
+    def _count_delivery(self, trace: Trace, event_type: str, status: str):
+        """Count a delivery outcome and tag its trace with it."""
+        WEBHOOK_DELIVERIES.inc(event_type, status)
+        trace.name = event_type or "unknown"
+        trace.status = status
+
     def _verify_signature(self, body: bytes, signature: str) -> bool:
         """
         Verify GitHub webhook signature.
@@ -133,12 +272,20 @@ class WebhookServer:
 
         return hmac.compare_digest(expected, received)
 
-    async def _handle_push(self, payload: dict):
+    def _handle_push(self, payload: dict, delivery_id: str = "", trace_id: str = "") -> str:
         """
         Handle push event from GitHub.
 
+        Only filters the payload and enqueues a job; pulling and publishing
+        happen in the job queue workers.
+
         Args:
             payload: GitHub push event payload
+            delivery_id: X-GitHub-Delivery header value
+            trace_id: ID of the delivery's trace
+
+        Returns:
+            "ignored", or the job queue status ("queued", "duplicate", "full")
         """
         ref = payload.get("ref", "")
         branch = ref.replace("refs/heads/", "")
@@ -146,15 +293,18 @@ class WebhookServer:
         # Only process pushes to main/master branch
         if branch not in ("main", "master"):
             logger.debug(f"Ignoring push to branch: {branch}")
-            return
+            return "ignored"
 
-        # Get list of modified files
+        # Get list of modified files (fallback if the tree diff is unavailable)
         commits = payload.get("commits", [])
         modified_files = set()
+        touched_files = set()
 
         for commit in commits:
             modified_files.update(commit.get("added", []))
             modified_files.update(commit.get("modified", []))
+            touched_files.update(commit.get("removed", []))
+        touched_files.update(modified_files)
 
         # Filter for markdown files in docs/
         md_files = [
@@ -162,11 +312,50 @@ class WebhookServer:
             if f.startswith("docs/") and f.endswith(".md")
         ]
 
-        if not md_files:
+        # GitHub truncates the commit list at 20 commits and the per-commit
+        # file lists at 2048 entries: only trust "no docs changed" when the
+        # lists are complete
+        truncated = len(commits) >= MAX_PAYLOAD_COMMITS or any(
+            len(c.get("added", [])) + len(c.get("modified", [])) + len(c.get("removed", []))
+            >= MAX_PAYLOAD_FILES
+            for c in commits
+        )
+        docs_touched = any(
+            f.startswith("docs/") and f.endswith(".md") for f in touched_files
+        )
+
+        if not docs_touched and not truncated:
             logger.info("No markdown files modified in docs/")
-            return
+            return "ignored"
+
+        logger.info(
+            f"Push received ({delivery_id or 'no delivery ID'}) - "
+            f"{payload.get('before', '')[:7]}..{payload.get('after', '')[:7]}, "
+            f"{len(md_files)} markdown file(s) listed"
+            f"{' (truncated payload)' if truncated else ''}"
+        )
+
+        return self.job_queue.enqueue(
+            PushJob(
+                delivery_id=delivery_id,
+                trace_id=trace_id,
+                files=md_files,
+                before=payload.get("before", ""),
+                after=payload.get("after", ""),
+            )
+        )
+
+    async def _run_push_job(self, job: PushJob):
+        """
+        Hand the files of a queued push to the next pull-and-publish cycle.
 
-        logger.info(f"Push received - {len(md_files)} markdown file(s) modified")
+        Waits for the cycle to end, so each worker holds at most one push in
+        flight: pushes beyond WEBHOOK_WORKERS stay in the bounded job queue.
 
-        # Pull changes and process files
-        await self.git_handler.pull_and_process(md_files)
+        Args:
+            job: Queued push job
+        """
+        TRACER.record(job.trace_id, "queue_wait", job.enqueued_at, time.monotonic())
+        await self.coalescer.submit(
+            job.files, before=job.before, after=job.after, trace_id=job.trace_id
+        )